@@ -4,18 +4,23 @@
 
 from lib.mesh_device import MeshDevice
 from ssd1306 import SSD1306_I2C
-from htu21d import HTU21D
+from htu21d import HTU21D, centi_c_to_f
+from numfmt import NumBuf
+from sample_ring import SampleRing
 from machine import I2C, Pin, ADC
+from array import array
 import utime
 
 
-def celsius_to_fahrenheit(celsius):
+def format_centi(centi):
     """
-    將攝氏溫度轉換為華氏溫度
-    celsius: 攝氏溫度值
-    回傳: 華氏溫度值
+    以 0.01 為單位的整數格式化為小數第一位的字串 (四捨五入)
+    centi: 整數，例如 2516 代表 25.16
+    回傳: 字串，例如 '25.2'
     """
-    return celsius * 9.0 / 5.0 + 32.0
+    sign = '-' if centi < 0 else ''
+    tenths = (abs(centi) + 5) // 10
+    return '{}{}.{}'.format(sign, tenths // 10, tenths % 10)
 
 
 def main():
@@ -69,6 +74,22 @@ def main():
     oled.show()
     utime.sleep_ms(500)
 
+    # 固定的標籤只畫一次並存成背景，之後每次更新只畫數值
+    oled.fill(0)
+    oled.text('T:', 0, 0)
+    oled.text('H:', 0, 16)
+    oled.text('AIN5:', 0, 32)
+    oled.text('Mesh:', 0, 48)
+    oled.save_background()
+
+    # 顯示用的數字直接寫進這個預先配置的 bytearray，不產生暫時字串
+    line = NumBuf(12)
+
+    # 讀值紀錄 (溫度 0.01 C、濕度 0.01 %、AIN5 0.1 V)：記憶體固定，
+    # 提供平滑值 (EMA) 與 10 分鐘最低/最高/平均
+    history = SampleRing(64, 3)
+    sample = array('h', [0, 0, 0])
+
     while True:
         current_time = utime.ticks_ms()
 
@@ -76,42 +97,51 @@ def main():
         if utime.ticks_diff(current_time, last_read_time) >= 1000:
             last_read_time = current_time
 
-            # 讀取溫濕度
-            temperature_c = sensor.readTemperatureData()
-            humidity = sensor.readHumidityData()
+            # 讀取溫濕度 (以 0.01 C / 0.01 % 為單位的整數，不產生浮點數)
+            temperature_c = sensor.read_centi_c()
+            humidity = sensor.read_centi_rh()
 
             # 讀取 AIN5 (0-4095 對應 0-3.3V)
             ain5_value = ain5.read()
-            ain5_voltage = ain5_value * 3.3 / 4095.0
+            ain5_tenths = (ain5_value * 66 + 4095) // 8190  # 0.1 V 為單位
+
+            # 存入紀錄 (CRC 錯誤的讀值不記錄)
+            if temperature_c != HTU21D.CENTI_ERROR and \
+                    humidity != HTU21D.CENTI_ERROR:
+                sample[0] = temperature_c
+                sample[1] = humidity
+                sample[2] = ain5_tenths
+                history.push(sample, current_time)
 
             # 判斷溫度顯示單位
             if use_celsius:
                 temp_display = temperature_c
-                temp_unit = 'C'
+                temp_unit = b' C'
             else:
-                temp_display = celsius_to_fahrenheit(temperature_c)
-                temp_unit = 'F'
+                temp_display = centi_c_to_f(temperature_c)
+                temp_unit = b' F'
 
-            # 清空 OLED 並顯示資料
-            oled.fill(0)
+            # 還原背景 (取代 fill(0))：只把上次畫過數值的區域複製回來
+            oled.restore_background()
 
+            # 數值以 NumBuf 格式化後用 text_buf() 畫出，不產生暫時字串
             # 第一行：溫度 (小數第一位)
-            temp_str = 'T:{:.1f} {}'.format(temp_display, temp_unit)
-            oled.text(temp_str, 0, 0)
+            line.clear().fixed(temp_display, drop=1).put(temp_unit)
+            oled.text_buf(line.buf, 16, 0, 1, line.n)
 
             # 第二行：濕度 (小數第一位 + %)
-            humid_str = 'H:{:.1f} %'.format(humidity)
-            oled.text(humid_str, 0, 16)
+            line.clear().fixed(humidity, drop=1).put(b' %')
+            oled.text_buf(line.buf, 16, 16, 1, line.n)
 
             # 第三行：AIN5 電壓值 (小數第一位，無單位)
-            ain5_str = 'AIN5:{:.1f}'.format(ain5_voltage)
-            oled.text(ain5_str, 0, 32)
+            line.clear().fixed(ain5_tenths)
+            oled.text_buf(line.buf, 40, 32, 1, line.n)
 
             # 第四行：Mesh 狀態
             if mesh.is_bound:
-                oled.text('Mesh:OK', 0, 48)
+                oled.text('OK', 40, 48)
             else:
-                oled.text('Mesh:--', 0, 48)
+                oled.text('--', 40, 48)
 
             oled.show()
 
@@ -120,22 +150,32 @@ def main():
                 last_send_time = current_time
 
                 # 傳送溫度 (使用攝氏)
-                temp_msg = 'T:{:.1f}'.format(temperature_c)
+                temp_msg = 'T:' + format_centi(temperature_c)
                 mesh.set_data(temp_msg)
                 print("Mesh 傳送: {}".format(temp_msg))
                 utime.sleep_ms(100)  # 短暫延遲避免訊息衝突
 
                 # 傳送濕度
-                humid_msg = 'H:{:.1f}'.format(humidity)
+                humid_msg = 'H:' + format_centi(humidity)
                 mesh.set_data(humid_msg)
                 print("Mesh 傳送: {}".format(humid_msg))
                 utime.sleep_ms(100)
 
                 # 傳送 AIN5
-                ain5_msg = 'A:{:.1f}'.format(ain5_voltage)
+                ain5_msg = 'A:{}.{}'.format(
+                    ain5_tenths // 10, ain5_tenths % 10)
                 mesh.set_data(ain5_msg)
                 print("Mesh 傳送: {}".format(ain5_msg))
 
+                # 溫度統計：平滑值與最近 10 分鐘的最低/最高/平均
+                if history.count:
+                    print("溫度 EMA: {}".format(format_centi(history.ema(0))))
+                    w = history.window(600, 0)
+                    if w is not None:
+                        print("10 分鐘 最低 {} / 最高 {} / 平均 {}".format(
+                            format_centi(w[0]), format_centi(w[1]),
+                            format_centi(w[2])))
+
         # 按鍵偵測 (上鍵切換溫度單位)
         key_state = key_up.value()
         if last_key_state == 1 and key_state == 0:
@@ -147,7 +187,7 @@ def main():
                 unit_name = '攝氏' if use_celsius else '華氏'
                 print("溫度單位切換為: {}".format(unit_name))
 
-                # 短暫顯示提示
+                # 短暫顯示提示 (蓋掉整個畫面，下次 restore_background() 會整張還原)
                 oled.fill(0)
                 oled.text('Unit Change', 0, 0)
                 oled.text(unit_name, 0, 16)
@@ -6,6 +6,7 @@
 import utime
 from machine import I2C, Pin
 import lib.ssd1306
+from lib.oled_ui import Screen, MenuList
 
 # 選單數據：兩層，每層四個選項
 menu_data = [
@@ -41,22 +42,23 @@ def init_hardware():
 # 顯示選單
 
 
+# 選單畫面：第一次顯示時建立，之後只重畫有變動的列
+menu_view = {'screen': None, 'list': None}
+
+
 def display_menu(oled, menu_state):
-    oled.fill(0)  # 清空螢幕
+    if menu_view['screen'] is None:
+        menu_view['screen'] = Screen(oled)
+        menu_view['list'] = menu_view['screen'].add(
+            MenuList(0, 0, menu_data[0]['options'], pitch=16, row_h=16,
+                     text_dx=0, text_dy=0))
     layer = menu_state['current_layer']
     selection = menu_state['current_selection']
     options = menu_data[layer]['options']
 
-    for i in range(4):
-        y = i * 16  # 每行 16 像素
-        if i == selection:
-            # 反白當前選項：填充矩形
-            oled.fill_rect(0, y, 128, 16, 1)
-            oled.text(options[i], 0, y, 0)  # 黑色文字
-        else:
-            oled.text(options[i], 0, y, 1)  # 白色文字
-
-    oled.show()
+    # 每行 16 像素，反白當前選項；畫面沒有變動時不會送出任何資料
+    menu_view['list'].set_items(options, selection)
+    menu_view['screen'].show()
 
 # 讀取按鈕輸入
 
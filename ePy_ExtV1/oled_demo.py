@@ -16,6 +16,8 @@
 import utime
 from machine import I2C, Pin
 import ssd1306
+from sprite_cache import SpriteCache
+from oled_ui import Screen, MenuList
 
 # 選單結構 (二層，每層四選項)
 MENU = {
@@ -43,32 +45,26 @@ KEY_RIGHT = Pin(7, Pin.IN, Pin.PULL_UP)
 
 # OLED 初始化
 I2C0 = I2C(0, I2C.MASTER, baudrate=100000)
-oled = ssd1306.SSD1306_I2C(128, 64, I2C0)
+# shadow=True：切換選單層時只送出與上一張畫面不同的位元組
+oled = ssd1306.SSD1306_I2C(128, 64, I2C0, shadow=True)
 
-# 顯示選單 (反白表示選到的選項)
+# 選項文字（一般與反白兩種顏色）只畫一次，之後以 blit 貼上
+sprites = SpriteCache(1024)
+
+# 選單畫面：四列選項，反白表示選到的選項
+screen = Screen(oled, sprites)
+menu = screen.add(MenuList(0, 8, MENU['main']))
+
+# 顯示選單 (只重畫有變動的列)
 def show_menu():
-    oled.fill(0)
     if menu_state['layer'] == 0:
         # 主選單
-        for i, item in enumerate(MENU['main']):
-            y = 8 + i * 14
-            if i == menu_state['main_idx']:
-                # 反白
-                oled.fill_rect(0, y, 128, 12, 1)
-                oled.text(item, 4, y+2, 0)
-            else:
-                oled.text(item, 4, y+2, 1)
+        menu.set_items(MENU['main'], menu_state['main_idx'])
     else:
         # 子選單
-        sub_items = MENU['sub'][menu_state['main_idx']]
-        for i, item in enumerate(sub_items):
-            y = 8 + i * 14
-            if i == menu_state['sub_idx']:
-                oled.fill_rect(0, y, 128, 12, 1)
-                oled.text(item, 4, y+2, 0)
-            else:
-                oled.text(item, 4, y+2, 1)
-    oled.show()
+        menu.set_items(MENU['sub'][menu_state['main_idx']],
+                       menu_state['sub_idx'])
+    screen.show()
 
 # 按鍵掃描 (回傳按下的鍵名)
 def scan_key():
@@ -2,11 +2,19 @@
 htu_oled_mesh.py
 
 功能：
-- 每秒讀取 HTU21D 溫濕度，並顯示在 SSD1306 OLED 上：
+- 每秒量測 HTU21D 溫濕度，並顯示在 SSD1306 OLED 上：
+  （使用 no-hold 量測：送出命令後感測器不佔用 I2C0，轉換完成才讀回結果，
+   轉換期間 OLED 照常分批更新、按鍵照常偵測）
   - 第一行：溫度，顯示到小數第一位，帶單位 C 或 F
   - 第二行：濕度，顯示到小數第一位，帶 %
   - 第三行：AIN5 類比電壓，顯示到小數第一位（單位 V，顯示時無單位要求）
-- 按下上鍵 (P24) 切換溫度單位（攝氏 <-> 華氏），有去彈跳處理
+  - 最下方 (y=48)：最近 128 筆溫度的走勢圖，每筆只重畫一個 column；
+    縱軸範圍依最近一小時（不足時為最近 10 分鐘）的最低/最高溫自動調整
+- 讀值存入固定大小的 SampleRing（溫度、濕度、AIN5 與時間戳記），
+  統計值（最低/最高/平均/EMA、1 分 / 10 分 / 1 小時區間）不隨執行時間增加記憶體
+- 按下上鍵 (P24) 切換溫度單位（攝氏 <-> 華氏），有去彈跳處理，並立即重畫
+- OLED 更新率上限 10 fps（set_max_fps），過密的更新會合併成一張畫面
+- 溫濕度全程以 0.01 為單位的整數處理（read/poll 的 centi 版本），不產生浮點數物件
 - 每次讀取時，若 Mesh 已綁定，分別送出溫度與濕度資料（格式 "T:xx.x" 與 "H:xx.x"），並送出 AIN5 ("A:xx.x")
 
 使用方式：
@@ -19,26 +27,38 @@ htu_oled_mesh.py
 
 from machine import I2C, Pin, ADC
 from lib.ssd1306 import SSD1306_I2C
-from lib.htu21d import HTU21D
+from lib.htu21d import HTU21D, centi_c_to_f
 from lib.mesh_device import MeshDevice
+from lib.numfmt import NumBuf
+from lib.oled_ui import Graph
+from lib.sample_ring import SampleRing
+from array import array
 import utime
 
 
-def c_to_f(c):
-    """攝氏轉華氏"""
-    return c * 9.0 / 5.0 + 32.0
+def format_one_decimal(centi):
+    """以 0.01 為單位的整數格式化為小數第一位的字串（使用 str.format()）"""
+    tenths = to_tenths(centi)
+    sign = '-' if tenths < 0 else ''
+    tenths = abs(tenths)
+    return '{}{}.{}'.format(sign, tenths // 10, tenths % 10)
 
 
-def format_one_decimal(value):
-    """格式化為小數第一位的字串（使用 str.format()）"""
-    return '{:.1f}'.format(value)
+def to_tenths(centi):
+    """以 0.01 為單位的整數轉成以 0.1 為單位（四捨五入）"""
+    if centi < 0:
+        return -((5 - centi) // 10)
+    return (centi + 5) // 10
 
 
 def main():
     # 初始化 I2C 與 OLED
     try:
         i2c0 = I2C(0, I2C.MASTER, baudrate=100000)
-        oled = SSD1306_I2C(128, 64, i2c0)
+        # shadow=True：只送出與上一張畫面不同的位元組
+        oled = SSD1306_I2C(128, 64, i2c0, shadow=True)
+        # 畫面更新率上限，避免 OLED 佔滿與感測器共用的 I2C0
+        oled.set_max_fps(10)
     except Exception:
         print('無法初始化 I2C 或 OLED，請確認硬體與驅動')
         return
@@ -74,16 +94,40 @@ def main():
     # 狀態
     use_celsius = True
     last_up = 1
+    # 切換單位後立即重畫（不等下一個讀取週期，並以高優先權送出）
+    redraw = False
 
     # 時間控制，每 1000 ms 讀取一次
     interval_ms = 1000
     last_read = utime.ticks_ms() - interval_ms
+    # 量測步驟：0 閒置、1 等溫度、2 等濕度、3 量完可以更新畫面
+    step = 0
+    # 溫度 (0.01 C) 與濕度 (0.01 %) 的整數讀值
+    temp_c = None
+    hum = None
 
     oled.fill(0)
     oled.text('HTU21D Starting', 0, 0)
     oled.show()
     utime.sleep_ms(500)
 
+    # 固定的標籤只畫一次並存成背景，之後每次更新只畫數值
+    oled.fill(0)
+    oled.text('T:', 0, 0)
+    oled.text('H:', 0, 16)
+    oled.text('A:', 0, 32)
+    oled.save_background()
+
+    # 顯示用的數字直接寫進這個預先配置的 bytearray，不產生暫時字串
+    line = NumBuf(12)
+
+    # 溫度走勢圖（攝氏 15.0 ~ 35.0 度，以 0.1 度為單位），每秒一筆
+    trend = Graph(0, 48, 128, 16, 150, 350)
+
+    # 讀值紀錄：溫度 (0.01 C)、濕度 (0.01 %)、AIN5 (0.1 V)，重複使用同一個 array
+    history = SampleRing(128, 3)
+    sample = array('h', [0, 0, 0])
+
     while True:
         now = utime.ticks_ms()
 
@@ -94,60 +138,114 @@ def main():
                 utime.sleep_ms(50)
                 if btn_up.value() == 0:
                     use_celsius = not use_celsius
+                    redraw = True
             last_up = up_state
 
-        # 週期性讀取
-        if utime.ticks_diff(now, last_read) >= interval_ms:
-            last_read = now
-
-            # 讀溫濕度
-            try:
-                temp_c = sensor.readTemperatureData()
-                hum = sensor.readHumidityData()
-            except Exception:
+        # 週期性量測（no-hold）：送出命令後每圈 poll() 一次，
+        # 轉換時間到了才讀回結果，期間不會卡住 I2C 與主迴圈
+        if step == 0:
+            if redraw or utime.ticks_diff(now, last_read) >= interval_ms:
+                last_read = now
                 temp_c = None
                 hum = None
+                try:
+                    sensor.trigger_temperature()
+                    step = 1
+                except Exception:
+                    step = 3
+        elif step == 1:
+            try:
+                value = sensor.poll_centi()
+                if value is not None:
+                    temp_c = value
+                    sensor.trigger_humidity()
+                    step = 2
+            except Exception:
+                step = 3
+        elif step == 2:
+            try:
+                value = sensor.poll_centi()
+                if value is not None:
+                    hum = value
+                    step = 3
+            except Exception:
+                step = 3
 
-            # 讀 AIN5
+        if step == 3:
+            step = 0
+
+            # 讀 AIN5，換算成 0.1 V 為單位的整數（0..4095 對應 0..33）
             if ain5 is not None:
                 try:
                     ain_val = ain5.read()  # 0..4095
-                    ain_voltage = ain_val * 3.3 / 4095.0
+                    ain_tenths = (ain_val * 66 + 4095) // 8190
                 except Exception:
-                    ain_voltage = None
+                    ain_tenths = None
             else:
-                ain_voltage = None
+                ain_tenths = None
+
+            # 更新 OLED（第一行溫度，第二行濕度，第三行 AIN5）
+            # restore_background() 取代 fill(0)：只把上次畫過數值的區域
+            # 從背景複製回來，show() 也只需重送這些區域。
+            # 數值以 NumBuf 格式化後用 text_buf() 畫出，不產生暫時字串
+            oled.restore_background()
 
-            # 溫度顯示與格式化
+            # 溫度（標籤 T:/H:/A: 已在背景中）
+            line.clear()
             if temp_c is None:
-                temp_str = 'T: --.-'
+                line.put(b' --.-')
+            elif use_celsius:
+                temp_display = temp_c
+                line.fixed(temp_display, drop=1).put(b' C')
             else:
-                if use_celsius:
-                    temp_display = temp_c
-                    unit = 'C'
-                else:
-                    temp_display = c_to_f(temp_c)
-                    unit = 'F'
-                temp_str = 'T:{} {}'.format(format_one_decimal(temp_display), unit)
-
-            # 濕度顯示
+                temp_display = centi_c_to_f(temp_c)
+                line.fixed(temp_display, drop=1).put(b' F')
+            oled.text_buf(line.buf, 16, 0, 1, line.n)
+
+            # 濕度
+            line.clear()
             if hum is None:
-                hum_str = 'H: --.- %'
+                line.put(b' --.-')
             else:
-                hum_str = 'H:{} %'.format(format_one_decimal(hum))
+                line.fixed(hum, drop=1)
+            line.put(b' %')
+            oled.text_buf(line.buf, 16, 16, 1, line.n)
 
-            # AIN5 顯示（只顯示電壓到一位小數）
-            if ain_voltage is None:
-                ain_str = 'A: --.-'
+            # AIN5（只顯示電壓到一位小數）
+            line.clear()
+            if ain_tenths is None:
+                line.put(b' --.-')
             else:
-                ain_str = 'A:{} V'.format(format_one_decimal(ain_voltage))
+                line.fixed(ain_tenths).put(b' V')
+            oled.text_buf(line.buf, 16, 32, 1, line.n)
 
-            # 更新 OLED（第一行溫度，第二行濕度，第三行 AIN5）
-            oled.fill(0)
-            oled.text(temp_str, 0, 0)
-            oled.text(hum_str, 0, 16)
-            oled.text(ain_str, 0, 32)
-            oled.show()
+            # 記錄讀值（CRC 錯誤或讀取失敗的不記錄）
+            if temp_c is not None and hum is not None \
+                    and temp_c != HTU21D.CENTI_ERROR \
+                    and hum != HTU21D.CENTI_ERROR:
+                sample[0] = temp_c
+                sample[1] = hum
+                sample[2] = 0 if ain_tenths is None else ain_tenths
+                history.push(sample, now)
+                # 走勢圖縱軸：最近一小時的最低 ~ 最高溫，上下各留 1 度，
+                # 至少 2 度寬；範圍改變時才整張重畫走勢圖
+                w = history.window(3600, 0) or history.window(600, 0)
+                if w is not None:
+                    lo = to_tenths(w[0]) - 10
+                    hi = to_tenths(w[1]) + 10
+                    if hi - lo < 20:
+                        hi = lo + 20
+                    trend.set_range(lo, hi)
+
+            # 走勢圖：只畫最新一筆的 column 與其前方的空白游標
+            # （CRC 錯誤的讀值和紀錄一樣不畫）
+            if temp_c is not None and temp_c != HTU21D.CENTI_ERROR:
+                trend.push(to_tenths(temp_c))
+            trend.render(oled)
+            # 只排入待送佇列，實際傳輸在迴圈尾端分批進行，避免一次卡住 I2C；
+            # 按鍵觸發的重畫不受更新率上限限制
+            oled.begin_show(priority=redraw)
+            redraw = False
 
             # 透過 Mesh 傳送資料（若有 mesh 並已綁定）
             if mesh is not None and mesh.is_bound:
@@ -159,13 +257,17 @@ def main():
                     if hum is not None:
                         mesh.set_data('H:' + format_one_decimal(hum))
                         utime.sleep_ms(100)
-                    if ain_voltage is not None:
+                    if ain_tenths is not None:
                         # AIN5 也用一位小數送出
-                        mesh.set_data('A:' + format_one_decimal(ain_voltage))
+                        mesh.set_data('A:{}.{}'.format(ain_tenths // 10,
+                                                       ain_tenths % 10))
                 except Exception:
                     # 忽略傳送錯誤，避免崩潰
                     pass
 
+        # 每圈最多送出一個 page (128 bytes)，按鍵與 UART 不會被長時間擋住
+        oled.flush_step(128)
+
         # 短暫延遲，避免 busy-loop
         utime.sleep_ms(50)
 
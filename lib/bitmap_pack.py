@@ -0,0 +1,145 @@
+# SSD1306 驅動用的壓縮 1-bit 圖庫，註解皆為中文，遵守 PEP8
+# 圖示、字形與開機畫面大多是空白，所以以 MONO_VLSB 位元組順序做
+# run-length 壓縮儲存，也可以存成對另一張同尺寸圖的 XOR 差異
+# （按下的按鈕對放開的按鈕、一個數字對另一個數字）。解碼時直接展開到
+# 顯示器 framebuffer 或任何 MONO_VLSB 緩衝區（Canvas、FrameBuffer 背後
+# 的 bytearray）的指定 column / page 位置，不會先解壓到暫存緩衝區。
+#
+# 檔案格式（little endian），由 tools/img2epb.py 產生：
+#   0  b'EPB1'
+#   4  圖的數量 (u16)
+#   6  數量 x 索引項目：寬 (u8)，高 (u8)，參考圖 (u16，沒有時為 0xffff)，
+#      資料位置 (u16，從檔案開頭算起)，資料長度 (u16)
+#   .. run-length 資料；每段以控制碼 c 開頭：
+#        0x00..0x7f  後面接 c + 1 個原樣 bytes
+#        0x80..0xbf  下一個 byte 重複 (c & 0x3f) + 2 次
+#        0xc0..0xff  (c & 0x3f) + 1 個 0
+#      有參考圖的圖，解出的 bytes 以 XOR 套用到參考圖上，所以 0 的區段
+#      不會改變那些 bytes。
+# 圖一律寫滿整個 page：高度不是 8 的倍數時，多出來的列寫入 0。
+#
+# - 使用方式
+# from bitmap_pack import BitmapPack
+# icons = BitmapPack('icons.epb')        # 或 BitmapPack(DATA)，DATA 為
+# icons.draw(oled, 0, 96, 16)            # img2epb.py --py 產生的模組常數
+# icons.draw(oled, 1, 96, 16, shown=0)   # 只套用 0 -> 1 的差異
+# oled.show()
+
+HEADER_SIZE = 6
+ENTRY_SIZE = 8
+NO_REF = 0xffff
+
+_ZEROS = memoryview(bytes(256))
+
+
+class BitmapPack:
+    def __init__(self, source):
+        # source 為檔案路徑（一次讀入，資料很小）或 bytes 物件，
+        # 例如凍結進 flash 的模組常數。
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                source = f.read()
+        d = memoryview(source)
+        if bytes(d[0:4]) != b'EPB1':
+            raise ValueError('not an EPB1 bitmap pack')
+        self._d = d
+        self.count = d[4] | (d[5] << 8)
+
+    def _entry(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError('bitmap index out of range')
+        return HEADER_SIZE + index * ENTRY_SIZE
+
+    def size(self, index):
+        e = self._entry(index)
+        return self._d[e], self._d[e + 1]
+
+    def reference(self, index):
+        # 這張圖做為差異時的參考圖索引，沒有則回傳 -1。
+        e = self._entry(index)
+        ref = self._d[e + 2] | (self._d[e + 3] << 8)
+        return -1 if ref == NO_REF else ref
+
+    def decode_into(self, index, buf, stride, x=0, page=0):
+        # 把圖寫進 MONO_VLSB 緩衝區 buf（每個 page 長 stride bytes），
+        # 左上角位於第 page 個 page 的第 x 個 column。
+        w, h = self.size(index)
+        pages = (h + 7) >> 3
+        if x < 0 or page < 0 or x + w > stride \
+                or (page + pages) * stride > len(buf):
+            raise ValueError('bitmap does not fit at this offset')
+        self._decode(index, buf, stride, page * stride + x)
+
+    def _decode(self, index, buf, stride, base):
+        ref = self.reference(index)
+        if ref >= 0:
+            self._decode(ref, buf, stride, base)
+        self._expand(index, buf, stride, base, ref >= 0)
+
+    def _expand(self, index, buf, stride, base, xor):
+        d = self._d
+        e = HEADER_SIZE + index * ENTRY_SIZE
+        w = d[e]
+        i = d[e + 4] | (d[e + 5] << 8)
+        end = i + (d[e + 6] | (d[e + 7] << 8))
+        skip = stride - w
+        o = base
+        col = 0
+        while i < end:
+            c = d[i]
+            i += 1
+            if c < 0x80:
+                n = c + 1
+                v = -1
+            elif c < 0xc0:
+                n = (c & 0x3f) + 2
+                v = d[i]
+                i += 1
+            else:
+                n = (c & 0x3f) + 1
+                v = 0
+            # 一段資料可能延續到圖的下一個 page
+            while n:
+                k = w - col
+                if k > n:
+                    k = n
+                if v < 0:
+                    if xor:
+                        for j in range(k):
+                            buf[o + j] ^= d[i + j]
+                    else:
+                        buf[o:o + k] = d[i:i + k]
+                    i += k
+                elif v == 0:
+                    if not xor:
+                        buf[o:o + k] = _ZEROS[:k]
+                elif xor:
+                    for j in range(o, o + k):
+                        buf[j] ^= v
+                else:
+                    for j in range(o, o + k):
+                        buf[j] = v
+                n -= k
+                o += k
+                col += k
+                if col == w:
+                    col = 0
+                    o += skip
+
+    def draw(self, oled, index, x, y, shown=None):
+        # 把圖展開到顯示緩衝區的 (x, y) 並標記為已變更；y 須為 8 的倍數
+        # （其他位置請解碼到 Canvas 再 blit）。若該位置已顯示第 shown 張圖，
+        # 且它正是這張圖的參考圖，只套用差異。
+        if y & 7:
+            raise ValueError('y must be a multiple of 8')
+        w, h = self.size(index)
+        h = (h + 7) & ~7  # 寫滿整個 page
+        width = oled.width
+        if x < 0 or y < 0 or x + w > width or y + h > oled.height:
+            raise ValueError('bitmap does not fit at this position')
+        base = (y >> 3) * width + x
+        if shown is not None and shown == self.reference(index):
+            self._expand(index, oled._fb, width, base, True)
+        else:
+            self._decode(index, oled._fb, width, base)
+        oled.mark_dirty(x, y, w, h)
@@ -0,0 +1,134 @@
+# SSD1306 驅動用的 1-bit 點陣字型（例如繁體中文），註解皆為中文，遵守 PEP8
+# 字形留在 flash 的檔案裡，依 code point 在排序好的索引中二分搜尋；
+# 找到後用 readinto 直接讀進預先配置好的 MONO_VLSB 緩衝區，一次 blit
+# 畫出。少量這種緩衝區組成 LRU，讓常用的字形留在 RAM。
+#
+# 檔案格式（little endian），由 tools/bdf2epf.py 產生：
+#   0  b'EPF1'
+#   4  字寬 (u8)，5 字高 (u8)，6 字數 (u16)
+#   8  字數 x u16 code point，由小到大
+#   .. 字數 x 字形點陣，每個 ((height + 7) // 8) * width bytes，
+#      與顯示器 framebuffer 相同的 MONO_VLSB
+#
+# - 使用方式
+# from cjk_font import BitmapFont
+# font = BitmapFont('font16.epf')
+# font.text(oled, '大家好 25C', 0, 16)
+# oled.show()
+import framebuf
+
+HEADER_SIZE = 8
+
+
+class BitmapFont:
+    def __init__(self, path, cache=16):
+        self._f = open(path, 'rb')
+        hdr = bytearray(HEADER_SIZE)
+        self._f.readinto(hdr)
+        if hdr[0:4] != b'EPF1':
+            self._f.close()
+            raise ValueError('not an EPF1 font file')
+        self.width = hdr[4]
+        self.height = hdr[5]
+        self.count = hdr[6] | (hdr[7] << 8)
+        self.glyph_bytes = ((self.height + 7) // 8) * self.width
+        self._data = HEADER_SIZE + 2 * self.count
+        self._key = bytearray(2)
+        # 已讀入字形的 LRU：各格緩衝區、對應的 code point 與最近使用時間
+        self._bufs = []
+        self._fbufs = []
+        for i in range(cache):
+            buf = bytearray(self.glyph_bytes)
+            self._bufs.append(buf)
+            self._fbufs.append(
+                framebuf.FrameBuffer1(buf, self.width, self.height))
+        self._codes = [-1] * cache
+        self._used = [0] * cache
+        self._slots = {}
+        self._clock = 0
+        # col=0 繪製用的反相副本
+        self._inv = bytearray(self.glyph_bytes)
+        self._inv_fb = framebuf.FrameBuffer1(self._inv, self.width,
+                                             self.height)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self._f.close()
+
+    def _find(self, code):
+        # 在檔案的 code point 索引中二分搜尋。
+        f = self._f
+        key = self._key
+        lo = 0
+        hi = self.count - 1
+        while lo <= hi:
+            mid = (lo + hi) >> 1
+            f.seek(HEADER_SIZE + 2 * mid)
+            f.readinto(key)
+            v = key[0] | (key[1] << 8)
+            if v < code:
+                lo = mid + 1
+            elif v > code:
+                hi = mid - 1
+            else:
+                return mid
+        return -1
+
+    def glyph(self, code):
+        # 回傳存有 code 字形的 FrameBuffer，字型沒有這個字時回傳 None。
+        # 在被其他字形淘汰前有效。
+        self._clock += 1
+        slot = self._slots.get(code)
+        if slot is not None:
+            self.hits += 1
+            self._used[slot] = self._clock
+            return self._fbufs[slot]
+        self.misses += 1
+        index = self._find(code)
+        if index < 0:
+            return None
+        slot = 0
+        for i in range(1, len(self._used)):
+            if self._used[i] < self._used[slot]:
+                slot = i
+        if self._codes[slot] >= 0:
+            del self._slots[self._codes[slot]]
+        self._f.seek(self._data + index * self.glyph_bytes)
+        self._f.readinto(self._bufs[slot])
+        self._codes[slot] = code
+        self._used[slot] = self._clock
+        self._slots[code] = slot
+        return self._fbufs[slot]
+
+    def text_width(self, string):
+        n = 0
+        for ch in string:
+            n += 8 if ord(ch) < 0x80 else self.width
+        return n
+
+    def text(self, oled, string, x, y, col=1):
+        # ASCII 改用內建 8x8 字型，在行內垂直置中；
+        # 字型中沒有的字元畫成方框。
+        w = self.width
+        h = self.height
+        ay = y + (h - 8) // 2
+        for ch in string:
+            code = ord(ch)
+            if code < 0x80:
+                oled.text(ch, x, ay, col)
+                x += 8
+                continue
+            fb = self.glyph(code)
+            if fb is None:
+                oled.rect(x + 1, y + 1, w - 2, h - 2, col)
+            elif col:
+                oled.blit(fb, x, y, 0, w, h)
+            else:
+                buf = self._bufs[self._slots[code]]
+                inv = self._inv
+                for i in range(self.glyph_bytes):
+                    inv[i] = buf[i] ^ 0xff
+                oled.blit(self._inv_fb, x, y, 1, w, h)
+            x += w
+        return x
@@ -12,7 +12,131 @@ Temper = sensor.readTemperatureData()
 Humidity = sensor.readHumidityData()
 print (Temper)
 print (Humidity)
+
+- Without holding the bus (the sensor NACKs reads instead of stretching
+  the clock while it converts, so the OLED can use I2C0 meanwhile)
+sensor.trigger_temperature()
+... draw, flush the OLED ...
+Temper = sensor.poll()      # None until the conversion time has passed
+
+- Faster, coarser conversions (RH 11 bit / T 11 bit: 7 ms instead of 50)
+sensor.set_resolution(HTU21D.RES_RH11_T11)
+
+- Integer readings in hundredths (no float objects), e.g. 2516 = 25.16 C
+from htu21d import dew_point, heat_index
+t = sensor.read_centi_c()       # or read_centi_f(), poll_centi()
+rh = sensor.read_centi_rh()
+print(dew_point(t, rh), heat_index(t, rh))
 '''
+import utime
+
+# CRC-8 (polynomial x^8 + x^5 + x^4 + 1 = 0x31, initial value 0) of every
+# byte value: crc = CRC8_TABLE[crc ^ byte] for each data byte
+CRC8_TABLE = (
+	b'\x00\x31\x62\x53\xc4\xf5\xa6\x97\xb9\x88\xdb\xea\x7d\x4c\x1f\x2e'
+	b'\x43\x72\x21\x10\x87\xb6\xe5\xd4\xfa\xcb\x98\xa9\x3e\x0f\x5c\x6d'
+	b'\x86\xb7\xe4\xd5\x42\x73\x20\x11\x3f\x0e\x5d\x6c\xfb\xca\x99\xa8'
+	b'\xc5\xf4\xa7\x96\x01\x30\x63\x52\x7c\x4d\x1e\x2f\xb8\x89\xda\xeb'
+	b'\x3d\x0c\x5f\x6e\xf9\xc8\x9b\xaa\x84\xb5\xe6\xd7\x40\x71\x22\x13'
+	b'\x7e\x4f\x1c\x2d\xba\x8b\xd8\xe9\xc7\xf6\xa5\x94\x03\x32\x61\x50'
+	b'\xbb\x8a\xd9\xe8\x7f\x4e\x1d\x2c\x02\x33\x60\x51\xc6\xf7\xa4\x95'
+	b'\xf8\xc9\x9a\xab\x3c\x0d\x5e\x6f\x41\x70\x23\x12\x85\xb4\xe7\xd6'
+	b'\x7a\x4b\x18\x29\xbe\x8f\xdc\xed\xc3\xf2\xa1\x90\x07\x36\x65\x54'
+	b'\x39\x08\x5b\x6a\xfd\xcc\x9f\xae\x80\xb1\xe2\xd3\x44\x75\x26\x17'
+	b'\xfc\xcd\x9e\xaf\x38\x09\x5a\x6b\x45\x74\x27\x16\x81\xb0\xe3\xd2'
+	b'\xbf\x8e\xdd\xec\x7b\x4a\x19\x28\x06\x37\x64\x55\xc2\xf3\xa0\x91'
+	b'\x47\x76\x25\x14\x83\xb2\xe1\xd0\xfe\xcf\x9c\xad\x3a\x0b\x58\x69'
+	b'\x04\x35\x66\x57\xc0\xf1\xa2\x93\xbd\x8c\xdf\xee\x79\x48\x1b\x2a'
+	b'\xc1\xf0\xa3\x92\x05\x34\x67\x56\x78\x49\x1a\x2b\xbc\x8d\xde\xef'
+	b'\x82\xb3\xe0\xd1\x46\x77\x24\x15\x3b\x0a\x59\x68\xff\xce\x9d\xac'
+)
+
+# 1000 * ln(rh / 100) for rh = 0, 2, 4 ... 100 % (entry 0 is never used)
+LN_RH = (
+	-4605, -3912, -3219, -2813, -2526, -2303, -2120, -1966, -1833, -1715,
+	-1609, -1514, -1427, -1347, -1273, -1204, -1139, -1079, -1022, -968,
+	-916, -868, -821, -777, -734, -693, -654, -616, -580, -545,
+	-511, -478, -446, -416, -386, -357, -329, -301, -274, -248,
+	-223, -198, -174, -151, -128, -105, -83, -62, -41, -20,
+	0,
+)
+
+# Heat index: NWS Rothfusz regression without its adjustments, in 0.01
+# deg C for 26, 28 ... 46 deg C (rows) and 0, 10 ... 100 %RH (columns)
+HEAT_INDEX = (
+	2479, 2514, 2549, 2585, 2620, 2656, 2693, 2729, 2766, 2804, 2841,
+	2668, 2661, 2674, 2710, 2766, 2845, 2945, 3067, 3210, 3375, 3561,
+	2848, 2815, 2824, 2875, 2969, 3105, 3283, 3504, 3767, 4072, 4419,
+	3018, 2977, 2998, 3082, 3228, 3436, 3707, 4041, 4437, 4895, 5416,
+	3177, 3146, 3196, 3329, 3543, 3839, 4218, 4678, 5220, 5845, 6551,
+	3327, 3323, 3419, 3616, 3914, 4314, 4814, 5415, 6117, 6920, 7825,
+	3468, 3507, 3666, 3945, 4342, 4860, 5496, 6252, 7128, 8122, 9237,
+	3598, 3699, 3938, 4313, 4827, 5477, 6264, 7189, 8251, 9450, 10787,
+	3718, 3899, 4234, 4723, 5367, 6166, 7119, 8226, 9488, 10905, 12476,
+	3829, 4106, 4554, 5173, 5964, 6926, 8059, 9363, 10838, 12485, 14303,
+	3930, 4320, 4899, 5664, 6617, 7757, 9085, 10600, 12302, 14192, 16269,
+)
+
+# 1000 * sqrt((17 - d) / 17) for d = |T - 95 F| = 0, 1 ... 17 F (and 0 past
+# the end), the factor of the NWS low humidity adjustment
+HEAT_DRY = (
+	1000, 970, 939, 907, 874, 840, 804, 767, 728, 686,
+	642, 594, 542, 485, 420, 343, 243, 0, 0,
+)
+
+def centi_c_to_f(c):
+	#0.01 deg C -> 0.01 deg F, rounded
+	return (c * 9 + 2) // 5 + 3200
+
+def dew_point(c, rh):
+	#Dew point in 0.01 deg C from 0.01 deg C and 0.01 %RH (Magnus formula,
+	# a = 17.62, b = 243.12 C, with ln(RH) interpolated from LN_RH; within
+	# 0.12 C of the float formula above 10 %RH)
+	if rh < 200:
+		rh = 200
+	if rh >= 10000:
+		g = 0
+	else:
+		k = rh // 200
+		g = LN_RH[k] + (LN_RH[k + 1] - LN_RH[k]) * (rh % 200) // 200
+	g += 17620 * c // (24312 + c)
+	return 24312 * g // (17620 - g)
+
+def heat_index(c, rh):
+	#Heat index in 0.01 deg C from 0.01 deg C and 0.01 %RH following the
+	# NWS algorithm: the simple formula while its mean with the air
+	# temperature is below 80 F, else the regression (bilinear in
+	# HEAT_INDEX) plus the low and high humidity adjustments.  Within
+	# 0.4 C of the float algorithm up to 46 C; hotter air is looked up in
+	# the 46 C row, so the result stops rising with the temperature there.
+	if 3780 * c + 47 * rh < 10310000:
+		return (1980 * c + 47 * rh - 710000 + 900) // 1800
+	t = c
+	if t < 2600:
+		t = 2600
+	elif t > 4599:
+		t = 4599
+	if rh < 0:
+		rh = 0
+	elif rh > 9999:
+		rh = 9999
+	i = (t - 2600) // 200 * 11 + rh // 1000
+	ft = (t - 2600) % 200
+	fr = rh % 1000
+	h = HEAT_INDEX
+	a = h[i] + (h[i + 1] - h[i]) * fr // 1000
+	b = h[i + 11] + (h[i + 12] - h[i + 11]) * fr // 1000
+	a += (b - a) * ft // 200
+	if rh > 8500 and 24000 <= 9 * c <= 27500:
+		# humid, 80..87 F
+		a += (rh - 8500) * (27500 - 9 * c) // 45000
+	elif rh < 1300 and 24000 <= 9 * c <= 40000:
+		# dry, 80..112 F
+		d = abs(9 * c // 5 - 6300)
+		k = d // 100
+		f = HEAT_DRY[k] + (HEAT_DRY[k + 1] - HEAT_DRY[k]) * (d % 100) // 100
+		a -= (1300 - rh) * f // 7200
+	return a
 
 class HTU21D:
 	# HTU21D Address
@@ -21,58 +145,187 @@ class HTU21D:
 	# Commands
 	TRIGGER_TEMP_MEASURE_HOLD = 0xE3
 	TRIGGER_HUMD_MEASURE_HOLD = 0xE5
+	TRIGGER_TEMP_MEASURE_NOHOLD = 0xF3
+	TRIGGER_HUMD_MEASURE_NOHOLD = 0xF5
 	READ_USER_REG = 0xE7
+	WRITE_USER_REG = 0xE6
+
+	# Measurement resolutions (user register bits 7 and 0)
+	RES_RH12_T14 = 0x00
+	RES_RH8_T12 = 0x01
+	RES_RH10_T13 = 0x80
+	RES_RH11_T11 = 0x81
+	RES_MASK = 0x81
+
+	# Maximum conversion times in ms (14-bit temperature, 12-bit RH)
+	TEMP_CONV_MS = 50
+	HUMD_CONV_MS = 16
+	# ... and for each resolution: (temperature, RH)
+	CONV_MS = {RES_RH12_T14: (50, 16), RES_RH8_T12: (13, 3),
+			   RES_RH10_T13: (25, 5), RES_RH11_T11: (7, 8)}
+	# Retry delay when the sensor still NACKs the read after the deadline
+	RETRY_MS = 2
+	# Retries allowed after twice the conversion time before poll() gives
+	# up on a sensor that never answers (unplugged or stuck)
+	RETRIES = 5
+	# Integer readings after a CRC error (-255 in hundredths)
+	CENTI_ERROR = -25500
 
 	# Constructor
 	def __init__(self,i2c):
 		self.i2c = i2c
+		self._cmd = bytearray(1)
+		# Every reading lands in this buffer (no new bytes object per read)
+		self._buf = bytearray(3)
+		# No-hold conversion in progress: its command (0 for none) and
+		# the tick after which the result can be read
+		self.pending = 0
+		self._due = 0
+		self._give_up = 0
+		# Conversion deadlines of the current resolution (power-on default
+		# is RH 12 bit / T 14 bit)
+		self.temp_ms = self.TEMP_CONV_MS
+		self.humd_ms = self.HUMD_CONV_MS
 		
 	def readUserRegister(self):
 		#Read the user register byte
 		return self.i2c.mem_read(1,self.address,self.READ_USER_REG)
+
+	def set_resolution(self, res):
+		#Select one of the RES_* modes by read-modify-write of the user
+		# register (the other bits are reserved, heater or status bits and
+		# must keep their values); the no-hold deadlines follow
+		if res not in self.CONV_MS:
+			raise ValueError('unknown resolution')
+		reg = self.readUserRegister()[0]
+		reg = (reg & ~self.RES_MASK & 0xFF) | res
+		self.i2c.send(bytearray((self.WRITE_USER_REG, reg)), self.address)
+		self.temp_ms, self.humd_ms = self.CONV_MS[res]
+
+	def get_resolution(self):
+		#Current RES_* mode, read back from the sensor
+		res = self.readUserRegister()[0] & self.RES_MASK
+		self.temp_ms, self.humd_ms = self.CONV_MS[res]
+		return res
 	
 	def readTemperatureData(self):
 		#Read 3 temperature bytes from the sensor
 		# value[0], value[1]: Raw temperature data
 		# value[2]: CRC
-		value = self.i2c.mem_read(3,self.address,self.TRIGGER_TEMP_MEASURE_HOLD)	
-		if not self.crc8check(value):
-			return -255
-		rawTempData = ( value[0] << 8 ) + value[1]
-		rawTempData = rawTempData & 0xFFFC; # Clear the status bits
-		# Calculate the actual temperature
-		actualTemp = -46.85 + (175.72 * rawTempData / 65536)
-		return actualTemp
+		self.i2c.mem_read(self._buf,self.address,self.TRIGGER_TEMP_MEASURE_HOLD)
+		return self.convertTemperature(self._buf)
+
+	def convertTemperature(self, value):
+		#deg C as a float, -255 on a CRC error
+		return self.centi_temperature(value) / 100
 
 	def readHumidityData(self):
 		#Read 3 humidity bytes from the sensor
 		# value[0], value[1]: Raw relative humidity data
 		# value[2]: CRC
-		value = self.i2c.mem_read(3,self.address,self.TRIGGER_HUMD_MEASURE_HOLD)	
+		self.i2c.mem_read(self._buf,self.address,self.TRIGGER_HUMD_MEASURE_HOLD)
+		return self.convertHumidity(self._buf)
+
+	def convertHumidity(self, value):
+		#%RH as a float, -255 on a CRC error
+		return self.centi_humidity(value) / 100
+
+	def read_centi_c(self):
+		#Temperature in 0.01 deg C as an int (CENTI_ERROR on a CRC error)
+		self.i2c.mem_read(self._buf,self.address,self.TRIGGER_TEMP_MEASURE_HOLD)
+		return self.centi_temperature(self._buf)
+
+	def read_centi_f(self):
+		#Temperature in 0.01 deg F as an int (CENTI_ERROR on a CRC error)
+		c = self.read_centi_c()
+		if c == self.CENTI_ERROR:
+			return c
+		return centi_c_to_f(c)
+
+	def read_centi_rh(self):
+		#Relative humidity in 0.01 % as an int (CENTI_ERROR on a CRC error)
+		self.i2c.mem_read(self._buf,self.address,self.TRIGGER_HUMD_MEASURE_HOLD)
+		return self.centi_humidity(self._buf)
+
+	def centi_temperature(self, value):
+		# -46.85 + 175.72 * raw / 65536 with an integer multiply and shift:
+		# the 14 data bits (status bits dropped) times 17572 stay below
+		# 2**30, a small int, so no heap object is created
+		if not self.crc8check(value):
+			return self.CENTI_ERROR
+		raw = (value[0] << 6) | (value[1] >> 2)
+		return ((raw * 17572 + 8192) >> 14) - 4685
+
+	def centi_humidity(self, value):
+		# -6 + 125 * raw / 65536 on the 12 data bits
 		if not self.crc8check(value):
-			return -255
+			return self.CENTI_ERROR
+		raw = (value[0] << 4) | (value[1] >> 4)
+		return ((raw * 12500 + 2048) >> 12) - 600
 
-		rawRHData = ( value[0] << 8 ) + value[1]
-		rawRHData = rawRHData & 0xFFFC; # Clear the status bits
-		# Calculate the actual RH
-		actualRH = -6 + (125.0 * rawRHData / 65536)
-		return actualRH
+	def trigger_temperature(self):
+		# Start a temperature conversion in no-hold mode; the bus is free
+		# until poll() collects the result.
+		self._trigger(self.TRIGGER_TEMP_MEASURE_NOHOLD, self.temp_ms)
+
+	def trigger_humidity(self):
+		self._trigger(self.TRIGGER_HUMD_MEASURE_NOHOLD, self.humd_ms)
+
+	def _trigger(self, cmd, ms):
+		self._cmd[0] = cmd
+		self.i2c.send(self._cmd, self.address)
+		self.pending = cmd
+		now = utime.ticks_ms()
+		self._due = utime.ticks_add(now, ms)
+		self._give_up = utime.ticks_add(
+			now, 2 * ms + self.RETRIES * self.RETRY_MS)
+
+	def poll(self):
+		# Result of the triggered conversion (deg C or %RH, -255 on a CRC
+		# error) once its maximum conversion time has passed, else None.
+		# The bus is not touched before the deadline.  Raises OSError
+		# (and drops the conversion) when the sensor still NACKs after
+		# twice the conversion time plus RETRIES retries.
+		value = self.poll_centi()
+		if value is None:
+			return None
+		return value / 100
+
+	def poll_centi(self):
+		# Same as poll() in 0.01 deg C or 0.01 %RH (ints)
+		if not self.pending:
+			return None
+		now = utime.ticks_ms()
+		if utime.ticks_diff(now, self._due) < 0:
+			return None
+		try:
+			self.i2c.recv(self._buf, self.address)
+		except OSError:
+			if utime.ticks_diff(now, self._give_up) >= 0:
+				self.pending = 0
+				raise
+			# still converting (NACK): try again shortly
+			self._due = utime.ticks_add(now, self.RETRY_MS)
+			return None
+		cmd = self.pending
+		self.pending = 0
+		if cmd == self.TRIGGER_TEMP_MEASURE_NOHOLD:
+			return self.centi_temperature(self._buf)
+		return self.centi_humidity(self._buf)
 	
-	def crc8check(self, value):
-		#Calulate the CRC8 for the data received
-		# from https://github.com/sparkfun/HTU21D_Breakout
-		remainder = ( ( value[0] << 8 ) + value[1] ) << 8
-		remainder |= value[2]
-		
-		# POLYNOMIAL = 0x0131 = x^8 + x^5 + x^4 + 1
-		# divsor = 0x988000 is polynomial shifted to farthest left of three bytes
-		divsor = 0x988000
-		
-		for i in range(0, 16):
-			if( remainder & 1 << (23 - i) ):
-				remainder ^= divsor
-			divsor = divsor >> 1
-		if remainder == 0:
-			return True
-		else:
-			return False
\ No newline at end of file
+	def crc8check(self, value, i=0):
+		#Check the CRC8 of the 3 bytes value[i..i+2] (msb, lsb, crc)
+		# two table lookups instead of a 16 step bit loop
+		t = CRC8_TABLE
+		return t[t[value[i]] ^ value[i + 1]] == value[i + 2]
+
+	def validate(self, buf, n):
+		#Check n readings stored back to back in buf as 3-byte records
+		# (msb, lsb, crc), e.g. raw samples buffered at a high rate;
+		# returns how many of them have a bad CRC
+		t = CRC8_TABLE
+		bad = 0
+		for i in range(0, 3 * n, 3):
+			if t[t[buf[i]] ^ buf[i + 1]] != buf[i + 2]:
+				bad += 1
+		return bad
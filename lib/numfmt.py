@@ -0,0 +1,82 @@
+# 顯示迴圈用的數字格式化，不配置新物件，註解皆為中文，遵守 PEP8
+# '{:.1f}'.format()、str() 與字串相加每次更新都會產生新的 heap 物件，
+# 在板子上就是頻繁的 GC 停頓。NumBuf 改為只用小整數運算，把整數與
+# 定點數（0.1 度、mV ...）以 ASCII 寫進一個預先配置的 bytearray，
+# 再由 SSD1306.text_buf() 直接畫出。
+#
+# - 使用方式
+# from numfmt import NumBuf
+# nb = NumBuf(12)
+# nb.clear().fixed(251, 1).put(b' C')   # 以 0.1 度為單位：'25.1 C'
+# oled.text_buf(nb.buf, 16, 0, 1, nb.n)
+# nb.clear().fixed(1234, 2, 6, 1)       # 1234 (0.01 單位) -> '  12.3'
+
+_POW10 = (1, 10, 100, 1000, 10000, 100000)
+
+
+class NumBuf:
+    def __init__(self, size=16):
+        self.buf = bytearray(size)
+        self.n = 0
+
+    def clear(self):
+        self.n = 0
+        return self
+
+    def put(self, chars):
+        # 附加 bytes（b'...' 字面值是常數，不會配置新物件）。
+        buf = self.buf
+        n = self.n
+        for c in chars:
+            buf[n] = c
+            n += 1
+        self.n = n
+        return self
+
+    def integer(self, value, width=0):
+        return self.fixed(value, 0, width)
+
+    def fixed(self, value, decimals=1, width=0, drop=0):
+        # 附加 value / 10**decimals，小數點後固定 decimals 位，
+        # 在 width 個字元內靠右對齊。drop 先以四捨五入（遠離零）去掉
+        # 這麼多位低位數，所以 0.01 單位的 fixed(2516, 1, drop=1) 得到 '25.2'。
+        neg = value < 0
+        if neg:
+            value = -value
+        if drop:
+            value = (value + _POW10[drop] // 2) // _POW10[drop]
+        if value == 0:
+            neg = False
+        digits = 1
+        t = value
+        while t >= 10:
+            t //= 10
+            digits += 1
+        if digits <= decimals:
+            digits = decimals + 1
+        length = digits
+        if decimals:
+            length += 1
+        if neg:
+            length += 1
+        buf = self.buf
+        n = self.n
+        while length < width:
+            buf[n] = 0x20
+            n += 1
+            width -= 1
+        if neg:
+            buf[n] = 0x2d  # '-'
+            n += 1
+            length -= 1
+        i = n + length - 1
+        n = i + 1
+        for k in range(digits):
+            if decimals and k == decimals:
+                buf[i] = 0x2e  # '.'
+                i -= 1
+            buf[i] = 0x30 + value % 10
+            value //= 10
+            i -= 1
+        self.n = n
+        return self
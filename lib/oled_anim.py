@@ -0,0 +1,121 @@
+# SSD1306 驅動用的 1-bit 圖片 / 動畫串流播放器，註解皆為中文，遵守 PEP8
+# 畫格留在 flash 檔案裡，以 readinto() 直接讀進顯示器的 framebuffer
+# （I2C 0x40 標頭之後的 bytes），不會另外用 Python 緩衝區保存整張畫格。
+# 第一張之後的畫格通常是以 page 為單位的差異：每個 page 只存、只讀
+# 有改變的 column 區段，並標記給 show() 送出。差異畫格假設 framebuffer
+# 仍是上一張畫格，所以播放期間不要在動畫區域上繪圖
+# （rewind() 會從關鍵畫格重新開始）。
+#
+# 檔案格式（little endian），由 tools/img2anim.py 產生：
+#   0  b'EPA1'
+#   4  寬 (u8)，5 高 (u8)，6 畫格數 (u16)
+#   8  畫格紀錄：
+#        種類 (u8)，區段數 (u8)，延遲 ms (u16)
+#        種類 0（關鍵畫格）：pages * width bytes，與顯示器相同的 MONO_VLSB
+#        種類 1（差異畫格）：區段數 x [page (u8)，x0 (u8)，x1 (u8)，
+#                                      x1 - x0 + 1 bytes]
+#
+# - 使用方式
+# from oled_anim import AnimPlayer, play_splash
+# play_splash(oled, 'boot.epa')           # 播放一次（會等到播完）
+# anim = AnimPlayer(oled, 'walk.epa')     # 或在主迴圈中逐步播放：
+# while True:
+#     anim.step()                         # 時間到才載入下一張畫格
+#     oled.flush_step(128)
+import utime
+
+HEADER_SIZE = 8
+KEY = 0
+DELTA = 1
+
+
+class AnimPlayer:
+    def __init__(self, oled, path, loop=True):
+        self.oled = oled
+        self.loop = loop
+        self._f = open(path, 'rb')
+        hdr = bytearray(HEADER_SIZE)
+        self._f.readinto(hdr)
+        if hdr[0:4] != b'EPA1':
+            raise ValueError('not an EPA1 animation file')
+        if hdr[4] != oled.width or hdr[5] != oled.height:
+            raise ValueError('animation is {}x{}'.format(hdr[4], hdr[5]))
+        self.count = hdr[6] | (hdr[7] << 8)
+        self.index = 0
+        # 顯示器 framebuffer 的 bytes（I2C 為 memoryview(buffer)[1:]）
+        self._fb = oled._fb
+        self._rec = bytearray(4)
+        self._run = bytearray(3)
+        self._due = utime.ticks_ms()
+
+    def close(self):
+        self._f.close()
+
+    def rewind(self):
+        self._f.seek(HEADER_SIZE)
+        self.index = 0
+
+    def next_frame(self):
+        # 把下一張畫格讀進 framebuffer 並標記變更的區域；
+        # 回傳該畫格的延遲 ms，不循環播放且已播完時回傳 -1。
+        if self.index >= self.count:
+            if not self.loop or self.count == 0:
+                return -1
+            self.rewind()
+        f = self._f
+        rec = self._rec
+        f.readinto(rec)
+        oled = self.oled
+        fb = self._fb
+        if rec[0] == KEY:
+            f.readinto(fb)
+            oled.mark_dirty()
+        else:
+            run = self._run
+            width = oled.width
+            for i in range(rec[1]):
+                f.readinto(run)
+                start = run[0] * width + run[1]
+                f.readinto(fb[start:start + run[2] - run[1] + 1])
+                oled.mark_dirty(run[1], run[0] * 8, run[2] - run[1] + 1, 8)
+        self.index += 1
+        return rec[2] | (rec[3] << 8)
+
+    def step(self):
+        # 不等待：目前畫格的時間到了才載入下一張，並以 begin_show()
+        # 排入待送佇列。有載入時回傳 True。
+        now = utime.ticks_ms()
+        if utime.ticks_diff(now, self._due) < 0:
+            return False
+        delay = self.next_frame()
+        if delay < 0:
+            return False
+        # 依排定時間計算下一張，而不是（較晚的）呼叫時間；
+        # 落後超過一張畫格時才從現在重新計算
+        self._due = utime.ticks_add(self._due, delay)
+        if utime.ticks_diff(now, self._due) > 0:
+            self._due = utime.ticks_add(now, delay)
+        self.oled.begin_show()
+        return True
+
+    def play(self):
+        # 播放到結束才返回（循環播放時不會結束）。
+        self._due = utime.ticks_ms()
+        while True:
+            wait = utime.ticks_diff(self._due, utime.ticks_ms())
+            if wait > 0:
+                utime.sleep_ms(wait)
+            if not self.step():
+                if self.index >= self.count and not self.loop:
+                    break
+                continue
+            self.oled.show()
+
+
+def play_splash(oled, path):
+    # 播放一次動畫（或單張圖片），例如開機畫面。
+    anim = AnimPlayer(oled, path, loop=False)
+    try:
+        anim.play()
+    finally:
+        anim.close()
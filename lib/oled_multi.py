@@ -0,0 +1,115 @@
+# 把多個 SSD1306 顯示器當成一組驅動，註解皆為中文，遵守 PEP8
+# 例如兩片 128x64 面板接在不同的 I2C port（ePy Lite 的 port 0..3）。
+# flush_step() 以輪流 (round-robin) 方式交錯送出各顯示器的分段資料，
+# 主迴圈每圈送一段，不會有面板要等另一片整張更新完。I2C.send() 會等到
+# 送完才返回，所以兩片面板的資料仍是一前一後送出：總匯流排時間是
+# shadow 比對、變更追蹤與 mirror() 省剩下的量，並不會減半；接線允許時
+# 請把 port 設成 400 kHz。共用的是繪圖：一個 SpriteCache 供所有面板使用
+# （text_buf() 的 8x8 字形表與 big_text() 的表本來就是類別共用），
+# mirror() 把一片顯示器變更的 bytes 複製到其他顯示器，不必畫兩次。
+#
+# - 使用方式
+# from ssd1306 import SSD1306_I2C
+# from sprite_cache import SpriteCache
+# from oled_multi import MultiDisplay
+# left = SSD1306_I2C(128, 64, I2C(0, I2C.MASTER, baudrate=400000))
+# right = SSD1306_I2C(128, 64, I2C(1, I2C.MASTER, baudrate=400000))
+# oleds = MultiDisplay((left, right), SpriteCache(1024))
+# oleds.text(0, 'T:', 0, 0)             # 顯示器 0，經由快取畫出
+# right.fill_rect(0, 0, 20, 8, 1)
+# oleds.begin_show()
+# while True:
+#     oleds.flush_step(128)             # 每次呼叫送出一片顯示器的一段
+
+
+class MultiDisplay:
+    def __init__(self, displays=(), sprites=None):
+        self.displays = list(displays)
+        self.sprites = sprites
+        self._turn = 0
+
+    def add(self, oled):
+        # 回傳顯示器的索引。
+        self.displays.append(oled)
+        return len(self.displays) - 1
+
+    def __getitem__(self, index):
+        return self.displays[index]
+
+    def __len__(self):
+        return len(self.displays)
+
+    def text(self, index, string, x, y, col=1):
+        # 在第 index 片顯示器上 oled.text()，經由共用的圖塊快取。
+        oled = self.displays[index]
+        if self.sprites is None:
+            oled.text(string, x, y, col)
+        else:
+            self.sprites.text(oled, string, x, y, col)
+
+    def mirror(self, src=0):
+        # 把顯示器 src 自上次 begin_show() 以來變更的內容，複製到其他
+        # 同尺寸的顯示器（兩片面板顯示相同畫面）；請在 begin_show() 前呼叫。
+        s = self.displays[src]
+        w = s.width
+        lo = s._dirty_lo
+        hi = s._dirty_hi
+        for d in self.displays:
+            if d is s or d.width != w or d.height != s.height:
+                continue
+            fb = d._fb
+            for p in range(s.pages):
+                if lo[p] > hi[p]:
+                    continue
+                start = p * w + lo[p]
+                end = p * w + hi[p] + 1
+                fb[start:end] = s._fb[start:end]
+                d.mark_dirty(lo[p], p * 8, hi[p] - lo[p] + 1, 8)
+
+    def set_max_fps(self, fps):
+        for d in self.displays:
+            d.set_max_fps(fps)
+
+    def begin_show(self, full=False, priority=False):
+        for d in self.displays:
+            d.begin_show(full, priority)
+
+    def flush_step(self, budget_bytes=None):
+        # 輪流送出下一片有待送資料的顯示器的一段；
+        # 所有顯示器都更新完成時回傳 True。
+        n = len(self.displays)
+        for k in range(n):
+            i = (self._turn + k) % n
+            d = self.displays[i]
+            sent = d.sent_bytes
+            d.flush_step(budget_bytes)
+            if d.sent_bytes != sent:
+                self._turn = (i + 1) % n
+                return False
+        return True
+
+    def show(self, full=False, priority=False):
+        # 更新所有顯示器，送完才返回；回傳送出的資料 bytes 數。
+        sent = self.sent_bytes()
+        self.begin_show(full, priority)
+        while not self.flush_step():
+            pass
+        return self.sent_bytes() - sent
+
+    def sent_bytes(self):
+        n = 0
+        for d in self.displays:
+            n += d.sent_bytes
+        return n
+
+    def reset_stats(self):
+        for d in self.displays:
+            d.reset_stats()
+
+    def bus_load(self):
+        # 各顯示器匯流排負載的總和：傳送會等到送完，所以這就是主迴圈
+        # 花在更新面板上的時間比例。
+        n = 0
+        for d in self.displays:
+            n += d.bus_load()
+        return n
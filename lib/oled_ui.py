@@ -0,0 +1,327 @@
+# SSD1306 驅動用的保留式 (retained-mode) 元件，註解皆為中文，遵守 PEP8
+# 每個元件擁有畫面上固定的一塊區域，並記住目前顯示的內容。
+# 設定新值只會把元件標記為需要重畫；Screen.render() 再清除並重畫
+# 有標記的區域。繪圖時驅動只會把這些區域記為已變更，所以接下來的
+# show()/begin_show() 也只送出它們（移動選單游標只重寫兩列，不是整個畫面）。
+#
+# - 使用方式
+# from oled_ui import Screen, Label, ValueField, ProgressBar, MenuList
+# screen = Screen(oled)
+# screen.add(Label(0, 0, 'T:'))
+# temp = screen.add(ValueField(16, 0, 6))
+# bar = screen.add(ProgressBar(0, 56, 128, 8, 100))
+# temp.set('25.1 C')
+# bar.set(40)
+# screen.show()
+from array import array
+
+
+def _text(oled, sprites, string, x, y, col):
+    if sprites is None:
+        oled.text(string, x, y, col)
+    else:
+        sprites.text(oled, string, x, y, col)
+
+
+class Widget:
+    def __init__(self, x, y, w, h):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.visible = True
+        self.dirty = True
+
+    def invalidate(self):
+        self.dirty = True
+
+    def show(self, visible=True):
+        if visible != self.visible:
+            self.visible = visible
+            self.invalidate()
+
+    def render(self, oled, sprites=None):
+        # 有標記時清除區域並重畫；有畫時回傳 True。
+        if not self.dirty:
+            return False
+        oled.fill_rect(self.x, self.y, self.w, self.h, 0)
+        if self.visible:
+            self.draw(oled, sprites)
+        self.dirty = False
+        return True
+
+    def draw(self, oled, sprites):
+        pass
+
+
+class Label(Widget):
+    # 8x8 字型的文字；區域寬度為 chars 個字元，換成較短的文字時
+    # 也會清掉舊文字多出來的尾巴。
+    def __init__(self, x, y, text, chars=None, col=1):
+        if chars is None:
+            chars = len(text)
+        Widget.__init__(self, x, y, 8 * chars, 8)
+        self.text = text
+        self.col = col
+
+    def set(self, text):
+        if text != self.text:
+            self.text = text
+            self.dirty = True
+
+    def draw(self, oled, sprites):
+        if self.col == 0:
+            oled.fill_rect(self.x, self.y, self.w, self.h, 1)
+        _text(oled, sprites, self.text, self.x, self.y, self.col)
+
+
+class ValueField(Label):
+    # 顯示會變動數值的 Label。set() 接收原始數值，只有與畫面上的值不同時
+    # 才格式化；right=True 時文字在區域內靠右對齊。
+    def __init__(self, x, y, chars, fmt='{}', right=False, col=1):
+        Label.__init__(self, x, y, '', chars, col)
+        self.fmt = fmt
+        self.right = right
+        self.value = None
+
+    def set(self, value):
+        if value != self.value or self.value is None:
+            self.value = value
+            self.text = self.fmt.format(value)
+            self.dirty = True
+
+    def draw(self, oled, sprites):
+        if self.col == 0:
+            oled.fill_rect(self.x, self.y, self.w, self.h, 1)
+        x = self.x
+        if self.right:
+            x += self.w - 8 * len(self.text)
+        _text(oled, sprites, self.text, x, self.y, self.col)
+
+
+class ProgressBar(Widget):
+    def __init__(self, x, y, w, h, maximum=100, value=0):
+        Widget.__init__(self, x, y, w, h)
+        self.maximum = maximum
+        self.value = value
+
+    def set(self, value):
+        if value < 0:
+            value = 0
+        elif value > self.maximum:
+            value = self.maximum
+        if value != self.value:
+            self.value = value
+            self.dirty = True
+
+    def draw(self, oled, sprites):
+        oled.rect(self.x, self.y, self.w, self.h, 1)
+        fill = (self.w - 4) * self.value // self.maximum
+        if fill > 0:
+            oled.fill_rect(self.x + 2, self.y + 2, fill, self.h - 4, 1)
+
+
+class Icon(Widget):
+    # 來自 FrameBuffer（或 Canvas 的 framebuf）的圖；set() 換圖。
+    def __init__(self, x, y, w, h, fbuf=None, key=-1):
+        Widget.__init__(self, x, y, w, h)
+        self.fbuf = fbuf
+        self.key = key
+
+    def set(self, fbuf):
+        if fbuf is not self.fbuf:
+            self.fbuf = fbuf
+            self.dirty = True
+
+    def draw(self, oled, sprites):
+        if self.fbuf is not None:
+            oled.blit(self.fbuf, self.x, self.y, self.key, self.w, self.h)
+
+
+class MenuList(Widget):
+    # 垂直選單，選取列以反白顯示。列與列相距 pitch 點、每列高 row_h 點；
+    # 每列各有重畫標記，移動游標只重畫舊的與新的那一列。列數由第一次
+    # 給的項目決定；text_dx/text_dy 為文字在列內的位置（預設垂直置中）。
+    def __init__(self, x, y, items, w=128, pitch=14, row_h=12, selected=0,
+                 text_dx=4, text_dy=None):
+        Widget.__init__(self, x, y, w, pitch * (len(items) - 1) + row_h)
+        self.items = items
+        self.pitch = pitch
+        self.row_h = row_h
+        self.text_dx = text_dx
+        self.text_dy = (row_h - 8) // 2 if text_dy is None else text_dy
+        self.selected = selected
+        self._rows = [True] * len(items)
+
+    def invalidate(self):
+        self.dirty = True
+        for i in range(len(self._rows)):
+            self._rows[i] = True
+
+    def select(self, index):
+        if index != self.selected:
+            self._rows[self.selected] = True
+            self._rows[index] = True
+            self.selected = index
+            self.dirty = True
+
+    def set_items(self, items, selected=0):
+        # 只重畫文字或反白狀態有改變的列。
+        for i in range(len(self._rows)):
+            if i >= len(items) or i >= len(self.items) \
+                    or items[i] != self.items[i] \
+                    or (i == selected) != (i == self.selected):
+                self._rows[i] = True
+                self.dirty = True
+        self.items = items
+        self.selected = selected
+
+    def render(self, oled, sprites=None):
+        if not self.dirty:
+            return False
+        for i in range(len(self._rows)):
+            if not self._rows[i]:
+                continue
+            y = self.y + i * self.pitch
+            sel = self.visible and i == self.selected
+            oled.fill_rect(self.x, y, self.w, self.row_h, 1 if sel else 0)
+            if self.visible and i < len(self.items):
+                _text(oled, sprites, self.items[i], self.x + self.text_dx,
+                      y + self.text_dy, 0 if sel else 1)
+            self._rows[i] = False
+        self.dirty = False
+        return True
+
+
+class Graph(Widget):
+    # 最近 w 筆資料的走勢圖，存在 array('h') 環形緩衝區。
+    # push() 只存資料；render() 只畫新的資料：
+    #  - 'sweep' 模式：游標由左往右走，每筆資料重寫自己的 column，並清空
+    #    前方一個 column 當作間隔，每次傳送只需兩個 column；
+    #  - 'scroll' 模式：用 oled.scroll_area() 把圖往左移一個 column
+    #    （y 與 h 須為 8 的倍數），最新的資料畫在最右邊。
+    # 超出 vmin..vmax 的值畫在上下邊緣。
+    def __init__(self, x, y, w, h, vmin, vmax, mode='sweep'):
+        if mode == 'scroll' and (y & 7 or h & 7):
+            raise ValueError('scroll mode needs a page aligned area')
+        Widget.__init__(self, x, y, w, h)
+        self.vmin = vmin
+        self.vmax = vmax
+        self.mode = mode
+        self.samples = array('h', [0] * w)
+        self.head = 0  # 下一筆資料的位置
+        self.count = 0
+        self._new = 0  # 上次 render() 之後新增的筆數
+
+    def push(self, value):
+        self.samples[self.head] = value
+        self.head = (self.head + 1) % self.w
+        if self.count < self.w:
+            self.count += 1
+        self._new += 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self._new = 0
+        self.dirty = True
+
+    def set_range(self, vmin, vmax):
+        if vmin != self.vmin or vmax != self.vmax:
+            self.vmin = vmin
+            self.vmax = vmax
+            self.dirty = True
+
+    def _row(self, value):
+        if value < self.vmin:
+            value = self.vmin
+        elif value > self.vmax:
+            value = self.vmax
+        return self.y + self.h - 1 - \
+            (value - self.vmin) * (self.h - 1) // (self.vmax - self.vmin)
+
+    def _column(self, oled, cx, i, prev):
+        # 在 column cx 畫第 i 筆資料，並以垂直線連到第 prev 筆。
+        oled.fill_rect(cx, self.y, 1, self.h, 0)
+        r = self._row(self.samples[i])
+        r0 = r if prev < 0 else self._row(self.samples[prev])
+        if r0 < r:
+            oled.fill_rect(cx, r0, 1, r - r0 + 1, 1)
+        else:
+            oled.fill_rect(cx, r, 1, r0 - r + 1, 1)
+
+    def _draw(self, oled, k):
+        # 畫最新資料往前數第 k 筆。
+        w = self.w
+        i = (self.head - 1 - k) % w
+        prev = (i - 1) % w if k + 1 < self.count else -1
+        if self.mode == 'sweep':
+            self._column(oled, self.x + i, i, prev)
+            oled.fill_rect(self.x + self.head, self.y, 1, self.h, 0)
+        else:
+            self._column(oled, self.x + w - 1 - k, i, prev)
+
+    def render(self, oled, sprites=None):
+        if self._new >= self.w:
+            self.dirty = True
+        if self.dirty:
+            Widget.render(self, oled, sprites)
+        elif not self._new:
+            return False
+        elif self.visible:
+            if self.mode == 'scroll':
+                oled.scroll_area(self.x, self.y, self.w, self.h, -self._new)
+            for k in range(self._new - 1, -1, -1):
+                self._draw(oled, k)
+            if self.mode == 'scroll' and self.count == self.w:
+                # 最舊的一筆已沒有前一筆：重畫成不連線
+                self._draw(oled, self.w - 1)
+        self._new = 0
+        # 使用背景的畫面上，restore_background() 不會蓋掉走勢圖
+        oled.keep_background(self.x, self.y, self.w, self.h)
+        return True
+
+    def draw(self, oled, sprites):
+        n = self.count
+        if self.mode == 'sweep' and n == self.w:
+            n -= 1
+        for k in range(n - 1, -1, -1):
+            self._draw(oled, k)
+
+
+class Screen:
+    def __init__(self, oled, sprites=None):
+        self.oled = oled
+        self.sprites = sprites
+        self.widgets = []
+
+    def add(self, widget):
+        self.widgets.append(widget)
+        return widget
+
+    def activate(self):
+        # 接管整個畫面，例如切換畫面時。
+        self.oled.fill(0)
+        for w in self.widgets:
+            w.invalidate()
+
+    def render(self):
+        # 重畫有標記的元件；回傳重畫的數量。
+        n = 0
+        for w in self.widgets:
+            if w.render(self.oled, self.sprites):
+                n += 1
+        return n
+
+    def update(self):
+        # render() 後把變更的區域排入 oled.flush_step() 的待送佇列。
+        n = self.render()
+        if n:
+            self.oled.begin_show()
+        return n
+
+    def show(self):
+        n = self.render()
+        if n:
+            self.oled.show()
+        return n
@@ -0,0 +1,284 @@
+# 固定記憶體的感測資料時間序列，註解皆為中文，遵守 PEP8
+# SampleRing 把一個或多個通道（例如溫度 0.01 C、濕度 0.01 %、AIN5 0.1 V）
+# 最近 size 筆樣本存在 array('h')，每筆另有以秒計的 16-bit 時間戳存在
+# array('H')；每次 push() 以固定時間更新：
+#  - 每個通道自上次 reset() 以來的最小/最大值，
+#  - 每個通道在環中樣本的平均（累計總和），
+#  - 指數移動平均（EMA，權重 1/2**ema_shift）。
+# 較長的時間窗由逐級降取樣得到：每分鐘的樣本合成一個 (min, max, mean)
+# 桶，十個分鐘桶再合成一個十分鐘桶；window(60 / 600 / 3600) 取最近
+# 完成的一分鐘、最近 10 分鐘，或最近 6 個十分鐘桶。
+# 所有儲存空間都在建構時配置，記憶體用量不隨執行時間改變；
+# push() 與各查詢方法不會建立物件。
+#
+# - 使用方式
+# from array import array
+# from sample_ring import SampleRing
+# ring = SampleRing(128, 3)              # 溫度、濕度、AIN5
+# sample = array('h', 3)
+# sample[0] = sensor.read_centi_c()
+# sample[1] = sensor.read_centi_rh()
+# sample[2] = ain_tenths
+# ring.push(sample)                      # 時間取自 utime.ticks_ms()
+# ring.ema(0), ring.mean(1), ring.low(0), ring.high(0)
+# w = ring.window(600, 0)                # 最近 10 分鐘：array (min, max, mean)
+# if w is not None:
+#     print(w[0], w[1], w[2])
+from array import array
+import utime
+
+# 每一級的桶數：10 個分鐘桶，再 6 個十分鐘桶
+MINUTES = 10
+BLOCKS = 6
+
+
+class SampleRing:
+    def __init__(self, size=128, channels=1, ema_shift=3):
+        self.size = size
+        self.channels = channels
+        self.ema_shift = ema_shift
+        self.values = array('h', [0] * (size * channels))
+        self.stamps = array('H', [0] * size)
+        self.head = 0  # 下一筆樣本的位置
+        self.count = 0
+        self._lo = array('h', [0] * channels)
+        self._hi = array('h', [0] * channels)
+        self._sum = array('l', [0] * channels)
+        self._ema = array('l', [0] * channels)  # EMA << ema_shift
+        # 目前這一分鐘：最小、最大、總和與樣本數
+        self._acc_lo = array('h', [0] * channels)
+        self._acc_hi = array('h', [0] * channels)
+        self._acc_sum = array('l', [0] * channels)
+        self._acc_n = 0
+        # 已完成的分鐘桶與十分鐘桶，每個桶依序存各通道；
+        # 沒有樣本的桶（感測器沒讀到）n = 0
+        self._min_lo = array('h', [0] * (MINUTES * channels))
+        self._min_hi = array('h', [0] * (MINUTES * channels))
+        self._min_avg = array('h', [0] * (MINUTES * channels))
+        self._min_n = array('H', [0] * MINUTES)
+        self._min_head = 0
+        self._blk_lo = array('h', [0] * (BLOCKS * channels))
+        self._blk_hi = array('h', [0] * (BLOCKS * channels))
+        self._blk_avg = array('h', [0] * (BLOCKS * channels))
+        self._blk_n = array('H', [0] * BLOCKS)
+        self._blk_head = 0
+        self._win = array('h', [0] * 3)
+        self._last = None  # 上一次 push() 的 tick
+        self._ms = 0  # 尚未計入 clock 的 ms
+        self._minute_ms = 0  # 目前這一分鐘已經過的 ms
+        self.clock = 0  # 第一次 push() 以來的秒數
+
+    def reset(self):
+        # 清除所有樣本與統計。
+        self.head = 0
+        self.count = 0
+        self._acc_n = 0
+        self._last = None
+        self._ms = 0
+        self._minute_ms = 0
+        self.clock = 0
+        for ch in range(self.channels):
+            self._sum[ch] = 0
+        for i in range(MINUTES):
+            self._min_n[i] = 0
+        for i in range(BLOCKS):
+            self._blk_n[i] = 0
+        self._min_head = 0
+        self._blk_head = 0
+
+    def push(self, values, now=None):
+        # 存入一筆樣本：每個通道取 values[ch]（請重複使用同一個
+        # array('h')，不要每次建立 tuple）。now 為 utime.ticks_ms() 的值，
+        # 未給時在這裡讀取。
+        if now is None:
+            now = utime.ticks_ms()
+        if self._last is not None:
+            dt = utime.ticks_diff(now, self._last)
+            if dt < 0:
+                dt = 0
+            self._ms += dt
+            self.clock += self._ms // 1000
+            self._ms %= 1000
+            self._minute_ms += dt
+            if self._minute_ms >= 60000:
+                minutes = self._minute_ms // 60000
+                self._minute_ms %= 60000
+                self._close_minutes(minutes)
+        self._last = now
+
+        n = self.channels
+        size = self.size
+        base = self.head * n
+        full = self.count == size
+        first = self.count == 0
+        shift = self.ema_shift
+        acc_first = self._acc_n == 0
+        for ch in range(n):
+            v = values[ch]
+            if full:
+                self._sum[ch] -= self.values[base + ch]
+            self.values[base + ch] = v
+            self._sum[ch] += v
+            if first:
+                self._lo[ch] = v
+                self._hi[ch] = v
+                self._ema[ch] = v << shift
+            else:
+                if v < self._lo[ch]:
+                    self._lo[ch] = v
+                elif v > self._hi[ch]:
+                    self._hi[ch] = v
+                self._ema[ch] += v - (self._ema[ch] >> shift)
+            if acc_first:
+                self._acc_lo[ch] = v
+                self._acc_hi[ch] = v
+                self._acc_sum[ch] = v
+            else:
+                if v < self._acc_lo[ch]:
+                    self._acc_lo[ch] = v
+                elif v > self._acc_hi[ch]:
+                    self._acc_hi[ch] = v
+                self._acc_sum[ch] += v
+        self._acc_n += 1
+        self.stamps[self.head] = self.clock & 0xFFFF
+        self.head = (self.head + 1) % size
+        if not full:
+            self.count += 1
+
+    def _close_minutes(self, minutes):
+        # 目前這一分鐘結束，之後還有 minutes - 1 分鐘沒有樣本。
+        if minutes > MINUTES * BLOCKS:
+            # 空白超過整個時間範圍：之前的分鐘桶與十分鐘桶全部過期
+            for i in range(MINUTES):
+                self._min_n[i] = 0
+            for i in range(BLOCKS):
+                self._blk_n[i] = 0
+            self._acc_n = 0
+            return
+        n = self.channels
+        for k in range(minutes):
+            h = self._min_head
+            cnt = self._acc_n if k == 0 else 0
+            self._min_n[h] = cnt if cnt < 0xFFFF else 0xFFFF
+            if cnt:
+                for ch in range(n):
+                    i = h * n + ch
+                    self._min_lo[i] = self._acc_lo[ch]
+                    self._min_hi[i] = self._acc_hi[ch]
+                    self._min_avg[i] = _div(self._acc_sum[ch], cnt)
+            self._min_head = (h + 1) % MINUTES
+            if self._min_head == 0:
+                # 滿十分鐘：合成一個十分鐘桶
+                h = self._blk_head
+                self._blk_n[h] = self._fold(
+                    self._min_lo, self._min_hi, self._min_avg, self._min_n,
+                    MINUTES, h, self._blk_lo, self._blk_hi, self._blk_avg)
+                self._blk_head = (h + 1) % BLOCKS
+        self._acc_n = 0
+
+    def _fold(self, lo, hi, avg, cnt, buckets, h, out_lo, out_hi, out_avg):
+        # 把各桶合成到 out_* 的第 h 格，回傳樣本數。
+        # 平均值以各桶的樣本數加權。
+        n = self.channels
+        total = 0
+        for b in range(buckets):
+            total += cnt[b]
+        if not total:
+            return 0
+        for ch in range(n):
+            first = True
+            s = 0
+            for b in range(buckets):
+                c = cnt[b]
+                if not c:
+                    continue
+                i = b * n + ch
+                if first or lo[i] < out_lo[h * n + ch]:
+                    out_lo[h * n + ch] = lo[i]
+                if first or hi[i] > out_hi[h * n + ch]:
+                    out_hi[h * n + ch] = hi[i]
+                first = False
+                s += avg[i] * c
+            out_avg[h * n + ch] = _div(s, total)
+        return total if total < 0xFFFF else 0xFFFF
+
+    def window(self, seconds, ch=0):
+        # 通道 ch 在最近完成的一分鐘 (60)、十分鐘 (600) 或一小時 (3600)
+        # 內的最小、最大與平均，寫入共用的 array('h', 3) 並回傳；
+        # 該時間窗沒有樣本時回傳 None。
+        if seconds == 60:
+            h = (self._min_head - 1) % MINUTES
+            if not self._min_n[h]:
+                return None
+            i = h * self.channels + ch
+            self._win[0] = self._min_lo[i]
+            self._win[1] = self._min_hi[i]
+            self._win[2] = self._min_avg[i]
+            return self._win
+        if seconds == 600:
+            lo = self._min_lo
+            hi = self._min_hi
+            avg = self._min_avg
+            cnt = self._min_n
+            buckets = MINUTES
+        elif seconds == 3600:
+            lo = self._blk_lo
+            hi = self._blk_hi
+            avg = self._blk_avg
+            cnt = self._blk_n
+            buckets = BLOCKS
+        else:
+            raise ValueError('window is 60, 600 or 3600 s')
+        n = self.channels
+        total = 0
+        s = 0
+        w = self._win
+        for b in range(buckets):
+            c = cnt[b]
+            if not c:
+                continue
+            i = b * n + ch
+            if not total or lo[i] < w[0]:
+                w[0] = lo[i]
+            if not total or hi[i] > w[1]:
+                w[1] = hi[i]
+            total += c
+            s += avg[i] * c
+        if not total:
+            return None
+        w[2] = _div(s, total)
+        return w
+
+    def get(self, k=0, ch=0):
+        # 最新樣本往前第 k 筆的通道 ch。
+        return self.values[(self.head - 1 - k) % self.size * self.channels
+                           + ch]
+
+    def age(self, k=0):
+        # 最新樣本往前第 k 筆存入至今的秒數
+        # （16-bit 時間戳：18 小時內有效）。
+        return (self.clock - self.stamps[(self.head - 1 - k) % self.size]) \
+            & 0xFFFF
+
+    def low(self, ch=0):
+        return self._lo[ch]
+
+    def high(self, ch=0):
+        return self._hi[ch]
+
+    def mean(self, ch=0):
+        # 環中樣本的平均（四捨五入）。
+        if not self.count:
+            return 0
+        return _div(self._sum[ch], self.count)
+
+    def ema(self, ch=0):
+        shift = self.ema_shift
+        return (self._ema[ch] + (1 << shift >> 1)) >> shift
+
+
+def _div(s, n):
+    # s / n，四捨五入（遠離零）
+    if s < 0:
+        return -((n // 2 - s) // n)
+    return (s + n // 2) // n
@@ -0,0 +1,111 @@
+# SSD1306 驅動用的圖塊 (sprite) 快取，註解皆為中文，遵守 PEP8
+# 重複出現的文字標籤與圖形只畫一次到畫面外的小 Canvas，之後用
+# SSD1306.blit() 貼上：像素由 C 複製，不必每張畫面都在 Python 裡重畫。
+# 每個項目以繪製參數為鍵（字串 + 顏色、半徑 + ...），像素緩衝區合計
+# 超過 RAM 預算時，淘汰最久沒用到的項目。
+#
+# - 使用方式
+# from ssd1306 import SSD1306_I2C
+# from sprite_cache import SpriteCache
+# sprites = SpriteCache(1024)
+# sprites.text(oled, 'T:', 0, 0)
+# sprites.fill_circle(oled, 24, 32, 10)
+# oled.show()
+from ssd1306 import Canvas
+
+# 圖塊最大寬度：驅動以 byte 記錄每個 page 的變更 column 範圍
+MAX_WIDTH = 256
+# 較長的字串以這個字數切段快取
+TEXT_CHARS = MAX_WIDTH // 8
+
+
+class SpriteCache:
+    def __init__(self, budget=2048):
+        # budget：所有圖塊像素緩衝區的 byte 數上限
+        self.budget = budget
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = {}  # 鍵 -> [canvas, 最近使用時間]
+        self._clock = 0
+
+    def get(self, key):
+        # 回傳鍵對應的 Canvas，沒有則回傳 None；並記為最近使用。
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._clock += 1
+        item[1] = self._clock
+        return item[0]
+
+    def put(self, key, width, height):
+        # 為鍵建立並回傳空白 Canvas：畫一次，之後都用 blit 貼上。
+        # 超過預算時先淘汰舊項目（單一圖塊比預算大時仍會保留）。
+        if width > MAX_WIDTH:
+            raise ValueError('sprite wider than {} px'.format(MAX_WIDTH))
+        self.remove(key)
+        size = ((height + 7) // 8) * width
+        while self._items and self.used + size > self.budget:
+            self._evict()
+        canvas = Canvas(width, height)
+        self._clock += 1
+        self._items[key] = [canvas, self._clock]
+        self.used += size
+        return canvas
+
+    def remove(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.used -= len(item[0].buffer)
+
+    def clear(self):
+        self._items = {}
+        self.used = 0
+
+    def _evict(self):
+        oldest = None
+        stamp = 0
+        for key in self._items:
+            if oldest is None or self._items[key][1] < stamp:
+                oldest = key
+                stamp = self._items[key][1]
+        self.remove(oldest)
+
+    def blit(self, oled, canvas, x, y, key):
+        oled.blit(canvas.framebuf, x, y, key, canvas.width, canvas.height)
+
+    def text(self, oled, string, x, y, col=1):
+        # 結果與 oled.text() 相同：只畫字形的點。圖塊底色為相反顏色，
+        # 當作 blit 的透明色。超過 TEXT_CHARS 個字元的字串分段快取。
+        if len(string) > TEXT_CHARS:
+            for i in range(0, len(string), TEXT_CHARS):
+                self.text(oled, string[i:i + TEXT_CHARS], x + 8 * i, y, col)
+            return
+        key = ('t', string, col)
+        canvas = self.get(key)
+        if canvas is None:
+            canvas = self.put(key, 8 * len(string), 8)
+            canvas.fill(col ^ 1)
+            canvas.text(string, 0, 0, col)
+        self.blit(oled, canvas, x, y, col ^ 1)
+
+    def circle(self, oled, x0, y0, r, col=1):
+        canvas = self._round(('c', r, col), r, col, False)
+        self.blit(oled, canvas, x0 - r, y0 - r, col ^ 1)
+
+    def fill_circle(self, oled, x0, y0, r, col=1):
+        canvas = self._round(('f', r, col), r, col, True)
+        self.blit(oled, canvas, x0 - r, y0 - r, col ^ 1)
+
+    def _round(self, key, r, col, fill):
+        canvas = self.get(key)
+        if canvas is None:
+            canvas = self.put(key, 2 * r + 1, 2 * r + 1)
+            canvas.fill(col ^ 1)
+            if fill:
+                canvas.fill_circle(r, r, r, col)
+            else:
+                canvas.circle(r, r, r, col)
+        return canvas
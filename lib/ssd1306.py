@@ -1,5 +1,6 @@
 # MicroPython SSD1306 OLED driver, I2C and SPI interfaces created by Adafruit
 from micropython import const
+import math
 import utime
 import framebuf
 
@@ -21,30 +22,104 @@ SET_DISP_CLK_DIV = const(0xd5)
 SET_PRECHARGE = const(0xd9)
 SET_VCOM_DESEL = const(0xdb)
 SET_CHARGE_PUMP = const(0x8d)
+SET_HSCROLL = const(0x26)  # + 1 to scroll left
+SET_VHSCROLL = const(0x29)  # + 1 to scroll left
+SET_SCROLL_OFF = const(0x2e)
+SET_SCROLL_ON = const(0x2f)
+SET_VSCROLL_AREA = const(0xa3)
+
+# Frames between scroll steps for each value of the interval field
+_SCROLL_FRAMES = (5, 64, 128, 256, 3, 4, 25, 2)
+
+# Panel orientation for the rotation argument: bit 0 mirrors the columns
+# (segment remap), bit 1 the rows (COM scan direction).  180 is accepted
+# for ROTATE_180.
+ROTATE_0 = const(0)
+MIRROR_H = const(1)
+MIRROR_V = const(2)
+ROTATE_180 = const(3)
+
+# Memory addressing modes (SET_MEM_ADDR argument) for the addressing
+# argument: vertical sends dirty pages together, column by column.
+ADDR_HORIZONTAL = const(0)
+ADDR_VERTICAL = const(1)
+
+# Data bytes per transfer in vertical addressing mode, and the bus bytes
+# of an address window (6 Co=1 command pairs + the data control byte);
+# merging dirty pages into one window may waste up to that per window.
+_VCHUNK = const(256)
+_WINDOW_COST = const(13)
+
+
+def _cdiv(a, b):
+    # Integer division rounding toward zero like C, not toward -inf.
+    q = a // b
+    if q < 0 and q * b != a:
+        q += 1
+    return q
 
 
 class SSD1306:
-    def __init__(self, width, height, external_vcc):
+    def __init__(self, width, height, external_vcc, shadow=False,
+                 rotation=ROTATE_0, addressing=ADDR_HORIZONTAL):
         self.width = width
         self.height = height
         self.external_vcc = external_vcc
-        self.pages = self.height // 8
-        # Note the subclass must initialize self.framebuf to a framebuffer.
+        self.pages = (self.height + 7) // 8
+        self.rotation = self._check_rotation(rotation)
+        self.addressing = ADDR_HORIZONTAL
+        # Column-major staging buffer for vertical addressing, with room for
+        # the window header in front (see write_columns()).
+        self._vbuf = None
+        if addressing != ADDR_HORIZONTAL:
+            self.set_addressing(addressing, False)
+        # Column range changed on each page since the last show(); a page is
+        # clean while its low bound is above its high bound.
+        self._dirty_lo = bytearray(self.pages)
+        self._dirty_hi = bytearray(self.pages)
+        self._clear_dirty()
+        # Region queued by begin_show() and not yet sent by flush_step().
+        self._pend_lo = bytearray(b'\xff' * self.pages)
+        self._pend_hi = bytearray(self.pages)
+        # Optional copy of what the panel currently shows; show() compares
+        # dirty columns against it and skips bytes that did not change.
+        self._shadow = bytearray(self.pages * width) if shadow else None
+        self._shadow_valid = False
+        # Frame-rate governor (set_max_fps()): minimum time between frames,
+        # earliest start of the next one and a deferred show() request.
+        self._frame_us = 0
+        self._next = 0
+        self._want = False
+        self.reset_stats()
+        # Hardware scroll in progress: (first page, last page, vertical)
+        self.scrolling = None
+        # Static background from save_background() and the column range
+        # drawn over it on each page since the last restore_background().
+        self._bg = None
+        self._ov_lo = bytearray(self.pages)
+        self._ov_hi = bytearray(self.pages)
+        # Address window command bytes reused by every show()
+        self._win = bytearray((SET_COL_ADDR, 0, 0, SET_PAGE_ADDR, 0, 0))
+        # Note the subclass must initialize self.framebuf to a framebuffer
+        # and self._fb to a memoryview of just the framebuffer bytes.
         # This is necessary because the underlying data buffer is different
         # between I2C and SPI implementations (I2C needs an extra byte).
         self.poweron()
         self.init_display()
 
     def init_display(self):
-        for cmd in (
+        # The whole sequence goes out as one command stream.
+        self.write_cmds(bytearray((
             SET_DISP | 0x00,  # off
             # address setting
-            SET_MEM_ADDR, 0x00,  # horizontal
+            SET_MEM_ADDR, self.addressing,
             # resolution and layout
             SET_DISP_START_LINE | 0x00,
-            SET_SEG_REMAP | 0x01,  # column addr 127 mapped to SEG0
+            # column addr 127 mapped to SEG0 unless mirrored horizontally
+            SET_SEG_REMAP | (0x00 if self.rotation & MIRROR_H else 0x01),
             SET_MUX_RATIO, self.height - 1,
-            SET_COM_OUT_DIR | 0x08,  # scan from COM[N] to COM0
+            # scan from COM[N] to COM0 unless mirrored vertically
+            SET_COM_OUT_DIR | (0x00 if self.rotation & MIRROR_V else 0x08),
             SET_DISP_OFFSET, 0x00,
             SET_COM_PIN_CFG, 0x02 if self.height == 32 else 0x12,
             # timing and driving scheme
@@ -57,63 +132,946 @@ class SSD1306:
             SET_NORM_INV,  # not inverted
             # charge pump
             SET_CHARGE_PUMP, 0x10 if self.external_vcc else 0x14,
-                SET_DISP | 0x01):  # on
-            self.write_cmd(cmd)
+            SET_DISP | 0x01)))  # on
         self.fill(0)
         self.show()
 
     def poweroff(self):
         self.write_cmd(SET_DISP | 0x00)
 
+    def _check_rotation(self, rotation):
+        if rotation == 180:
+            return ROTATE_180
+        if rotation not in (ROTATE_0, MIRROR_H, MIRROR_V, ROTATE_180):
+            raise ValueError('rotation must be 0, 180, MIRROR_H or MIRROR_V')
+        return rotation
+
+    def set_rotation(self, rotation):
+        # Turn or mirror the picture for panels mounted upside down or
+        # behind a mirror.  Done by the controller (segment remap and COM
+        # scan direction), so drawing costs nothing extra.  The segment
+        # remap only applies to data written afterwards, so the whole frame
+        # is resent on the next show().
+        rotation = self._check_rotation(rotation)
+        if rotation == self.rotation:
+            return
+        self.rotation = rotation
+        self.write_cmds(bytearray((
+            SET_SEG_REMAP | (0x00 if rotation & MIRROR_H else 0x01),
+            SET_COM_OUT_DIR | (0x00 if rotation & MIRROR_V else 0x08))))
+        if self._shadow is not None:
+            self.invalidate_shadow()
+        else:
+            self.mark_dirty()
+
+    def set_addressing(self, addressing, send=True):
+        # ADDR_VERTICAL suits UIs that change narrow columns over several
+        # pages (graphs, bar meters): those go out as one window instead
+        # of one per page, at the cost of a 269 byte staging buffer.
+        if addressing == self.addressing:
+            return
+        if addressing == ADDR_VERTICAL:
+            if self._vbuf is None:
+                self._vbuf = bytearray(_WINDOW_COST + _VCHUNK)
+        elif addressing != ADDR_HORIZONTAL:
+            raise ValueError('addressing must be ADDR_HORIZONTAL or '
+                             'ADDR_VERTICAL')
+        self.addressing = addressing
+        if send:
+            self.write_cmds(bytearray((SET_MEM_ADDR, addressing)))
+
     def contrast(self, contrast):
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(contrast)
+        self.write_cmds(bytearray((SET_CONTRAST, contrast)))
 
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
-    def show(self):
-        x0 = 0
-        x1 = self.width - 1
+    def hw_scroll(self, left=False, start_page=0, end_page=None, interval=5,
+                  vertical=0):
+        # Let the controller scroll pages start_page..end_page by itself,
+        # one column every `interval` frames (2, 3, 4, 5, 25, 64, 128 or
+        # 256; the nearest one is used).  vertical > 0 adds that many rows
+        # of upward movement per step (diagonal scroll) inside the area set
+        # with set_vscroll_area().  No data is sent while it runs; the next
+        # show() with changes stops it first, since the panel RAM must not
+        # be written during a scroll.
+        if end_page is None:
+            end_page = self.pages - 1
+        code = 0
+        for i in range(8):
+            if abs(_SCROLL_FRAMES[i] - interval) < \
+                    abs(_SCROLL_FRAMES[code] - interval):
+                code = i
+        # the controller scrolls RAM columns and COM lines: on a mirrored
+        # picture that is the other way
+        if self.rotation & MIRROR_H:
+            left = not left
+        if vertical and self.rotation & MIRROR_V:
+            vertical = self.height - vertical % self.height
+        if vertical:
+            cmds = bytearray((SET_SCROLL_OFF,
+                              SET_VHSCROLL + (left & 1),
+                              0x00, start_page, code, end_page,
+                              vertical % self.height, SET_SCROLL_ON))
+        else:
+            cmds = bytearray((SET_SCROLL_OFF, SET_HSCROLL + (left & 1),
+                              0x00, start_page, code, end_page, 0x00, 0xff,
+                              SET_SCROLL_ON))
+        # Flush pending changes first so the scroll starts from the frame
+        # the caller drew.
+        self.show(priority=True)
+        self.write_cmds(cmds)
+        self.scrolling = (start_page, end_page, vertical)
+
+    def hw_scroll_stop(self):
+        # Stop the controller scroll.  The panel RAM has moved under the
+        # driver, so the scrolled pages are rewritten on the next show().
+        if self.scrolling is None:
+            return
+        p0, p1, vertical = self.scrolling
+        self.scrolling = None
+        if vertical:
+            self.write_cmds(bytearray((SET_SCROLL_OFF,
+                                       SET_DISP_START_LINE | 0x00)))
+            p0 = 0
+            p1 = self.pages - 1
+        else:
+            self.write_cmd(SET_SCROLL_OFF)
+        if self._shadow is not None:
+            self.invalidate_shadow()
+        else:
+            self.mark_dirty(0, p0 * 8, self.width, (p1 - p0 + 1) * 8)
+
+    def set_vscroll_area(self, top, rows):
+        # Rows top..top+rows-1 take part in a vertical/diagonal scroll; the
+        # rest of the display stays fixed.
+        self.write_cmds(bytearray((SET_VSCROLL_AREA, top, rows)))
+
+    def _clear_dirty(self):
+        for p in range(self.pages):
+            self._dirty_lo[p] = 0xff
+            self._dirty_hi[p] = 0
+
+    def mark_dirty(self, x=0, y=0, w=None, h=None):
+        # Record that the rectangle changed so the next show() resends it.
+        # Call this after writing to self.buffer directly; with no arguments
+        # the whole display is marked.
+        if w is None:
+            w = self.width - x
+        if h is None:
+            h = self.height - y
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        if x + w > self.width:
+            w = self.width - x
+        if y + h > self.height:
+            h = self.height - y
+        if w <= 0 or h <= 0:
+            return
+        x1 = x + w - 1
+        lo = self._dirty_lo
+        hi = self._dirty_hi
+        for p in range(y >> 3, ((y + h - 1) >> 3) + 1):
+            if x < lo[p]:
+                lo[p] = x
+            if x1 > hi[p]:
+                hi[p] = x1
+        if self._bg is not None:
+            lo = self._ov_lo
+            hi = self._ov_hi
+            for p in range(y >> 3, ((y + h - 1) >> 3) + 1):
+                if x < lo[p]:
+                    lo[p] = x
+                if x1 > hi[p]:
+                    hi[p] = x1
+
+    def save_background(self):
+        # Keep the current frame (labels, frames, icons) as the background.
+        # From now on restore_background() replaces fill(0): it copies back
+        # only the columns drawn over since the previous restore, so the
+        # static parts are neither redrawn nor resent.
+        if self._bg is None:
+            self._bg = bytearray(len(self._fb))
+            self._bgv = memoryview(self._bg)
+        self._bg[:] = self._fb
+        self._clear_overlay()
+
+    def restore_background(self):
+        # Without a saved background this is just fill(0).
+        if self._bg is None:
+            self.fill(0)
+            return
+        bg = self._bgv
+        fb = self._fb
+        lo = self._ov_lo
+        hi = self._ov_hi
+        for p in range(self.pages):
+            if lo[p] > hi[p]:
+                continue
+            start = p * self.width + lo[p]
+            end = p * self.width + hi[p] + 1
+            fb[start:end] = bg[start:end]
+            self.mark_dirty(lo[p], p * 8, hi[p] - lo[p] + 1, 8)
+        self._clear_overlay()
+
+    def keep_background(self, x, y, w, h):
+        # Make the pages under the area part of the saved background, for
+        # content that is drawn incrementally and must survive
+        # restore_background() (e.g. a graph).  No-op without a background.
+        if self._bg is None:
+            return
+        x0 = max(x, 0)
+        x1 = min(x + w, self.width)
+        for p in range(max(y, 0) >> 3, (min(y + h, self.height) + 7) >> 3):
+            start = p * self.width + x0
+            end = p * self.width + x1
+            if start < end:
+                self._bgv[start:end] = self._fb[start:end]
+
+    def drop_background(self):
+        self._bg = None
+        self._bgv = None
+
+    def _clear_overlay(self):
+        for p in range(self.pages):
+            self._ov_lo[p] = 0xff
+            self._ov_hi[p] = 0
+
+    def set_max_fps(self, fps):
+        # Cap the frame rate (0 or None: no cap).  show() and begin_show()
+        # arriving sooner than 1/fps after the previous frame are merged
+        # into one deferred frame, which the next flush_step() (or show())
+        # starts once it is due; priority=True bypasses the cap.
+        self._frame_us = 1000000 // fps if fps else 0
+
+    def show(self, full=False, priority=False):
+        # Only the columns touched since the last call are sent: one address
+        # window per dirty page, or a single window over consecutive pages
+        # that are dirty across the full width (the framebuffer is
+        # contiguous there).  Returns the number of data bytes sent (0 when
+        # the governor deferred the frame).
+        sent = self.sent_bytes
+        if self.begin_show(full, priority):
+            while not self.flush_step():
+                pass
+        return self.sent_bytes - sent
+
+    def begin_show(self, full=False, priority=False):
+        # Queue the dirty region for flush_step() without touching the bus.
+        # Drawing may continue while the frame is going out; anything drawn
+        # after this call is picked up by the next begin_show().  Returns
+        # False if the frame rate cap deferred the request.
+        if full:
+            self.mark_dirty()
+        if self._frame_us and not priority and \
+                utime.ticks_diff(utime.ticks_us(), self._next) < 0:
+            self._want = True
+            self.coalesced += 1
+            return False
+        self._want = False
+        self._queue()
+        return True
+
+    def _queue(self):
+        if self._shadow is not None and self._shadow_valid:
+            self._diff_shadow()
+        if self.scrolling is not None:
+            # Leave a running scroll alone unless something must be sent.
+            for p in range(self.pages):
+                if self._dirty_lo[p] <= self._dirty_hi[p]:
+                    break
+            else:
+                return
+            self.hw_scroll_stop()
+        lo = self._dirty_lo
+        hi = self._dirty_hi
+        plo = self._pend_lo
+        phi = self._pend_hi
+        frame = False
+        for p in range(self.pages):
+            if lo[p] > hi[p]:
+                continue
+            frame = True
+            if plo[p] > phi[p]:
+                plo[p] = lo[p]
+                phi[p] = hi[p]
+            else:
+                if lo[p] < plo[p]:
+                    plo[p] = lo[p]
+                if hi[p] > phi[p]:
+                    phi[p] = hi[p]
+        self._clear_dirty()
+        if frame:
+            self.frames += 1
+            self._next = utime.ticks_add(utime.ticks_us(), self._frame_us)
+
+    def flush_step(self, budget_bytes=None):
+        # Send the next queued window: one page, a run of full-width pages
+        # or, with a budget smaller than the page range, the first
+        # budget_bytes columns of it.  Returns True once the frame queued
+        # by begin_show() is completely on the panel.  A frame deferred by
+        # the frame rate cap is queued here once it is due.
+        if self._want and \
+                utime.ticks_diff(utime.ticks_us(), self._next) >= 0:
+            self._want = False
+            self._queue()
+        lo = self._pend_lo
+        hi = self._pend_hi
+        p = 0
+        while p < self.pages and lo[p] > hi[p]:
+            p += 1
+        if p == self.pages:
+            return True
+        t = utime.ticks_us()
+        if self.addressing == ADDR_VERTICAL:
+            done = self._flush_columns(p, budget_bytes)
+        else:
+            done = self._flush_window(p, budget_bytes)
+        self.busy_us += utime.ticks_diff(utime.ticks_us(), t)
+        return done
+
+    def _flush_window(self, p, budget_bytes):
+        lo = self._pend_lo
+        hi = self._pend_hi
+        x0 = lo[p]
+        x1 = hi[p]
+        p1 = p
+        last = self.width - 1
+        if budget_bytes is not None and x1 - x0 + 1 > budget_bytes:
+            x1 = x0 + max(budget_bytes, 1) - 1
+            lo[p] = x1 + 1
+        else:
+            if x0 == 0 and x1 == last:
+                room = budget_bytes
+                if room is None:
+                    room = self.pages * self.width
+                n = self.width
+                while p1 + 1 < self.pages and lo[p1 + 1] == 0 \
+                        and hi[p1 + 1] == last and n + self.width <= room:
+                    p1 += 1
+                    n += self.width
+            for i in range(p, p1 + 1):
+                lo[i] = 0xff
+                hi[i] = 0
+        self._write_window(x0, x1, p, p1)
+        while p1 < self.pages and lo[p1] > hi[p1]:
+            p1 += 1
+        if p1 < self.pages:
+            return False
+        # The shadow now matches the panel everywhere.
+        self._shadow_valid = self._shadow is not None
+        return True
+
+    def _flush_columns(self, p, budget_bytes):
+        # flush_step() in vertical addressing mode: the dirty pages from p
+        # on go out as one window over the union of their column ranges,
+        # as long as the extra bytes cost less than separate windows.
+        lo = self._pend_lo
+        hi = self._pend_hi
+        x0 = lo[p]
+        x1 = hi[p]
+        own = x1 - x0 + 1
+        p1 = p
+        while p1 + 1 < self.pages and lo[p1 + 1] <= hi[p1 + 1]:
+            a = min(x0, lo[p1 + 1])
+            b = max(x1, hi[p1 + 1])
+            n = own + hi[p1 + 1] - lo[p1 + 1] + 1
+            if (b - a + 1) * (p1 + 2 - p) - n > _WINDOW_COST * (p1 + 1 - p):
+                break
+            x0 = a
+            x1 = b
+            own = n
+            p1 += 1
+        npages = p1 - p + 1
+        cols = _VCHUNK // npages
+        if budget_bytes is not None and budget_bytes // npages < cols:
+            cols = max(budget_bytes // npages, 1)
+        if x1 - x0 + 1 > cols:
+            x1 = x0 + cols - 1
+        for i in range(p, p1 + 1):
+            if hi[i] <= x1:
+                lo[i] = 0xff
+                hi[i] = 0
+            elif lo[i] <= x1:
+                lo[i] = x1 + 1
+        # gather the window column by column behind the header room
+        buf = self._vbuf
+        fb = self._fb
+        w = self.width
+        k = _WINDOW_COST
+        for x in range(x0, x1 + 1):
+            for i in range(p * w + x, (p1 + 1) * w, w):
+                buf[k] = fb[i]
+                k += 1
+        if self._shadow is not None:
+            sh = self._shadow
+            for i in range(p, p1 + 1):
+                sh[i * w + x0:i * w + x1 + 1] = fb[i * w + x0:i * w + x1 + 1]
+        win = self._win
+        off = 32 if w == 64 else 0
+        win[1] = x0 + off
+        win[2] = x1 + off
+        win[4] = p
+        win[5] = p1
+        self.write_columns(win, k - _WINDOW_COST)
+        self.sent_bytes += k - _WINDOW_COST
+        for i in range(self.pages):
+            if lo[i] <= hi[i]:
+                return False
+        self._shadow_valid = self._shadow is not None
+        return True
+
+    def _diff_shadow(self):
+        # Narrow each dirty range to the columns that really differ from
+        # what was last sent; identical pages become clean.
+        lo = self._dirty_lo
+        hi = self._dirty_hi
+        fb = self._fb
+        sh = self._shadow
+        for p in range(self.pages):
+            x0 = lo[p]
+            x1 = hi[p]
+            if x0 > x1:
+                continue
+            n = x1 - x0 + 1
+            base = p * self.width
+            while x0 <= x1 and fb[base + x0] == sh[base + x0]:
+                x0 += 1
+            while x1 > x0 and fb[base + x1] == sh[base + x1]:
+                x1 -= 1
+            if x0 > x1:
+                lo[p] = 0xff
+                hi[p] = 0
+                self.skipped_bytes += n
+            else:
+                lo[p] = x0
+                hi[p] = x1
+                self.skipped_bytes += n - (x1 - x0 + 1)
+
+    def invalidate_shadow(self):
+        # Forget what the panel shows (e.g. after it was written behind the
+        # driver's back) so the next show() resends the whole frame.
+        self._shadow_valid = False
+        self.mark_dirty()
+
+    def reset_stats(self):
+        self.sent_bytes = 0
+        self.skipped_bytes = 0
+        # frames started, show() requests merged by the governor and time
+        # spent in flush_step() sending, since _t0
+        self.frames = 0
+        self.coalesced = 0
+        self.busy_us = 0
+        self._t0 = utime.ticks_ms()
+
+    def fps(self):
+        # Frames per second sent since reset_stats().
+        ms = utime.ticks_diff(utime.ticks_ms(), self._t0)
+        return self.frames * 1000 / ms if ms > 0 else 0
+
+    def bus_load(self):
+        # Percentage of the time since reset_stats() spent sending frames
+        # (call reset_stats() every few minutes: busy_us is a small int).
+        ms = utime.ticks_diff(utime.ticks_ms(), self._t0)
+        return self.busy_us / (ms * 10) if ms > 0 else 0
+
+    def _write_window(self, x0, x1, p0, p1):
+        start = p0 * self.width + x0
+        end = p1 * self.width + x1 + 1
         if self.width == 64:
             # displays with width of 64 pixels are shifted by 32
             x0 += 32
             x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_framebuf()
+        win = self._win
+        win[1] = x0
+        win[2] = x1
+        win[4] = p0
+        win[5] = p1
+        self.write_window(win, start, end)
+        self.sent_bytes += end - start
+        if self._shadow is not None:
+            self._shadow[start:end] = self._fb[start:end]
 
     def fill(self, col):
         self.framebuf.fill(col)
+        self.mark_dirty()
 
     def pixel(self, x, y, col):
         self.framebuf.pixel(x, y, col)
+        self.mark_dirty(x, y, 1, 1)
 
     def scroll(self, dx, dy):
         self.framebuf.scroll(dx, dy)
+        self.mark_dirty()
+
+    def scroll_area(self, x, y, w, h, dx):
+        # Shift a page-aligned area (y and h multiples of 8) dx columns
+        # sideways.  Moving left is one slice move per page (a forward copy,
+        # safe for the overlap); moving right copies backwards byte by byte.
+        # Like scroll(), the columns uncovered at the edge keep their pixels.
+        if y & 7 or h & 7:
+            raise ValueError('area must be page aligned')
+        if dx == 0 or w <= abs(dx):
+            return
+        fb = self._fb
+        for p in range(y >> 3, (y + h) >> 3):
+            base = p * self.width + x
+            if dx < 0:
+                fb[base:base + w + dx] = fb[base - dx:base + w]
+            else:
+                for i in range(base + w - 1, base + dx - 1, -1):
+                    fb[i] = fb[i - dx]
+        self.mark_dirty(x, y, w, h)
 
     def text(self, string, x, y, col=1):
         self.framebuf.text(string, x, y, col)
+        self.mark_dirty(x, y, 8 * len(string), 8)
+
+    # Column bytes of the built-in 8x8 font for chars 32..127, captured
+    # from framebuf.text() on first use and shared by all displays.
+    _font = None
+
+    def _glyphs(self):
+        font = SSD1306._font
+        if font is None:
+            font = bytearray(96 * 8)
+            fb = framebuf.FrameBuffer(font, 96 * 8, 8, framebuf.MONO_VLSB)
+            for i in range(96):
+                fb.text(chr(32 + i), i * 8, 0, 1)
+            SSD1306._font = font
+        return font
+
+    def text_buf(self, buf, x, y, col=1, n=None):
+        # Same as text() for the first n bytes of a bytes/bytearray (e.g.
+        # from numfmt), without creating a str.  Glyph columns are shifted
+        # and OR-ed (col=0: AND-NOT) straight into the framebuffer bytes.
+        if n is None:
+            n = len(buf)
+        font = self._glyphs()
+        fb = self._fb
+        width = self.width
+        shift = y & 7
+        p0 = y >> 3
+        base0 = p0 * width if 0 <= p0 < self.pages else -1
+        base1 = (p0 + 1) * width if shift and 0 <= p0 + 1 < self.pages else -1
+        cx = x
+        for i in range(n):
+            c = buf[i]
+            if c < 32 or c > 127:
+                c = 127
+            g = (c - 32) * 8
+            for j in range(8):
+                if 0 <= cx < width:
+                    b = font[g + j]
+                    if base0 >= 0:
+                        if col:
+                            fb[base0 + cx] |= (b << shift) & 0xff
+                        else:
+                            fb[base0 + cx] &= ~(b << shift) & 0xff
+                    if base1 >= 0:
+                        if col:
+                            fb[base1 + cx] |= b >> (8 - shift)
+                        else:
+                            fb[base1 + cx] &= ~(b >> (8 - shift)) & 0xff
+                cx += 1
+        self.mark_dirty(x, y, 8 * n, 8)
+
+    # Bit-expansion tables for big_text(): entry v * scale + k is byte k of
+    # the source column byte v with every bit repeated scale times.
+    _expand = {}
+
+    def _expand_table(self, scale):
+        table = SSD1306._expand.get(scale)
+        if table is None:
+            table = bytearray(256 * scale)
+            for v in range(256):
+                for b in range(8):
+                    if v >> b & 1:
+                        bit = b * scale
+                        for i in range(bit, bit + scale):
+                            table[v * scale + (i >> 3)] |= 1 << (i & 7)
+            SSD1306._expand[scale] = table
+        return table
+
+    def big_text(self, string, x, y, scale=2, col=1, n=None):
+        # text() magnified scale times (str, bytes or bytearray).  Each font
+        # column is expanded through the lookup table into scale whole
+        # bytes, which are written scale times side by side.
+        if scale == 1:
+            if isinstance(string, str):
+                self.text(string, x, y, col)
+            else:
+                self.text_buf(string, x, y, col, n)
+            return
+        if n is None:
+            n = len(string)
+        font = self._glyphs()
+        table = self._expand_table(scale)
+        fb = self._fb
+        width = self.width
+        pages = self.pages
+        shift = y & 7
+        p0 = y >> 3
+        cx = x
+        for i in range(n):
+            c = string[i]
+            if not isinstance(c, int):
+                c = ord(c)
+            if c < 32 or c > 127:
+                c = 127
+            g = (c - 32) * 8
+            for j in range(8):
+                e = font[g + j] * scale
+                for k in range(scale):
+                    b = table[e + k]
+                    if not b:
+                        continue
+                    p = p0 + k
+                    lo = (b << shift) & 0xff
+                    hi = b >> (8 - shift) if shift else 0
+                    base0 = p * width if 0 <= p < pages else -1
+                    base1 = (p + 1) * width if hi and p + 1 < pages else -1
+                    for xx in range(cx, cx + scale):
+                        if 0 <= xx < width:
+                            if base0 >= 0:
+                                if col:
+                                    fb[base0 + xx] |= lo
+                                else:
+                                    fb[base0 + xx] &= ~lo & 0xff
+                            if base1 >= 0:
+                                if col:
+                                    fb[base1 + xx] |= hi
+                                else:
+                                    fb[base1 + xx] &= ~hi & 0xff
+                cx += scale
+        self.mark_dirty(x, y, 8 * scale * n, 8 * scale)
 
     def fill_rect(self, x, y, w, h, col=1):
         self.framebuf.fill_rect(x, y, w, h, col)
+        self.mark_dirty(x, y, w, h)
 
     def rect(self, x, y, w, h, col=1):
         self.framebuf.rect(x, y, w, h, col)
+        # the edges land on columns x, x+w-1 and rows y, y+h-1 even when
+        # w or h is not positive
+        self.mark_dirty(min(x, x + w - 1), min(y, y + h - 1),
+                        abs(w - 1) + 1, abs(h - 1) + 1)
 
     def line(self, x1, y1, x2, y2, col=1):
         self.framebuf.line(x1, y1, x2, y2, col)
+        if x1 > x2:
+            x1, x2 = x2, x1
+        if y1 > y2:
+            y1, y2 = y2, y1
+        self.mark_dirty(x1, y1, x2 - x1 + 1, y2 - y1 + 1)
 
-    def blit(self, fbuf, x, y, col=1):
+    def blit(self, fbuf, x, y, col=1, w=None, h=None):
+        # FrameBuffer objects do not expose their size, so pass w and h to
+        # keep the dirty region tight; otherwise everything to the right of
+        # and below (x, y) is resent.
         self.framebuf.blit(fbuf, x, y, col)
+        self.mark_dirty(x, y, w, h)
+
+    def circle(self, x0, y0, r, col=1):
+        # Midpoint circle drawn as runs: while x stays the same, the points
+        # of one octant share a column (vline) in the steep octants and a
+        # row (hline) in the flat ones, so each run costs one call.
+        hline = self.framebuf.hline
+        vline = self.framebuf.vline
+        x = r
+        y = 0
+        err = 0
+        ys = 0
+        while x >= y:
+            rx = x
+            ry = y
+            y += 1
+            if err <= 0:
+                err += 2 * y + 1
+            if err > 0:
+                x -= 1
+                err -= 2 * x + 1
+            if x != rx or x < y:
+                n = ry - ys + 1
+                vline(x0 + rx, y0 + ys, n, col)
+                vline(x0 - rx, y0 + ys, n, col)
+                vline(x0 + rx, y0 - ry, n, col)
+                vline(x0 - rx, y0 - ry, n, col)
+                hline(x0 + ys, y0 + rx, n, col)
+                hline(x0 - ry, y0 + rx, n, col)
+                hline(x0 + ys, y0 - rx, n, col)
+                hline(x0 - ry, y0 - rx, n, col)
+                ys = y
+        self.mark_dirty(x0 - r, y0 - r, 2 * r + 1, 2 * r + 1)
+
+    def fill_circle(self, x0, y0, r, col=1):
+        # Same midpoint walk as circle(), emitting one hline per row, so the
+        # fill ends exactly at the circle() outline.  That is a little
+        # smaller than filling every pixel with x*x + y*y <= r*r (297
+        # instead of 317 pixels at r=10).
+        hline = self.framebuf.hline
+        x = r
+        y = 0
+        err = 0
+        ys = 0
+        while x >= y:
+            rx = x
+            ry = y
+            y += 1
+            if err <= 0:
+                err += 2 * y + 1
+            if err > 0:
+                x -= 1
+                err -= 2 * x + 1
+            if x != rx or x < y:
+                for yy in range(ys, ry + 1):
+                    hline(x0 - rx, y0 + yy, 2 * rx + 1, col)
+                    if yy:
+                        hline(x0 - rx, y0 - yy, 2 * rx + 1, col)
+                if rx > ry:
+                    hline(x0 - ry, y0 + rx, 2 * ry + 1, col)
+                    hline(x0 - ry, y0 - rx, 2 * ry + 1, col)
+                ys = y
+        self.mark_dirty(x0 - r, y0 - r, 2 * r + 1, 2 * r + 1)
+
+    def ellipse(self, x0, y0, xr, yr, col=1, fill=False, m=0x0f):
+        # Integer midpoint ellipse (same walk as framebuf.ellipse in newer
+        # firmware).  m selects quadrants: bit 0 upper right, then counter
+        # clockwise.  The steep region is drawn as vertical runs, the flat
+        # region as horizontal runs; filled ellipses use one hline per row.
+        if xr < 0 or yr < 0:
+            return
+        hline = self.framebuf.hline
+        vline = self.framebuf.vline
+        if xr == 0 or yr == 0:
+            # Degenerate ellipse: the walks below never end for xr == yr
+            # == 0, so draw the point or the line segment directly.
+            if not m & 0x0f:
+                return
+            if xr == yr:
+                self.framebuf.pixel(x0, y0, col)
+            elif xr == 0:
+                top = y0 - yr if m & 3 else y0
+                bottom = y0 + yr if m & 12 else y0
+                vline(x0, top, bottom - top + 1, col)
+            else:
+                left = x0 - xr if m & 6 else x0
+                right = x0 + xr if m & 9 else x0
+                hline(left, y0, right - left + 1, col)
+            self.mark_dirty(x0 - xr, y0 - yr, 2 * xr + 1, 2 * yr + 1)
+            return
+        ta = 2 * xr * xr
+        tb = 2 * yr * yr
+        # Flat region: y moves one row per step, x occasionally.
+        x = xr
+        y = 0
+        xchange = yr * yr * (1 - 2 * xr)
+        ychange = xr * xr
+        error = 0
+        stopx = tb * xr
+        stopy = 0
+        ys = 0
+        while stopx >= stopy:
+            rx = x
+            ry = y
+            y += 1
+            stopy += ta
+            error += ychange
+            ychange += ta
+            if 2 * error + xchange > 0:
+                x -= 1
+                stopx -= tb
+                error += xchange
+                xchange += tb
+            if x != rx or stopx < stopy:
+                if fill:
+                    for yy in range(ys, ry + 1):
+                        self._ellipse_rows(x0, y0, rx, yy, col, m)
+                else:
+                    n = ry - ys + 1
+                    if m & 1:
+                        vline(x0 + rx, y0 - ry, n, col)
+                    if m & 2:
+                        vline(x0 - rx, y0 - ry, n, col)
+                    if m & 4:
+                        vline(x0 - rx, y0 + ys, n, col)
+                    if m & 8:
+                        vline(x0 + rx, y0 + ys, n, col)
+                ys = y
+        # Steep region: x moves one column per step, y occasionally.
+        x = 0
+        y = yr
+        xchange = yr * yr
+        ychange = xr * xr * (1 - 2 * yr)
+        error = 0
+        stopx = 0
+        stopy = ta * yr
+        xs = 0
+        while stopx <= stopy:
+            rx = x
+            ry = y
+            x += 1
+            stopx += tb
+            error += xchange
+            xchange += tb
+            if 2 * error + ychange > 0:
+                y -= 1
+                stopy -= ta
+                error += ychange
+                ychange += ta
+            if y != ry or stopx > stopy:
+                if fill:
+                    self._ellipse_rows(x0, y0, rx, ry, col, m)
+                else:
+                    n = rx - xs + 1
+                    if m & 1:
+                        hline(x0 + xs, y0 - ry, n, col)
+                    if m & 2:
+                        hline(x0 - rx, y0 - ry, n, col)
+                    if m & 4:
+                        hline(x0 - rx, y0 + ry, n, col)
+                    if m & 8:
+                        hline(x0 + xs, y0 + ry, n, col)
+                xs = x
+        self.mark_dirty(x0 - xr, y0 - yr, 2 * xr + 1, 2 * yr + 1)
+
+    def _ellipse_rows(self, x0, y0, x, y, col, m):
+        hline = self.framebuf.hline
+        if m & 1:
+            hline(x0, y0 - y, x + 1, col)
+        if m & 2:
+            hline(x0 - x, y0 - y, x + 1, col)
+        if m & 4:
+            hline(x0 - x, y0 + y, x + 1, col)
+        if m & 8:
+            hline(x0, y0 + y, x + 1, col)
+
+    def arc(self, x0, y0, r, start, end, col=1):
+        # Part of a circle from angle start to end in degrees, 0 pointing
+        # right and angles growing counter clockwise.  Points of the
+        # midpoint circle are kept when they lie inside the sweep, tested
+        # with integer cross products against the two edge directions.
+        sweep = (end - start) % 360
+        if sweep == 0:
+            if end != start:
+                self.circle(x0, y0, r, col)
+            return
+        sx = int(math.cos(math.radians(start)) * 1024)
+        sy = int(math.sin(math.radians(start)) * 1024)
+        ex = int(math.cos(math.radians(end)) * 1024)
+        ey = int(math.sin(math.radians(end)) * 1024)
+        pixel = self.framebuf.pixel
+        x = r
+        y = 0
+        err = 0
+        while x >= y:
+            for px, py in ((x, y), (y, x), (-y, x), (-x, y),
+                           (-x, -y), (-y, -x), (y, -x), (x, -y)):
+                a = sx * py - sy * px >= 0
+                b = px * ey - py * ex >= 0
+                if (a and b) if sweep <= 180 else (a or b):
+                    pixel(x0 + px, y0 - py, col)
+            y += 1
+            if err <= 0:
+                err += 2 * y + 1
+            if err > 0:
+                x -= 1
+                err -= 2 * x + 1
+        self.mark_dirty(x0 - r, y0 - r, 2 * r + 1, 2 * r + 1)
+
+    def polygon(self, x, y, coords, col=1):
+        # Closed outline through the points (x + coords[2i], y +
+        # coords[2i + 1]); coords may be a list or an array('h').
+        n = len(coords) // 2
+        if n == 0:
+            return
+        line = self.framebuf.line
+        px = coords[2 * n - 2]
+        py = coords[2 * n - 1]
+        for i in range(n):
+            qx = coords[2 * i]
+            qy = coords[2 * i + 1]
+            line(x + px, y + py, x + qx, y + qy, col)
+            px = qx
+            py = qy
+        self._mark_coords(x, y, coords)
+
+    def fill_polygon(self, x, y, coords, col=1):
+        # Even-odd scanline fill: for each row the crossings of all edges
+        # are collected in a preallocated list, sorted, and filled pairwise
+        # with one hline per span.
+        n = len(coords) // 2
+        if n == 0:
+            return
+        hline = self.framebuf.hline
+        pixel = self.framebuf.pixel
+        ymin = ymax = coords[1]
+        for i in range(1, n):
+            v = coords[2 * i + 1]
+            if v < ymin:
+                ymin = v
+            elif v > ymax:
+                ymax = v
+        nodes = [0] * n
+        for row in range(ymin, ymax + 1):
+            cnt = 0
+            # Edges are walked backwards from the first vertex and crossings
+            # rounded with C division, so the result matches framebuf.poly
+            # in newer firmware pixel for pixel.
+            px1 = coords[0]
+            py1 = coords[1]
+            for i in range(n - 1, -1, -1):
+                px2 = coords[2 * i]
+                py2 = coords[2 * i + 1]
+                if py1 != py2 and ((py1 > row) != (py2 > row)):
+                    node = _cdiv(32 * (px2 - px1) * (row - py1), py2 - py1)
+                    node = _cdiv(32 * px1 + node + 16, 32)
+                    j = cnt
+                    while j > 0 and nodes[j - 1] > node:
+                        nodes[j] = nodes[j - 1]
+                        j -= 1
+                    nodes[j] = node
+                    cnt += 1
+                elif row == max(py1, py2):
+                    # local minimum or horizontal edge the crossings miss
+                    if py1 < py2:
+                        pixel(x + px2, y + py2, col)
+                    elif py2 < py1:
+                        pixel(x + px1, y + py1, col)
+                    else:
+                        hline(x + min(px1, px2), y + row,
+                              abs(px1 - px2) + 1, col)
+                px1 = px2
+                py1 = py2
+            for i in range(0, cnt - 1, 2):
+                hline(x + nodes[i], y + row, nodes[i + 1] - nodes[i] + 1, col)
+        # C rounding of negative crossings can land one column outside
+        self._mark_coords(x, y, coords, 1)
+
+    def _mark_coords(self, x, y, coords, pad=0):
+        x0 = x1 = coords[0]
+        y0 = y1 = coords[1]
+        for i in range(2, len(coords) - 1, 2):
+            if coords[i] < x0:
+                x0 = coords[i]
+            elif coords[i] > x1:
+                x1 = coords[i]
+            if coords[i + 1] < y0:
+                y0 = coords[i + 1]
+            elif coords[i + 1] > y1:
+                y1 = coords[i + 1]
+        self.mark_dirty(x + x0 - pad, y + y0, x1 - x0 + 1 + 2 * pad,
+                        y1 - y0 + 1)
 
 
 class SSD1306_I2C(SSD1306):
-    def __init__(self, width, height, i2c, addr=0x3c, external_vcc=False):
+    def __init__(self, width, height, i2c, addr=0x3c, external_vcc=False,
+                 shadow=False, rotation=ROTATE_0,
+                 addressing=ADDR_HORIZONTAL):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
@@ -124,26 +1082,92 @@ class SSD1306_I2C(SSD1306):
         # buffer).
         self.buffer = bytearray(((height // 8) * width) + 1)
         self.buffer[0] = 0x40  # Set first byte of data buffer to Co=0, D/C=1
-        self.framebuf = framebuf.FrameBuffer1(
-            memoryview(self.buffer)[1:], width, height)
-        super().__init__(width, height, external_vcc)
+        # Scratch for command streams: control byte Co=0, D/C#=0 followed by
+        # up to 31 command bytes.
+        self._cmdbuf = bytearray(32)
+        # Bytes in front of a data slice saved while they carry the window
+        # commands (6 x Co=1 pairs + the data control byte).
+        self._saved = bytearray(13)
+        self._fb = memoryview(self.buffer)[1:]
+        self.framebuf = framebuf.FrameBuffer1(self._fb, width, height)
+        super().__init__(width, height, external_vcc, shadow, rotation,
+                         addressing)
 
     def write_cmd(self, cmd):
         self.temp[0] = 0x80  # Co=1, D/C#=0
         self.temp[1] = cmd
         self.i2c.send(self.temp, self.addr)
 
-    def write_framebuf(self):
-        # Blast out the frame buffer using a single I2C transaction to support
-        # hardware I2C interfaces.
-        self.i2c.send(self.buffer, self.addr)
+    def write_cmds(self, cmds):
+        # Send a whole command sequence in one I2C transaction.
+        n = len(cmds)
+        if n >= len(self._cmdbuf):
+            self.i2c.send(bytes(1) + bytes(cmds), self.addr)
+            return
+        buf = self._cmdbuf
+        buf[0] = 0x00  # Co=0, D/C#=0
+        buf[1:n + 1] = cmds
+        self.i2c.send(memoryview(buf)[:n + 1], self.addr)
+
+    def write_window(self, cmds, start, end):
+        # Address window and data in a single transaction: each command byte
+        # goes with a Co=1 control byte, then 0x40 starts the data stream.
+        # The header is written over the 13 bytes in front of the slice and
+        # restored afterwards; too close to the start of the buffer, fall
+        # back to a command transaction plus a data transaction.
+        if start < 12:
+            self.write_cmds(cmds)
+            self.write_framebuf(start, end)
+            return
+        buf = self.buffer
+        saved = self._saved
+        h = start - 12
+        saved[:] = memoryview(buf)[h:start + 1]
+        i = h
+        for cmd in cmds:
+            buf[i] = 0x80  # Co=1, D/C#=0
+            buf[i + 1] = cmd
+            i += 2
+        buf[i] = 0x40
+        try:
+            self.i2c.send(memoryview(buf)[h:end + 1], self.addr)
+        finally:
+            buf[h:start + 1] = saved
+
+    def write_columns(self, cmds, n):
+        # Address window and the n bytes staged in self._vbuf (behind 13
+        # bytes of header room) in a single transaction.
+        buf = self._vbuf
+        i = 0
+        for cmd in cmds:
+            buf[i] = 0x80  # Co=1, D/C#=0
+            buf[i + 1] = cmd
+            i += 2
+        buf[i] = 0x40
+        self.i2c.send(memoryview(buf)[:i + 1 + n], self.addr)
+
+    def write_framebuf(self, start=0, end=None):
+        # Blast out the frame buffer (or framebuffer bytes start..end-1) using
+        # a single I2C transaction to support hardware I2C interfaces.  For a
+        # partial slice the byte in front of it is borrowed to carry the
+        # Co=0, D/C#=1 control byte and restored right after the transfer.
+        if end is None or (start == 0 and end == len(self.buffer) - 1):
+            self.i2c.send(self.buffer, self.addr)
+            return
+        buf = self.buffer
+        saved = buf[start]
+        buf[start] = 0x40
+        self.i2c.send(memoryview(buf)[start:end + 1], self.addr)
+        buf[start] = saved
 
     def poweron(self):
         pass
 
 
 class SSD1306_SPI(SSD1306):
-    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False):
+    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False,
+                 shadow=False, rotation=ROTATE_0,
+                 addressing=ADDR_HORIZONTAL):
         self.rate = 10 * 1024 * 1024
         dc.init(dc.OUT, value=0)
         res.init(res.OUT, value=0)
@@ -152,24 +1176,57 @@ class SSD1306_SPI(SSD1306):
         self.dc = dc
         self.res = res
         self.cs = cs
+        self._cmd1 = bytearray(1)
         self.buffer = bytearray((height // 8) * width)
-        self.framebuf = framebuf.FrameBuffer1(self.buffer, width, height)
-        super().__init__(width, height, external_vcc)
+        self._fb = memoryview(self.buffer)
+        self.framebuf = framebuf.FrameBuffer1(self._fb, width, height)
+        super().__init__(width, height, external_vcc, shadow, rotation,
+                         addressing)
 
     def write_cmd(self, cmd):
+        self._cmd1[0] = cmd
+        self.write_cmds(self._cmd1)
+
+    def write_cmds(self, cmds):
+        # One bus setup and one chip-select cycle for the whole sequence.
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs.high()
+        self.dc.low()
+        self.cs.low()
+        self.spi.write(cmds)
+        self.cs.high()
+
+    def write_window(self, cmds, start, end):
+        # Address window and data under a single chip select: D/C# is
+        # switched to data between the two writes.
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs.high()
+        self.dc.low()
+        self.cs.low()
+        self.spi.write(cmds)
+        self.dc.high()
+        self.spi.write(memoryview(self.buffer)[start:end])
+        self.cs.high()
+
+    def write_columns(self, cmds, n):
         self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.cs.high()
         self.dc.low()
         self.cs.low()
-        self.spi.write(bytearray([cmd]))
+        self.spi.write(cmds)
+        self.dc.high()
+        self.spi.write(memoryview(self._vbuf)[_WINDOW_COST:_WINDOW_COST + n])
         self.cs.high()
 
-    def write_framebuf(self):
+    def write_framebuf(self, start=0, end=None):
         self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.cs.high()
         self.dc.high()
         self.cs.low()
-        self.spi.write(self.buffer)
+        if end is None:
+            self.spi.write(self.buffer)
+        else:
+            self.spi.write(memoryview(self.buffer)[start:end])
         self.cs.high()
 
     def poweron(self):
@@ -180,6 +1237,36 @@ class SSD1306_SPI(SSD1306):
         self.res.high()
 
 
+class Canvas(SSD1306):
+    # Off-screen drawing surface with the same primitives as the display
+    # but no bus behind it, e.g. for sprites that are later composited
+    # with SSD1306.blit(canvas.framebuf, x, y, key, canvas.width,
+    # canvas.height).  The height does not have to be a multiple of 8.
+    def __init__(self, width, height):
+        self.buffer = bytearray(((height + 7) // 8) * width)
+        self._fb = memoryview(self.buffer)
+        self.framebuf = framebuf.FrameBuffer1(self._fb, width, height)
+        super().__init__(width, height, False)
+
+    def init_display(self):
+        pass
+
+    def poweron(self):
+        pass
+
+    def write_cmd(self, cmd):
+        pass
+
+    def write_cmds(self, cmds):
+        pass
+
+    def write_window(self, cmds, start, end):
+        pass
+
+    def write_columns(self, cmds, n):
+        pass
+
+
 if __name__ == "__main__":
     from machine import Pin, I2C
     import utime
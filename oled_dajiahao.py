@@ -14,12 +14,29 @@ oled_dajiahao.py
      oled_dajiahao.main()
 
 注意：若要改變字型大小或位置，可修改陣列尺寸或繪製起始 x,y。
+
+字型檔模式：
+ - 若開發板上有 `font16.epf`（由 `tools/bdf2epf.py` 從 BDF 字型產生），
+   改用 `lib/cjk_font.py` 從 flash 讀取壓縮的 1-bit 字形，每個字只需一次 blit，
+   不必把整套字形以字串陣列放在記憶體裡。
+ - 產生字型檔：python tools/bdf2epf.py <字型.bdf> --size 16x16 --chars 大家好 -o font16.epf
+
+圖庫模式：
+ - 沒有字型檔但有 `dajiahao.epb` 時，改用 `lib/bitmap_pack.py` 把壓縮過的字形
+   直接解碼到 OLED 緩衝區（不必逐點呼叫 pixel()）。
+ - 產生圖庫（由本檔的像素陣列編譯）：python tools/img2epb.py oled_dajiahao.py -o dajiahao.epb
 """
 
 from machine import I2C
 from lib.ssd1306 import SSD1306_I2C
+from lib.cjk_font import BitmapFont
+from lib.bitmap_pack import BitmapPack
 import utime
 
+# 字型檔路徑（找不到時依序退回壓縮圖庫、下方的像素陣列）
+FONT_PATH = 'font16.epf'
+PACK_PATH = 'dajiahao.epb'
+
 
 # 每個字為 16x16，'1' 表示點亮，'0' 表示不點亮
 # 以下為手繪的簡易像素版，僅供示意（可依需求修改）
@@ -118,9 +135,31 @@ def main():
     x_start = 8
     y_start = 16
 
-    draw_bitmap(oled, x_start + 0 * (16 + 4), y_start, CHAR_DA)
-    draw_bitmap(oled, x_start + 1 * (16 + 4), y_start, CHAR_JIA)
-    draw_bitmap(oled, x_start + 2 * (16 + 4), y_start, CHAR_HAO)
+    try:
+        font = BitmapFont(FONT_PATH)
+    except OSError:
+        font = None
+
+    pack = None
+    if font is None:
+        try:
+            pack = BitmapPack(PACK_PATH)
+        except OSError:
+            pack = None
+
+    if font is not None:
+        # 字型檔模式：逐字從 flash 讀出並 blit（保留同樣的 4 pixel 字距）
+        for i, ch in enumerate('大家好'):
+            font.text(oled, ch, x_start + i * (16 + 4), y_start)
+        font.close()
+    elif pack is not None:
+        # 圖庫模式：依序為 CHAR_DA、CHAR_JIA、CHAR_HAO，直接解碼進 OLED 緩衝區
+        for i in range(3):
+            pack.draw(oled, i, x_start + i * (16 + 4), y_start)
+    else:
+        draw_bitmap(oled, x_start + 0 * (16 + 4), y_start, CHAR_DA)
+        draw_bitmap(oled, x_start + 1 * (16 + 4), y_start, CHAR_JIA)
+        draw_bitmap(oled, x_start + 2 * (16 + 4), y_start, CHAR_HAO)
 
     oled.show()
 
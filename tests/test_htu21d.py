@@ -0,0 +1,87 @@
+"""
+test_htu21d.py
+
+主機端 (CPython) 測試：`lib/htu21d.py` 的 heat_index() 查表結果與 NWS
+熱指數浮點演算法（簡易公式 / Rothfusz 迴歸與兩項修正）的誤差不超過 0.4 C；
+感測器一直不回應 (NACK) 時 poll_centi() 不會永遠回傳 None。
+
+使用方式：
+    python -m pytest -q tests
+"""
+
+import math
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'tools', 'host'),
+                os.path.join(ROOT, 'tools'), ROOT, os.path.join(ROOT, 'lib')]
+
+import lib.htu21d as htu21d  # noqa: E402
+from lib.htu21d import HTU21D, heat_index  # noqa: E402
+
+
+def nws_heat_index(tc, rh):
+    """NWS 熱指數（攝氏、%RH 浮點數，回傳攝氏）。"""
+    t = tc * 9 / 5 + 32
+    hi = 0.5 * (t + 61 + (t - 68) * 1.2 + rh * 0.094)
+    if (hi + t) / 2 >= 80:
+        hi = (-42.379 + 2.04901523 * t + 10.14333127 * rh
+              - .22475541 * t * rh - .00683783 * t * t
+              - .05481717 * rh * rh + .00122874 * t * t * rh
+              + .00085282 * t * rh * rh - .00000199 * t * t * rh * rh)
+        if rh < 13 and 80 <= t <= 112:
+            hi -= (13 - rh) / 4 * math.sqrt((17 - abs(t - 95)) / 17)
+        elif rh > 85 and 80 <= t <= 87:
+            hi += (rh - 85) / 10 * (87 - t) / 5
+    return (hi - 32) * 5 / 9
+
+
+def test_heat_index_within_bound():
+    worst = 0
+    for c in range(-4000, 4600, 7):
+        for rh in range(0, 10001, 13):
+            err = abs(heat_index(c, rh) / 100 - nws_heat_index(c / 100,
+                                                               rh / 100))
+            worst = max(worst, err)
+    assert worst <= 0.4
+
+
+def test_heat_index_near_80f_switch():
+    # NWS 在 80 F 切換公式的區域（先前雙線性內插跨過切換點）
+    for c in range(2600, 2751):
+        for rh in range(8500, 10001, 3):
+            err = abs(heat_index(c, rh) / 100 - nws_heat_index(c / 100,
+                                                               rh / 100))
+            assert err <= 0.4, (c, rh, err)
+
+
+def test_heat_index_clamped_above_46c():
+    assert heat_index(6000, 5000) == heat_index(4599, 5000)
+
+
+class NackI2C:
+    """每次讀取都 NACK 的 I2C（感測器拔掉或卡住）。"""
+
+    def send(self, buf, addr):
+        pass
+
+    def recv(self, buf, addr):
+        raise OSError(5)
+
+
+def test_poll_gives_up_on_nack(monkeypatch):
+    clock = [0]
+    monkeypatch.setattr(htu21d.utime, 'ticks_ms', lambda: clock[0])
+    sensor = HTU21D(NackI2C())
+    sensor.trigger_temperature()
+    limit = 2 * sensor.temp_ms + sensor.RETRIES * sensor.RETRY_MS
+    while clock[0] < limit:
+        assert sensor.poll_centi() is None
+        clock[0] += 1
+    with pytest.raises(OSError):
+        sensor.poll_centi()
+    assert not sensor.pending
+    assert sensor.poll_centi() is None
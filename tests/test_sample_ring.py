@@ -0,0 +1,44 @@
+"""
+test_sample_ring.py
+
+主機端 (CPython) 測試：`lib/sample_ring.py` 的 SampleRing 在超過一小時
+沒有樣本之後，window() 不再回傳空白之前的舊資料。
+
+使用方式：
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+from array import array
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'tools', 'host'),
+                os.path.join(ROOT, 'tools'), ROOT, os.path.join(ROOT, 'lib')]
+
+from lib.sample_ring import SampleRing  # noqa: E402
+
+
+def push_every(ring, sample, value, start, end, step):
+    sample[0] = value
+    for now in range(start, end, step):
+        ring.push(sample, now)
+
+
+def test_window_after_gap_over_an_hour():
+    ring = SampleRing(16, 1)
+    sample = array('h', [0])
+    # 70 分鐘的舊資料，填滿分鐘桶與十分鐘桶
+    push_every(ring, sample, 1000, 0, 70 * 60000, 10000)
+    assert list(ring.window(3600)) == [1000, 1000, 1000]
+    # 空白 10 小時後只推一筆
+    gap = 70 * 60000 + 10 * 3600000
+    sample[0] = 2000
+    ring.push(sample, gap)
+    assert ring.window(60) is None
+    assert ring.window(600) is None
+    assert ring.window(3600) is None
+    # 再過 11 分鐘（湊滿一個十分鐘桶）：時間窗只反映新的樣本
+    push_every(ring, sample, 2000, gap + 10000, gap + 11 * 60000, 10000)
+    assert list(ring.window(600)) == [2000, 2000, 2000]
+    assert list(ring.window(3600)) == [2000, 2000, 2000]
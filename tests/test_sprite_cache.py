@@ -0,0 +1,42 @@
+"""
+test_sprite_cache.py
+
+主機端 (CPython) 測試：`lib/sprite_cache.py` 的 SpriteCache.text() 與直接
+呼叫 oled.text() 畫出的結果相同，超過 32 個字元（256 px）的字串也一樣。
+
+使用方式：
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'tools', 'host'),
+                os.path.join(ROOT, 'tools'), ROOT, os.path.join(ROOT, 'lib')]
+
+from lib.ssd1306 import Canvas  # noqa: E402
+from lib.sprite_cache import SpriteCache, MAX_WIDTH  # noqa: E402
+
+
+def test_text_33_chars():
+    string = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456'
+    assert len(string) == 33
+    ref = Canvas(128, 16)
+    ref.text(string, -100, 4)
+    oled = Canvas(128, 16)
+    sprites = SpriteCache(4096)
+    sprites.text(oled, string, -100, 4)
+    assert oled.buffer == ref.buffer
+    # 第二次由快取畫出
+    oled.fill(0)
+    sprites.text(oled, string, -100, 4)
+    assert oled.buffer == ref.buffer
+    assert sprites.hits == 2
+
+
+def test_put_too_wide():
+    with pytest.raises(ValueError):
+        SpriteCache().put('wide', MAX_WIDTH + 1, 8)
@@ -0,0 +1,56 @@
+"""
+test_ssd1306.py
+
+主機端 (CPython) 測試：`lib/ssd1306.py` 的 ellipse() / circle() 在半徑為 0
+時不會卡住，並畫出一個點或一條線段。
+
+使用方式：
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'tools', 'host'),
+                os.path.join(ROOT, 'tools'), ROOT, os.path.join(ROOT, 'lib')]
+
+from lib.ssd1306 import Canvas  # noqa: E402
+
+
+def lit(canvas):
+    return [(x, y) for y in range(canvas.height)
+            for x in range(canvas.width) if canvas.framebuf.pixel(x, y)]
+
+
+@pytest.mark.parametrize('fill', [False, True])
+def test_ellipse_zero_radius(fill):
+    oled = Canvas(16, 16)
+    oled.ellipse(5, 9, 0, 0, 1, fill)
+    assert lit(oled) == [(5, 9)]
+    assert oled._dirty_lo[1] == 5 and oled._dirty_hi[1] == 5
+
+
+def test_circle_zero_radius():
+    oled = Canvas(16, 16)
+    oled.circle(5, 9, 0)
+    oled.fill_circle(10, 2, 0)
+    assert lit(oled) == [(10, 2), (5, 9)]
+
+
+@pytest.mark.parametrize('fill', [False, True])
+def test_ellipse_one_zero_radius(fill):
+    oled = Canvas(16, 16)
+    oled.ellipse(8, 8, 0, 3, 1, fill)
+    assert lit(oled) == [(8, y) for y in range(5, 12)]
+    oled = Canvas(16, 16)
+    oled.ellipse(8, 8, 3, 0, 1, fill)
+    assert lit(oled) == [(x, 8) for x in range(5, 12)]
+    # 只畫右上象限：線段只有中心往上 / 往右的一半
+    oled = Canvas(16, 16)
+    oled.ellipse(8, 8, 0, 3, 1, fill, 0x01)
+    oled.ellipse(8, 8, 3, 0, 1, fill, 0x01)
+    assert lit(oled) == [(8, 5), (8, 6), (8, 7), (8, 8), (9, 8), (10, 8),
+                         (11, 8)]
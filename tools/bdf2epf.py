@@ -0,0 +1,125 @@
+"""
+bdf2epf.py
+
+主機端 (CPython) 工具：把 BDF 點陣字型轉成 `lib/cjk_font.py` 使用的
+EPF1 字型檔（已排序的 code point 索引 + MONO_VLSB 字形）。
+
+說明：
+ - 只收錄需要的字，檔案才會小：用 --chars 直接給字串，或用 --scan
+   掃描程式碼檔案，把其中所有非 ASCII 字元都收錄進去。
+ - 字格大小預設為 BDF 的 FONTBOUNDINGBOX，可用 --size 16x16 / 12x12 指定。
+ - 常見的 12/16 px 中文 BDF 字型：WenQuanYi Bitmap Song、GNU Unifont 等。
+
+使用方式：
+    python tools/bdf2epf.py wenquanyi_12pt.bdf --size 16x16 \
+        --scan oled_dajiahao.py htu_oled_mesh.py -o font16.epf
+    # 再把 font16.epf 上傳到開發板根目錄
+"""
+
+import argparse
+import struct
+import sys
+
+
+def parse_bdf(path):
+    """回傳 (字型外框 (w, h, xoff, yoff), {code: (bbx, rows)})。"""
+    glyphs = {}
+    fbb = None
+    code = None
+    bbx = None
+    rows = None
+    with open(path, encoding='latin-1') as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            key = parts[0]
+            if key == 'FONTBOUNDINGBOX':
+                fbb = tuple(int(v) for v in parts[1:5])
+            elif key == 'ENCODING':
+                code = int(parts[1])
+            elif key == 'BBX':
+                bbx = tuple(int(v) for v in parts[1:5])
+            elif key == 'BITMAP':
+                rows = []
+            elif key == 'ENDCHAR':
+                if code is not None and code >= 0 and bbx is not None:
+                    glyphs[code] = (bbx, rows or [])
+                code = None
+                bbx = None
+                rows = None
+            elif rows is not None:
+                # 每列為十六進位字串，位元由左（高位）到右
+                rows.append((int(key, 16), len(key) * 4))
+    if fbb is None:
+        raise ValueError('{}: missing FONTBOUNDINGBOX'.format(path))
+    return fbb, glyphs
+
+
+def render(fbb, glyph, width, height):
+    """把單一 BDF 字形放進 width x height 字格，回傳 MONO_VLSB bytes。"""
+    (bw, bh, bx, by), rows = glyph
+    fx, fy = fbb[2], fbb[3]
+    cell_h = fbb[1]
+    # 基線位置：字格底部往上 -fy；字格比 BDF 外框大時置中
+    x_pad = (width - fbb[0]) // 2
+    y_pad = (height - cell_h) // 2
+    baseline = y_pad + cell_h + fy
+    out = bytearray(((height + 7) // 8) * width)
+    for r, (bits, nbits) in enumerate(rows):
+        y = baseline - (by + bh) + r
+        if not 0 <= y < height:
+            continue
+        for c in range(bw):
+            if bits >> (nbits - 1 - c) & 1:
+                x = x_pad + bx - fx + c
+                if 0 <= x < width:
+                    out[(y >> 3) * width + x] |= 1 << (y & 7)
+    return bytes(out)
+
+
+def build(fbb, glyphs, codes, width, height):
+    codes = sorted(c for c in set(codes) if c in glyphs and c <= 0xffff)
+    out = bytearray(b'EPF1')
+    out += struct.pack('<BBH', width, height, len(codes))
+    for c in codes:
+        out += struct.pack('<H', c)
+    for c in codes:
+        out += render(fbb, glyphs[c], width, height)
+    return bytes(out), codes
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('bdf', help='BDF 字型檔')
+    ap.add_argument('-o', '--output', required=True, help='輸出的 .epf 檔')
+    ap.add_argument('--size', help='字格大小，例如 16x16 或 12x12')
+    ap.add_argument('--chars', default='', help='要收錄的字元')
+    ap.add_argument('--scan', nargs='*', default=[],
+                    help='掃描這些檔案中的所有非 ASCII 字元')
+    args = ap.parse_args(argv)
+
+    fbb, glyphs = parse_bdf(args.bdf)
+    if args.size:
+        width, height = (int(v) for v in args.size.lower().split('x'))
+    else:
+        width, height = fbb[0], fbb[1]
+
+    wanted = [ord(ch) for ch in args.chars if ord(ch) >= 0x80]
+    for path in args.scan:
+        with open(path, encoding='utf-8') as f:
+            wanted += [ord(ch) for ch in f.read() if ord(ch) >= 0x80]
+
+    data, codes = build(fbb, glyphs, wanted, width, height)
+    missing = sorted(set(wanted) - set(codes))
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    print('{}: {} glyphs {}x{}, {} bytes'.format(
+        args.output, len(codes), width, height, len(data)))
+    if missing:
+        print('not in font: ' + ''.join(chr(c) for c in missing[:40]),
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
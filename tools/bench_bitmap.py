@@ -0,0 +1,121 @@
+"""
+bench_bitmap.py
+
+主機端 (CPython) 量測工具：比較 EPB1 壓縮圖庫（`lib/bitmap_pack.py`）解碼
+到 OLED 緩衝區的速度，與未壓縮 MONO_VLSB 圖以 FrameBuffer.blit() 畫上的速度，
+同時列出每張圖的原始與壓縮大小。
+
+量測項目（每張圖）：
+ - raw   : 未壓縮圖的位元組數
+ - epb   : 壓縮後位元組數（前面有 x 表示以 XOR 差異儲存）
+ - blit  : 未壓縮圖 oled.blit() 一次的時間 (us)
+ - decode: BitmapPack.draw() 一次的時間 (us)
+ - delta : 參考圖已在畫面上時 draw(..., shown=參考圖) 的時間 (us)
+測試圖包含 oled_dajiahao.py 的三個字、一組按鈕（放開 / 按下）與一張
+128x64 開機畫面。主機上的時間只能比較相對快慢，板上的絕對時間需實機量測；
+設定 EPY_FRAMEBUF=py 可用純 Python 版 framebuf 做比較。
+
+使用方式：
+    python tools/bench_bitmap.py
+    python tools/bench_bitmap.py --repeat 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'tools', 'host'),
+                os.path.join(ROOT, 'tools'), ROOT, os.path.join(ROOT, 'lib')]
+
+import framebuf  # noqa: E402  (tools/host 替身)
+from lib.ssd1306 import Canvas  # noqa: E402
+from lib.bitmap_pack import BitmapPack  # noqa: E402
+import img2epb  # noqa: E402
+
+
+def button(pressed):
+    c = Canvas(32, 16)
+    c.rect(0, 0, 32, 16, 1)
+    if pressed:
+        c.fill_rect(2, 2, 28, 12, 1)
+    c.text('OK', 8, 4, 0 if pressed else 1)
+    return bytes(c.buffer)
+
+
+def splash():
+    c = Canvas(128, 64)
+    c.rect(0, 0, 128, 64, 1)
+    c.text('ePy Lite', 32, 8)
+    c.fill_circle(64, 38, 12, 1)
+    c.text('HTU21D  OLED', 16, 54)
+    return bytes(c.buffer)
+
+
+def test_bitmaps():
+    bitmaps = []
+    path = os.path.join(ROOT, 'oled_dajiahao.py')
+    for name, w, h, rows in img2epb.load_pixel_maps(path):
+        bitmaps.append((name, w, h, img2epb.to_vlsb(w, h, rows)))
+    bitmaps.append(('btn_up', 32, 16, button(False)))
+    bitmaps.append(('btn_down', 32, 16, button(True)))
+    bitmaps.append(('splash', 128, 64, splash()))
+    return bitmaps
+
+
+def region(oled, w, h):
+    """畫面左上角 w x h 區域的 MONO_VLSB bytes。"""
+    out = bytearray()
+    for p in range((h + 7) // 8):
+        out += oled.buffer[p * oled.width:p * oled.width + w]
+    return bytes(out)
+
+
+def per_call_us(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1e6 / repeat
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    ap.add_argument('--repeat', type=int, default=200, help='每項重複次數')
+    args = ap.parse_args(argv)
+
+    bitmaps = test_bitmaps()
+    data, info = img2epb.build(bitmaps)
+    pack = BitmapPack(data)
+    oled = Canvas(128, 64)
+
+    print('framebuf: {}'.format(framebuf.FrameBuffer.__module__))
+    print('{:<10} {:>7} {:>6} {:>5} {:>9} {:>9} {:>9}'.format(
+        'bitmap', 'size', 'raw', 'epb', 'blit us', 'decode us', 'delta us'))
+    total = 0
+    for i, ((name, w, h, raw), (_, ref, size)) in enumerate(
+            zip(bitmaps, info)):
+        total += len(raw)
+        src = framebuf.FrameBuffer(bytearray(raw), w, h, framebuf.MONO_VLSB)
+        t_blit = per_call_us(lambda: oled.blit(src, 0, 0), args.repeat)
+        t_dec = per_call_us(lambda: pack.draw(oled, i, 0, 0), args.repeat)
+        if region(oled, w, h) != raw:
+            print('{}: decoded image differs!'.format(name), file=sys.stderr)
+        delta = '-'
+        if ref is not None:
+            # 差異是對稱的：同一份差異套用兩次就回到參考圖
+            pack.draw(oled, ref, 0, 0)
+            t = per_call_us(lambda: pack.draw(oled, i, 0, 0, shown=ref),
+                            args.repeat * 2)
+            delta = '{:.1f}'.format(t)
+            if region(oled, *bitmaps[ref][1:3]) != bitmaps[ref][3]:
+                print('{}: delta differs!'.format(name), file=sys.stderr)
+        print('{:<10} {:>3}x{:<3} {:>6} {:>5} {:>9.1f} {:>9.1f} {:>9}'.format(
+            name, w, h, len(raw),
+            '{}{}'.format('x' if ref is not None else '', size),
+            t_blit, t_dec, delta))
+    print('pack: {} bytes for {} bytes of bitmaps'.format(len(data), total))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+bench_htu21d.py
+
+主機端 (CPython) 量測工具：比較 HTU21D 驅動原本 16 步位元迴圈的 CRC-8 檢查
+與查表版 `HTU21D.crc8check()` / `validate()` 的速度，並先以全部 65536 種
+(msb, lsb) 組合確認兩者結果一致。
+
+量測項目：
+ - bit loop : 原本的 crc8check()（逐位元除法，保留在本檔作為比較基準）
+ - table    : 查表版 crc8check()
+ - validate : validate() 一次檢查一批 3 bytes 紀錄，換算成每筆的時間
+主機上的時間只能比較相對快慢；板上每次讀值還省下 mem_read(3, ...) 配置的
+bytes 物件（改成讀進預先配置的 bytearray(3)）。
+
+使用方式：
+    python tools/bench_htu21d.py
+    python tools/bench_htu21d.py --samples 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'tools', 'host'),
+                os.path.join(ROOT, 'tools'), ROOT, os.path.join(ROOT, 'lib')]
+
+from lib.htu21d import HTU21D  # noqa: E402
+
+
+def crc8_bitloop(value, i=0):
+    """原本驅動的 crc8check()（加上與查表版相同的起點參數 i）。"""
+    remainder = ((value[i] << 8) + value[i + 1]) << 8
+    remainder |= value[i + 2]
+    divsor = 0x988000
+    for k in range(0, 16):
+        if remainder & 1 << (23 - k):
+            remainder ^= divsor
+        divsor = divsor >> 1
+    return remainder == 0
+
+
+def make_records(n, bad_ratio=0.01):
+    """n 筆 (msb, lsb, crc) 紀錄，約 bad_ratio 比例的 CRC 是錯的。"""
+    buf = bytearray(3 * n)
+    bad = 0
+    for i in range(n):
+        msb = random.getrandbits(8)
+        lsb = random.getrandbits(8) & 0xfc
+        crc = 0
+        for b in (msb, lsb):
+            crc ^= b
+            for _ in range(8):
+                crc = ((crc << 1) ^ 0x31) & 0xff if crc & 0x80 else \
+                    (crc << 1) & 0xff
+        if random.random() < bad_ratio:
+            crc ^= 1 << random.randrange(8)
+            bad += 1
+        buf[3 * i:3 * i + 3] = bytes((msb, lsb, crc))
+    return buf, bad
+
+
+def per_record_us(fn, records, n):
+    t0 = time.perf_counter()
+    fn(records, n)
+    return (time.perf_counter() - t0) * 1e6 / n
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    ap.add_argument('--samples', type=int, default=20000,
+                    help='量測用的紀錄筆數')
+    args = ap.parse_args(argv)
+    random.seed(1)
+    sensor = HTU21D(None)
+
+    # 一致性：每種 (msb, lsb) 搭配正確與錯誤的 CRC
+    value = bytearray(3)
+    for msb in range(256):
+        for lsb in range(256):
+            value[0] = msb
+            value[1] = lsb
+            for crc in range(256):
+                value[2] = crc
+                if crc8_bitloop(value):
+                    break
+            if not sensor.crc8check(value):
+                raise AssertionError('table CRC rejects {:02x}{:02x}'.format(
+                    msb, lsb))
+            value[2] ^= 0x5a
+            if sensor.crc8check(value) or crc8_bitloop(value):
+                raise AssertionError('bad CRC accepted')
+    print('CRC table matches the bit loop for all 65536 readings')
+
+    n = args.samples
+    records, bad = make_records(n)
+
+    def loop_old(buf, n):
+        for i in range(0, 3 * n, 3):
+            crc8_bitloop(buf, i)
+
+    def loop_table(buf, n):
+        for i in range(0, 3 * n, 3):
+            sensor.crc8check(buf, i)
+
+    t_old = per_record_us(loop_old, records, n)
+    t_new = per_record_us(loop_table, records, n)
+    t_val = per_record_us(sensor.validate, records, n)
+    if sensor.validate(records, n) != bad:
+        raise AssertionError('validate() count is wrong')
+    print('{:<10} {:>10}'.format('check', 'us/record'))
+    print('{:<10} {:>10.3f}'.format('bit loop', t_old))
+    print('{:<10} {:>10.3f}   x{:.1f}'.format('table', t_new, t_old / t_new))
+    print('{:<10} {:>10.3f}   x{:.1f}'.format('validate', t_val,
+                                               t_old / t_val))
+    print('{} records, {} with a bad CRC'.format(n, bad))
+
+
+if __name__ == '__main__':
+    main()
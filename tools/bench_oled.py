@@ -0,0 +1,172 @@
+"""
+bench_oled.py
+
+主機端 (CPython) 量測工具：在 Linux 上執行範例的繪圖程式碼，透過
+`ssd1306_emu` 模擬的 I2C 匯流排統計每張畫面送出的交易數、位元組數
+與估計傳輸時間，不需要燒錄開發板。
+
+量測項目：
+ - boot      : 開機清畫面（整張 1 KB 畫面）
+ - traffic   : traffic_light_oled.update_oled() 依 綠 -> 黃 -> 紅 循環
+ - htu       : htu_oled_mesh 的三行溫濕度畫面與溫度走勢圖，每張畫面數值都會變動
+ - *-full    : 同樣的繪圖但不用 shadow、每次都 show(full=True) 整張重送，
+               相當於原本驅動的做法，作為比較基準
+最後一欄 host fps 是主機上每秒可模擬的畫面數（含繪圖與匯流排解碼）；
+設定 EPY_FRAMEBUF=py 可比較純 Python 版 framebuf 的速度。
+
+使用方式：
+    python tools/bench_oled.py
+    python tools/bench_oled.py --baud 400000 --frames 100 --png out/
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'tools', 'host'),
+                os.path.join(ROOT, 'tools'), ROOT, os.path.join(ROOT, 'lib')]
+
+import framebuf  # noqa: E402  (tools/host 替身)
+import machine  # noqa: E402
+from lib.ssd1306 import SSD1306_I2C  # noqa: E402
+from lib.htu21d import HTU21D  # noqa: E402
+from lib.numfmt import NumBuf  # noqa: E402
+from lib.oled_ui import Graph  # noqa: E402
+import traffic_light_oled  # noqa: E402
+import htu_oled_mesh  # noqa: E402
+
+OLED_ADDR = 0x3c
+
+
+def new_display(shadow=True, baudrate=100000):
+    """建立一組模擬匯流排 + OLED，回傳 (bus, panel, oled)。"""
+    bus = machine.I2C(0, machine.I2C.MASTER, baudrate=baudrate)
+    panel = bus.devices[OLED_ADDR]
+    oled = SSD1306_I2C(128, 64, bus, shadow=shadow)
+    oled.show()
+    bus.reset_stats()
+    return bus, panel, oled
+
+
+def flush(oled, full):
+    if full:
+        oled.show(full=True)
+    else:
+        # 與範例主迴圈相同：分批送出，每批最多一個 page
+        while not oled.flush_step(128):
+            pass
+
+
+def draw_traffic(oled, i):
+    state = ('green', 'yellow', 'red')[i % 3]
+    traffic_light_oled.update_oled(oled, state)
+
+
+# 每個模擬 OLED 各自的溫度走勢圖
+trends = {}
+
+
+def draw_htu(oled, i, sensor):
+    """與 htu_oled_mesh.main() 相同的畫面。"""
+    emu = sensor.i2c.devices[HTU21D.address]
+    emu.temp_c = 24.0 + (i % 20) * 0.1
+    emu.rh = 55.0 - (i % 7) * 0.3
+    temp_c = sensor.read_centi_c()
+    hum = sensor.read_centi_rh()
+    tenths = htu_oled_mesh.to_tenths
+    line = NumBuf(12)
+    if i == 0:
+        oled.fill(0)
+        oled.text('T:', 0, 0)
+        oled.text('H:', 0, 16)
+        oled.text('A:', 0, 32)
+        oled.save_background()
+        trends[oled] = Graph(0, 48, 128, 16, 150, 350)
+    oled.restore_background()
+    line.clear().fixed(temp_c, drop=1).put(b' C')
+    oled.text_buf(line.buf, 16, 0, 1, line.n)
+    line.clear().fixed(hum, drop=1).put(b' %')
+    oled.text_buf(line.buf, 16, 16, 1, line.n)
+    line.clear().fixed(16 + i % 5).put(b' V')
+    oled.text_buf(line.buf, 16, 32, 1, line.n)
+    trends[oled].push(tenths(temp_c))
+    trends[oled].render(oled)
+    oled.begin_show()
+
+
+def run(name, draw, frames, full, baudrate, png_dir):
+    bus, panel, oled = new_display(shadow=not full, baudrate=baudrate)
+    sensor = HTU21D(bus)
+    transactions = 0
+    nbytes = 0
+    wire_us = 0
+    t0 = time.perf_counter()
+    for i in range(frames):
+        if draw is draw_htu:
+            draw(oled, i, sensor)
+        else:
+            draw(oled, i)
+        # 只統計送往 OLED 的流量（感測器讀取不算）
+        bus.reset_stats()
+        flush(oled, full)
+        transactions += bus.transactions
+        nbytes += bus.bytes
+        wire_us += bus.wire_time_us()
+    host_fps = frames / (time.perf_counter() - t0)
+    if not oled_matches(oled, panel):
+        print('{}: panel differs from framebuffer!'.format(name),
+              file=sys.stderr)
+    if png_dir:
+        panel.to_png(os.path.join(png_dir, name + '.png'))
+    report(name, frames, transactions, nbytes, wire_us, host_fps)
+
+
+def run_boot(baudrate, png_dir):
+    bus = machine.I2C(0, machine.I2C.MASTER, baudrate=baudrate)
+    panel = bus.devices[OLED_ADDR]
+    oled = SSD1306_I2C(128, 64, bus)
+    oled.fill(0)
+    bus.reset_stats()
+    oled.show()
+    if png_dir:
+        panel.to_png(os.path.join(png_dir, 'boot.png'))
+    report('boot', 1, bus.transactions, bus.bytes, bus.wire_time_us())
+
+
+def oled_matches(oled, panel):
+    fb = oled.framebuf
+    rows = [[fb.pixel(x, y) for x in range(oled.width)]
+            for y in range(oled.height)]
+    return rows == panel.frame()
+
+
+def report(name, frames, transactions, nbytes, wire_us, host_fps=None):
+    print('{:<12} {:>6} {:>10.1f} {:>10.1f} {:>10.2f} {:>10}'.format(
+        name, frames, transactions / frames, nbytes / frames,
+        wire_us / frames / 1000.0,
+        '-' if host_fps is None else '{:.0f}'.format(host_fps)))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    ap.add_argument('--baud', type=int, default=100000,
+                    help='I2C 速率，用於估算傳輸時間（預設 100000）')
+    ap.add_argument('--frames', type=int, default=30, help='每項量測的畫面數')
+    ap.add_argument('--png', help='把各項最後一張畫面存成 PNG 的資料夾')
+    args = ap.parse_args(argv)
+    if args.png:
+        os.makedirs(args.png, exist_ok=True)
+
+    print('framebuf: {}'.format(framebuf.FrameBuffer.__module__))
+    print('{:<12} {:>6} {:>10} {:>10} {:>10} {:>10}'.format(
+        'scenario', 'frames', 'txn/frame', 'B/frame', 'ms/frame', 'host fps'))
+    run_boot(args.baud, args.png)
+    for name, draw in (('traffic', draw_traffic), ('htu', draw_htu)):
+        run(name, draw, args.frames, False, args.baud, args.png)
+        run(name + '-full', draw, args.frames, True, args.baud, None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+# 主機端 (CPython) 的 framebuf 模組替身
+# 有安裝 numpy 時使用向量化版本 (npframebuf.py)，否則使用純 Python 版
+# (pyframebuf.py)；兩者輸出的位元組完全相同。設定環境變數
+# EPY_FRAMEBUF=py 可強制使用純 Python 版，方便交叉比對。
+import os
+
+from pyframebuf import (MONO_VLSB, RGB565, GS4_HMSB, MONO_HLSB,  # noqa: F401
+                        MONO_HMSB, FONT_8X8, FrameBuffer)
+
+if os.environ.get('EPY_FRAMEBUF') != 'py':
+    try:
+        from npframebuf import FrameBuffer  # noqa: F811
+    except ImportError:
+        pass
+
+
+def FrameBuffer1(buf, width, height, stride=None):
+    """舊版 API：固定為 MONO_VLSB 的 FrameBuffer"""
+    return FrameBuffer(buf, width, height, MONO_VLSB, stride)
@@ -0,0 +1,113 @@
+# 主機端 (CPython) 的 machine 模組替身
+# I2C 由 ssd1306_emu.I2CBus 提供，預設掛上 SSD1306 (0x3c) 與 HTU21D (0x40)
+# 模擬器；其餘 Pin / LED / ADC / UART 只保留範例程式會呼叫到的介面。
+# 需要 tools/ 在 sys.path 上（見 tools/bench_oled.py）。
+from ssd1306_emu import I2CBus, SSD1306Emulator, HTU21DEmulator
+
+# 以 port 編號保存已建立的匯流排，量測程式可由此取得統計數字
+buses = {}
+
+
+class I2C(I2CBus):
+    def __init__(self, port=0, mode=0, baudrate=100000, freq=None):
+        I2CBus.__init__(self, port, mode, freq or baudrate)
+        self.attach(SSD1306Emulator())
+        self.attach(HTU21DEmulator())
+        buses[port] = self
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_NONE = 0
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 1
+    IRQ_RISING = 2
+
+    def __init__(self, pin=0, mode=IN, pull=PULL_NONE, value=None):
+        self.id = pin
+        self._value = 1 if pull == Pin.PULL_UP else 0
+        if value is not None:
+            self._value = value
+
+    def init(self, mode=IN, pull=PULL_NONE, value=None):
+        if pull == Pin.PULL_UP:
+            self._value = 1
+        if value is not None:
+            self._value = value
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = 1 if v else 0
+
+    def high(self):
+        self._value = 1
+
+    def low(self):
+        self._value = 0
+
+    def irq(self, trigger=0, handler=None):
+        pass
+
+
+class _EpyPins:
+    """對應 `Pin.epy.P0` ~ `Pin.epy.P24` 與 `Pin.epy.AIN0` ~ `AIN7`。"""
+
+    def __init__(self):
+        for i in range(25):
+            setattr(self, 'P{}'.format(i), Pin(i))
+        for i in range(8):
+            setattr(self, 'AIN{}'.format(i), Pin(100 + i))
+
+
+Pin.epy = _EpyPins()
+
+
+class LED:
+    RGB = 'rgb'
+
+    def __init__(self, name):
+        self.name = name
+        self.state = 0
+
+    def on(self):
+        self.state = 1
+
+    def off(self):
+        self.state = 0
+
+    def toggle(self):
+        self.state ^= 1
+
+
+class ADC:
+    def __init__(self, pin):
+        self.pin = pin
+        self.raw = 2048
+
+    def read(self):
+        return self.raw
+
+
+class UART:
+    def __init__(self, port=0, baudrate=115200, **kwargs):
+        self.port = port
+        self.rx = b''
+
+    def any(self):
+        return len(self.rx)
+
+    def read(self, n=None):
+        data = self.rx if n is None else self.rx[:n]
+        self.rx = self.rx[len(data):]
+        return data
+
+    def readline(self):
+        i = self.rx.find(b'\n')
+        return self.read(len(self.rx) if i < 0 else i + 1)
+
+    def write(self, buf):
+        return len(buf)
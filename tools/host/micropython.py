@@ -0,0 +1,6 @@
+# 主機端 (CPython) 的 micropython 模組替身，只提供驅動程式會用到的部分
+
+
+def const(value):
+    """MicroPython 的 const() 在主機端直接回傳原值"""
+    return value
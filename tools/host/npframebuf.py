@@ -0,0 +1,175 @@
+# 主機端 (CPython) 的 framebuf 向量化版本 (需要 numpy，由 framebuf.py 選用)
+# 以 numpy 陣列直接 view 驅動程式傳入的 bytearray / memoryview（不複製），
+# 形狀為 (page 數, stride)，因此驅動程式、I2C 傳輸與 numpy 看到的是同一塊
+# 記憶體。fill_rect 以每個 page 的位元遮罩一次處理整段 column；line、
+# blit、scroll、text 則展開成 (列, 行) 的位元平面運算後再打包回去。
+# 演算法與裁切規則逐一對照 pyframebuf.py（即 extmod/modframebuf.c），
+# 輸出的位元組與純 Python 版完全相同。
+import numpy
+
+import pyframebuf
+from pyframebuf import FONT_8X8
+
+# 字型展開成 8 列 x (96 字 * 8 行) 的位元平面
+_FONT_BITS = numpy.unpackbits(
+    numpy.frombuffer(FONT_8X8, dtype=numpy.uint8)[:, None],
+    axis=1, bitorder='little').T.astype(bool)
+
+
+def _view(fbuf):
+    # fbuf 的記憶體以 (page, stride) 形狀呈現；唯讀的 bytes 也可當來源
+    a = getattr(fbuf, '_a', None)
+    if a is None:
+        pages = (fbuf.height + 7) // 8
+        a = numpy.frombuffer(fbuf.buf, dtype=numpy.uint8,
+                             count=pages * fbuf.stride)
+        a = a.reshape(pages, fbuf.stride)
+    return a
+
+
+class FrameBuffer(pyframebuf.FrameBuffer):
+    def __init__(self, buf, width, height, buf_format=pyframebuf.MONO_VLSB,
+                 stride=None):
+        pyframebuf.FrameBuffer.__init__(self, buf, width, height, buf_format,
+                                        stride)
+        self._a = _view(self)
+
+    # ---- 位元平面 ----
+    def _bits(self, p0, p1):
+        # page p0..p1-1 展開成 ((p1 - p0) * 8, stride) 的 0/1 陣列
+        return numpy.unpackbits(self._a[p0:p1], axis=0, bitorder='little')
+
+    def _store(self, p0, p1, bits):
+        self._a[p0:p1] = numpy.packbits(bits, axis=0, bitorder='little')
+
+    def _plot(self, xs, ys, col):
+        # 設定多個已裁切的像素，重複的座標也安全
+        idx = (ys >> 3, xs)
+        mask = (1 << (ys & 7)).astype(numpy.uint8)
+        if col:
+            numpy.bitwise_or.at(self._a, idx, mask)
+        else:
+            numpy.bitwise_and.at(self._a, idx, ~mask)
+
+    # ---- 繪圖 ----
+    def fill(self, col):
+        self._a[:] = 0xff if col else 0
+
+    def fill_rect(self, x, y, w, h, col):
+        if h < 1 or w < 1 or x + w <= 0 or y + h <= 0 \
+                or y >= self.height or x >= self.width:
+            return
+        xend = min(self.width, x + w)
+        yend = min(self.height, y + h)
+        x = max(x, 0)
+        y = max(y, 0)
+        p0 = y >> 3
+        p1 = ((yend - 1) >> 3) + 1
+        rows = numpy.arange(p0 * 8, p1 * 8)
+        inside = (rows >= y) & (rows < yend)
+        masks = numpy.packbits(inside.reshape(-1, 8), axis=1,
+                               bitorder='little')
+        if col:
+            self._a[p0:p1, x:xend] |= masks
+        else:
+            self._a[p0:p1, x:xend] &= ~masks
+
+    def line(self, x1, y1, x2, y2, col):
+        # 與 Bresenham 迴圈等價的封閉式：dy <= dx 時第 i 步的次座標
+        # 為 floor((2dy * i - dx) / 2dx) + 1
+        dx = x2 - x1
+        sx = 1 if dx > 0 else -1
+        dx = abs(dx)
+        dy = y2 - y1
+        sy = 1 if dy > 0 else -1
+        dy = abs(dy)
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+        i = numpy.arange(dx)
+        if dx:
+            k = (2 * dy * i - dx) // (2 * dx) + 1
+        else:
+            k = i
+        us = numpy.append(x1 + sx * i, x2 if not steep else y2)
+        vs = numpy.append(y1 + sy * k, y2 if not steep else x2)
+        if steep:
+            us, vs = vs, us
+        keep = (us >= 0) & (us < self.width) & (vs >= 0) & (vs < self.height)
+        self._plot(us[keep], vs[keep], col)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if palette is not None:
+            pyframebuf.FrameBuffer.blit(self, fbuf, x, y, key, palette)
+            return
+        if x >= self.width or y >= self.height \
+                or -x >= fbuf.width or -y >= fbuf.height:
+            return
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = max(0, -x)
+        y1 = max(0, -y)
+        x0end = min(self.width, x + fbuf.width)
+        y0end = min(self.height, y + fbuf.height)
+        if x0end <= x0 or y0end <= y0:
+            return
+        src = numpy.unpackbits(_view(fbuf), axis=0, bitorder='little')
+        src = src[y1:y1 + y0end - y0, x1:x1 + x0end - x0]
+        self._paste(src, x0, y0, src != key)
+
+    def _paste(self, src, x0, y0, mask):
+        # src 為已裁切的 0/1 區塊，左上角放在 (x0, y0)，只寫入 mask 為真處
+        p0 = y0 >> 3
+        p1 = ((y0 + src.shape[0] - 1) >> 3) + 1
+        bits = self._bits(p0, p1)
+        r0 = y0 - p0 * 8
+        region = bits[r0:r0 + src.shape[0], x0:x0 + src.shape[1]]
+        region[mask] = src[mask]
+        self._store(p0, p1, bits)
+
+    def scroll(self, xstep, ystep):
+        # 與板上相同：移出的區域保留原本內容，不會自動清除
+        w = self.width
+        h = self.height
+        if xstep < 0:
+            if w + xstep <= 0:
+                return
+            dst_x = (0, w + xstep)
+        else:
+            if xstep - 1 >= w - 1:
+                return
+            dst_x = (xstep, w)
+        if ystep < 0:
+            if h + ystep <= 0:
+                return
+            dst_y = (0, h + ystep)
+        else:
+            if ystep - 1 >= h - 1:
+                return
+            dst_y = (ystep, h)
+        pages = (h + 7) // 8
+        bits = self._bits(0, pages)
+        bits[dst_y[0]:dst_y[1], dst_x[0]:dst_x[1]] = \
+            bits[dst_y[0] - ystep:dst_y[1] - ystep,
+                 dst_x[0] - xstep:dst_x[1] - xstep].copy()
+        self._store(0, pages, bits)
+
+    def text(self, s, x0, y0, col=1):
+        if not s:
+            return
+        codes = numpy.array([ord(ch) for ch in s])
+        codes[(codes < 32) | (codes > 127)] = 127
+        cols = ((codes[:, None] - 32) * 8 + numpy.arange(8)).ravel()
+        glyph = _FONT_BITS[:, cols]
+        # 裁切到畫面內
+        gx = max(0, -x0)
+        gy = max(0, -y0)
+        xend = min(self.width, x0 + glyph.shape[1])
+        yend = min(self.height, y0 + 8)
+        if xend <= x0 + gx or yend <= y0 + gy:
+            return
+        glyph = glyph[gy:gy + yend - y0 - gy, gx:gx + xend - x0 - gx]
+        src = numpy.full(glyph.shape, 1 if col else 0, dtype=numpy.uint8)
+        self._paste(src, x0 + gx, y0 + gy, glyph)
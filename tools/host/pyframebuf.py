@@ -0,0 +1,283 @@
+# 主機端 (CPython) 的 framebuf 模組替身 (純 Python 版，由 framebuf.py 選用)
+# 只實作 MONO_VLSB 格式，位元排列與板上 framebuf 完全相同：
+# 每個 byte 代表一個 column 的 8 個垂直像素，bit0 在最上方。
+# 文字字型使用 CP437 8x8 點陣 (取自 luma.core，MIT 授權) 作為替代，
+# 字元格大小與板上相同 (8x8)，但個別字形可能與韌體內建字型略有差異。
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+
+# ASCII 32..127，每字 8 個 column byte
+FONT_8X8 = bytes((
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x06, 0x5f, 0x5f, 0x06, 0x00, 0x00, 0x00,
+    0x00, 0x07, 0x07, 0x00, 0x07, 0x07, 0x00, 0x00,
+    0x14, 0x7f, 0x7f, 0x14, 0x7f, 0x7f, 0x14, 0x00,
+    0x24, 0x2e, 0x6b, 0x6b, 0x3a, 0x12, 0x00, 0x00,
+    0x46, 0x66, 0x30, 0x18, 0x0c, 0x66, 0x62, 0x00,
+    0x30, 0x7a, 0x4f, 0x5d, 0x37, 0x7a, 0x48, 0x00,
+    0x04, 0x07, 0x03, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x1c, 0x3e, 0x63, 0x41, 0x00, 0x00, 0x00,
+    0x00, 0x41, 0x63, 0x3e, 0x1c, 0x00, 0x00, 0x00,
+    0x08, 0x2a, 0x3e, 0x1c, 0x1c, 0x3e, 0x2a, 0x08,
+    0x08, 0x08, 0x3e, 0x3e, 0x08, 0x08, 0x00, 0x00,
+    0x00, 0x80, 0xe0, 0x60, 0x00, 0x00, 0x00, 0x00,
+    0x08, 0x08, 0x08, 0x08, 0x08, 0x08, 0x00, 0x00,
+    0x00, 0x00, 0x60, 0x60, 0x00, 0x00, 0x00, 0x00,
+    0x60, 0x30, 0x18, 0x0c, 0x06, 0x03, 0x01, 0x00,
+    0x3e, 0x7f, 0x71, 0x59, 0x4d, 0x7f, 0x3e, 0x00,
+    0x40, 0x42, 0x7f, 0x7f, 0x40, 0x40, 0x00, 0x00,
+    0x62, 0x73, 0x59, 0x49, 0x6f, 0x66, 0x00, 0x00,
+    0x22, 0x63, 0x49, 0x49, 0x7f, 0x36, 0x00, 0x00,
+    0x18, 0x1c, 0x16, 0x53, 0x7f, 0x7f, 0x50, 0x00,
+    0x27, 0x67, 0x45, 0x45, 0x7d, 0x39, 0x00, 0x00,
+    0x3c, 0x7e, 0x4b, 0x49, 0x79, 0x30, 0x00, 0x00,
+    0x03, 0x03, 0x71, 0x79, 0x0f, 0x07, 0x00, 0x00,
+    0x36, 0x7f, 0x49, 0x49, 0x7f, 0x36, 0x00, 0x00,
+    0x06, 0x4f, 0x49, 0x69, 0x3f, 0x1e, 0x00, 0x00,
+    0x00, 0x00, 0x66, 0x66, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x80, 0xe6, 0x66, 0x00, 0x00, 0x00, 0x00,
+    0x08, 0x1c, 0x36, 0x63, 0x41, 0x00, 0x00, 0x00,
+    0x24, 0x24, 0x24, 0x24, 0x24, 0x24, 0x00, 0x00,
+    0x00, 0x41, 0x63, 0x36, 0x1c, 0x08, 0x00, 0x00,
+    0x02, 0x03, 0x51, 0x59, 0x0f, 0x06, 0x00, 0x00,
+    0x3e, 0x7f, 0x41, 0x5d, 0x5d, 0x1f, 0x1e, 0x00,
+    0x7c, 0x7e, 0x13, 0x13, 0x7e, 0x7c, 0x00, 0x00,
+    0x41, 0x7f, 0x7f, 0x49, 0x49, 0x7f, 0x36, 0x00,
+    0x1c, 0x3e, 0x63, 0x41, 0x41, 0x63, 0x22, 0x00,
+    0x41, 0x7f, 0x7f, 0x41, 0x63, 0x3e, 0x1c, 0x00,
+    0x41, 0x7f, 0x7f, 0x49, 0x5d, 0x41, 0x63, 0x00,
+    0x41, 0x7f, 0x7f, 0x49, 0x1d, 0x01, 0x03, 0x00,
+    0x1c, 0x3e, 0x63, 0x41, 0x51, 0x73, 0x72, 0x00,
+    0x7f, 0x7f, 0x08, 0x08, 0x7f, 0x7f, 0x00, 0x00,
+    0x00, 0x41, 0x7f, 0x7f, 0x41, 0x00, 0x00, 0x00,
+    0x30, 0x70, 0x40, 0x41, 0x7f, 0x3f, 0x01, 0x00,
+    0x41, 0x7f, 0x7f, 0x08, 0x1c, 0x77, 0x63, 0x00,
+    0x41, 0x7f, 0x7f, 0x41, 0x40, 0x60, 0x70, 0x00,
+    0x7f, 0x7f, 0x0e, 0x1c, 0x0e, 0x7f, 0x7f, 0x00,
+    0x7f, 0x7f, 0x06, 0x0c, 0x18, 0x7f, 0x7f, 0x00,
+    0x1c, 0x3e, 0x63, 0x41, 0x63, 0x3e, 0x1c, 0x00,
+    0x41, 0x7f, 0x7f, 0x49, 0x09, 0x0f, 0x06, 0x00,
+    0x1e, 0x3f, 0x21, 0x71, 0x7f, 0x5e, 0x00, 0x00,
+    0x41, 0x7f, 0x7f, 0x09, 0x19, 0x7f, 0x66, 0x00,
+    0x26, 0x6f, 0x4d, 0x59, 0x73, 0x32, 0x00, 0x00,
+    0x03, 0x41, 0x7f, 0x7f, 0x41, 0x03, 0x00, 0x00,
+    0x7f, 0x7f, 0x40, 0x40, 0x7f, 0x7f, 0x00, 0x00,
+    0x1f, 0x3f, 0x60, 0x60, 0x3f, 0x1f, 0x00, 0x00,
+    0x7f, 0x7f, 0x30, 0x18, 0x30, 0x7f, 0x7f, 0x00,
+    0x43, 0x67, 0x3c, 0x18, 0x3c, 0x67, 0x43, 0x00,
+    0x07, 0x4f, 0x78, 0x78, 0x4f, 0x07, 0x00, 0x00,
+    0x47, 0x63, 0x71, 0x59, 0x4d, 0x67, 0x73, 0x00,
+    0x00, 0x7f, 0x7f, 0x41, 0x41, 0x00, 0x00, 0x00,
+    0x01, 0x03, 0x06, 0x0c, 0x18, 0x30, 0x60, 0x00,
+    0x00, 0x41, 0x41, 0x7f, 0x7f, 0x00, 0x00, 0x00,
+    0x08, 0x0c, 0x06, 0x03, 0x06, 0x0c, 0x08, 0x00,
+    0x80, 0x80, 0x80, 0x80, 0x80, 0x80, 0x80, 0x80,
+    0x00, 0x00, 0x03, 0x07, 0x04, 0x00, 0x00, 0x00,
+    0x20, 0x74, 0x54, 0x54, 0x3c, 0x78, 0x40, 0x00,
+    0x41, 0x7f, 0x3f, 0x48, 0x48, 0x78, 0x30, 0x00,
+    0x38, 0x7c, 0x44, 0x44, 0x6c, 0x28, 0x00, 0x00,
+    0x30, 0x78, 0x48, 0x49, 0x3f, 0x7f, 0x40, 0x00,
+    0x38, 0x7c, 0x54, 0x54, 0x5c, 0x18, 0x00, 0x00,
+    0x48, 0x7e, 0x7f, 0x49, 0x03, 0x02, 0x00, 0x00,
+    0x98, 0xbc, 0xa4, 0xa4, 0xf8, 0x7c, 0x04, 0x00,
+    0x41, 0x7f, 0x7f, 0x08, 0x04, 0x7c, 0x78, 0x00,
+    0x00, 0x44, 0x7d, 0x7d, 0x40, 0x00, 0x00, 0x00,
+    0x60, 0xe0, 0x80, 0x80, 0xfd, 0x7d, 0x00, 0x00,
+    0x41, 0x7f, 0x7f, 0x10, 0x38, 0x6c, 0x44, 0x00,
+    0x00, 0x41, 0x7f, 0x7f, 0x40, 0x00, 0x00, 0x00,
+    0x7c, 0x7c, 0x18, 0x38, 0x1c, 0x7c, 0x78, 0x00,
+    0x7c, 0x7c, 0x04, 0x04, 0x7c, 0x78, 0x00, 0x00,
+    0x38, 0x7c, 0x44, 0x44, 0x7c, 0x38, 0x00, 0x00,
+    0x84, 0xfc, 0xf8, 0xa4, 0x24, 0x3c, 0x18, 0x00,
+    0x18, 0x3c, 0x24, 0xa4, 0xf8, 0xfc, 0x84, 0x00,
+    0x44, 0x7c, 0x78, 0x4c, 0x04, 0x1c, 0x18, 0x00,
+    0x48, 0x5c, 0x54, 0x54, 0x74, 0x24, 0x00, 0x00,
+    0x00, 0x04, 0x3e, 0x7f, 0x44, 0x24, 0x00, 0x00,
+    0x3c, 0x7c, 0x40, 0x40, 0x3c, 0x7c, 0x40, 0x00,
+    0x1c, 0x3c, 0x60, 0x60, 0x3c, 0x1c, 0x00, 0x00,
+    0x3c, 0x7c, 0x70, 0x38, 0x70, 0x7c, 0x3c, 0x00,
+    0x44, 0x6c, 0x38, 0x10, 0x38, 0x6c, 0x44, 0x00,
+    0x9c, 0xbc, 0xa0, 0xa0, 0xfc, 0x7c, 0x00, 0x00,
+    0x4c, 0x64, 0x74, 0x5c, 0x4c, 0x64, 0x00, 0x00,
+    0x08, 0x08, 0x3e, 0x77, 0x41, 0x41, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x77, 0x77, 0x00, 0x00, 0x00,
+    0x41, 0x41, 0x77, 0x3e, 0x08, 0x08, 0x00, 0x00,
+    0x02, 0x03, 0x01, 0x03, 0x02, 0x03, 0x01, 0x00,
+    0x70, 0x78, 0x4c, 0x46, 0x4c, 0x78, 0x70, 0x00,
+))
+
+
+class FrameBuffer:
+    def __init__(self, buf, width, height, buf_format=MONO_VLSB, stride=None):
+        if buf_format != MONO_VLSB:
+            raise ValueError('invalid format')
+        self.buf = buf
+        self.width = width
+        self.height = height
+        self.stride = width if stride is None else stride
+        if len(buf) < ((height + 7) // 8) * self.stride:
+            raise ValueError('buffer too small')
+
+    def _set(self, x, y, col):
+        i = (y >> 3) * self.stride + x
+        if col:
+            self.buf[i] |= 1 << (y & 7)
+        else:
+            self.buf[i] &= ~(1 << (y & 7)) & 0xff
+
+    def _get(self, x, y):
+        return (self.buf[(y >> 3) * self.stride + x] >> (y & 7)) & 1
+
+    def fill(self, col):
+        v = 0xff if col else 0
+        for i in range(((self.height + 7) // 8) * self.stride):
+            self.buf[i] = v
+
+    def pixel(self, x, y, col=None):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            if col is None:
+                return self._get(x, y)
+            self._set(x, y, col)
+        return None
+
+    def fill_rect(self, x, y, w, h, col):
+        if h < 1 or w < 1 or x + w <= 0 or y + h <= 0 \
+                or y >= self.height or x >= self.width:
+            return
+        xend = min(self.width, x + w)
+        yend = min(self.height, y + h)
+        x = max(x, 0)
+        y = max(y, 0)
+        for yy in range(y, yend):
+            for xx in range(x, xend):
+                self._set(xx, yy, col)
+
+    def hline(self, x, y, w, col):
+        self.fill_rect(x, y, w, 1, col)
+
+    def vline(self, x, y, h, col):
+        self.fill_rect(x, y, 1, h, col)
+
+    def rect(self, x, y, w, h, col, fill=False):
+        if fill:
+            self.fill_rect(x, y, w, h, col)
+            return
+        self.fill_rect(x, y, w, 1, col)
+        self.fill_rect(x, y + h - 1, w, 1, col)
+        self.fill_rect(x, y, 1, h, col)
+        self.fill_rect(x + w - 1, y, 1, h, col)
+
+    def line(self, x1, y1, x2, y2, col):
+        # 與 extmod/modframebuf.c 相同的 Bresenham 實作
+        dx = x2 - x1
+        if dx > 0:
+            sx = 1
+        else:
+            dx = -dx
+            sx = -1
+        dy = y2 - y1
+        if dy > 0:
+            sy = 1
+        else:
+            dy = -dy
+            sy = -1
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                if 0 <= y1 < self.width and 0 <= x1 < self.height:
+                    self._set(y1, x1, col)
+            elif 0 <= x1 < self.width and 0 <= y1 < self.height:
+                self._set(x1, y1, col)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+        if 0 <= x2 < self.width and 0 <= y2 < self.height:
+            self._set(x2, y2, col)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if x >= self.width or y >= self.height \
+                or -x >= fbuf.width or -y >= fbuf.height:
+            return
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = max(0, -x)
+        y1 = max(0, -y)
+        x0end = min(self.width, x + fbuf.width)
+        y0end = min(self.height, y + fbuf.height)
+        cy1 = y1
+        for cy0 in range(y0, y0end):
+            cx1 = x1
+            for cx0 in range(x0, x0end):
+                col = fbuf._get(cx1, cy1)
+                if palette is not None:
+                    col = palette._get(col, 0)
+                if col != key:
+                    self._set(cx0, cy0, col)
+                cx1 += 1
+            cy1 += 1
+
+    def scroll(self, xstep, ystep):
+        # 與板上相同：移出的區域保留原本內容，不會自動清除
+        if xstep < 0:
+            sx = 0
+            xend = self.width + xstep
+            if xend <= 0:
+                return
+            dx = 1
+        else:
+            sx = self.width - 1
+            xend = xstep - 1
+            if xend >= sx:
+                return
+            dx = -1
+        if ystep < 0:
+            y = 0
+            yend = self.height + ystep
+            if yend <= 0:
+                return
+            dy = 1
+        else:
+            y = self.height - 1
+            yend = ystep - 1
+            if yend >= y:
+                return
+            dy = -1
+        while y != yend:
+            x = sx
+            while x != xend:
+                self._set(x, y, self._get(x - xstep, y - ystep))
+                x += dx
+            y += dy
+
+    def text(self, s, x0, y0, col=1):
+        for ch in s:
+            c = ord(ch)
+            if c < 32 or c > 127:
+                c = 127
+            base = (c - 32) * 8
+            for j in range(8):
+                if 0 <= x0 < self.width:
+                    line = FONT_8X8[base + j]
+                    y = y0
+                    while line:
+                        if line & 1 and 0 <= y < self.height:
+                            self._set(x0, y, col)
+                        line >>= 1
+                        y += 1
+                x0 += 1
+
+
+def FrameBuffer1(buf, width, height, stride=None):
+    """舊版 API：固定為 MONO_VLSB 的 FrameBuffer"""
+    return FrameBuffer(buf, width, height, MONO_VLSB, stride)
@@ -0,0 +1,44 @@
+# 主機端 (CPython) 的 utime 模組替身，ticks 採與 MicroPython 相同的 2^30 週期回繞
+import time as _time
+
+_TICKS_PERIOD = 1 << 30
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALF = _TICKS_PERIOD // 2
+
+
+def ticks_ms():
+    return int(_time.monotonic() * 1000) & _TICKS_MAX
+
+
+def ticks_us():
+    return int(_time.monotonic() * 1000000) & _TICKS_MAX
+
+
+def ticks_cpu():
+    return ticks_us()
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & _TICKS_MAX
+
+
+def ticks_diff(ticks1, ticks2):
+    return ((ticks1 - ticks2 + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+
+
+def sleep(seconds):
+    _time.sleep(seconds)
+
+
+def sleep_ms(ms):
+    if ms > 0:
+        _time.sleep(ms / 1000.0)
+
+
+def sleep_us(us):
+    if us > 0:
+        _time.sleep(us / 1000000.0)
+
+
+def time():
+    return int(_time.time())
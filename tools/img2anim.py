@@ -0,0 +1,133 @@
+"""
+img2anim.py
+
+主機端 (CPython) 工具：把 PNG / GIF 圖檔轉成 `lib/oled_anim.py` 播放用的
+EPA1 動畫檔（MONO_VLSB 畫面，第一張為完整畫面，之後以 page 差異儲存）。
+
+說明：
+ - 需要 Pillow（pip install Pillow）。
+ - 可給多個 PNG 依序當作畫格，或給一個多格 GIF；單張圖片即為開機畫面。
+ - 圖片會縮放到 --size（預設 128x64），再以 --threshold 二值化，
+   加上 --dither 則使用 Floyd-Steinberg 抖色。
+ - 每一格與前一格比較，只記錄每個 page 內有變動的 column 範圍；
+   差異資料比完整畫面還大時自動改存完整畫面 (key frame)。
+
+使用方式：
+    python tools/img2anim.py boot.png -o boot.epa
+    python tools/img2anim.py walk.gif --delay 80 -o walk.epa
+    # 再把 .epa 上傳到開發板，用 oled_anim.play_splash(oled, 'boot.epa') 播放
+"""
+
+import argparse
+import struct
+
+KEY = 0
+DELTA = 1
+
+
+def load_frames(paths):
+    """回傳 [(PIL.Image, 顯示時間 ms 或 None)]。"""
+    from PIL import Image, ImageSequence
+    frames = []
+    for path in paths:
+        img = Image.open(path)
+        for frame in ImageSequence.Iterator(img):
+            frames.append((frame.convert('L'), frame.info.get('duration')))
+    return frames
+
+
+def to_vlsb(img, width, height, threshold=128, invert=False, dither=False):
+    """把灰階圖片轉成 MONO_VLSB bytes（亮點為 1）。"""
+    img = img.resize((width, height))
+    if dither:
+        mono = img.convert('1')
+    else:
+        mono = img.point(lambda v: 255 if v >= threshold else 0).convert('1')
+    px = mono.load()
+    out = bytearray(((height + 7) // 8) * width)
+    for y in range(height):
+        for x in range(width):
+            on = px[x, y] != 0
+            if on != invert:
+                out[(y >> 3) * width + x] |= 1 << (y & 7)
+    return bytes(out)
+
+
+def delta_runs(prev, cur, width):
+    """每個 page 內有變動的 column 範圍 [(page, x0, x1)]。"""
+    runs = []
+    for p in range(len(cur) // width):
+        base = p * width
+        x0 = 0
+        while x0 < width and prev[base + x0] == cur[base + x0]:
+            x0 += 1
+        if x0 == width:
+            continue
+        x1 = width - 1
+        while prev[base + x1] == cur[base + x1]:
+            x1 -= 1
+        runs.append((p, x0, x1))
+    return runs
+
+
+def build(images, width, height, delay):
+    """images 為 [(MONO_VLSB bytes, ms)]，回傳 (檔案內容, key 數, delta 數)。"""
+    out = bytearray(b'EPA1')
+    out += struct.pack('<BBH', width, height, len(images))
+    prev = None
+    keys = 0
+    deltas = 0
+    for data, ms in images:
+        ms = delay if ms is None else ms
+        runs = delta_runs(prev, data, width) if prev is not None else None
+        size = None
+        if runs is not None and len(runs) < 256:
+            size = sum(3 + x1 - x0 + 1 for _, x0, x1 in runs)
+        if size is None or size >= len(data):
+            out += struct.pack('<BBH', KEY, 0, ms)
+            out += data
+            keys += 1
+        else:
+            out += struct.pack('<BBH', DELTA, len(runs), ms)
+            for p, x0, x1 in runs:
+                out += struct.pack('<BBB', p, x0, x1)
+                out += data[p * width + x0:p * width + x1 + 1]
+            deltas += 1
+        prev = data
+    return bytes(out), keys, deltas
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    ap.add_argument('images', nargs='+', help='PNG / GIF 檔案（依序為畫格）')
+    ap.add_argument('-o', '--output', required=True, help='輸出的 .epa 檔')
+    ap.add_argument('--size', default='128x64', help='畫面大小，例如 128x64')
+    ap.add_argument('--delay', type=int, default=100,
+                    help='每格顯示時間 ms（GIF 有記錄時以 GIF 為準）')
+    ap.add_argument('--fixed-delay', action='store_true',
+                    help='忽略 GIF 內的時間，全部使用 --delay')
+    ap.add_argument('--threshold', type=int, default=128,
+                    help='二值化門檻 0..255（預設 128）')
+    ap.add_argument('--dither', action='store_true', help='使用抖色')
+    ap.add_argument('--invert', action='store_true', help='黑白反相')
+    args = ap.parse_args(argv)
+
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    if width > 255 or height > 255:
+        ap.error('size too large')
+    images = []
+    for img, ms in load_frames(args.images):
+        data = to_vlsb(img, width, height, args.threshold, args.invert,
+                       args.dither)
+        images.append((data, None if args.fixed_delay else ms))
+
+    data, keys, deltas = build(images, width, height, args.delay)
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    raw = len(images) * ((height + 7) // 8) * width
+    print('{}: {} frames ({} key, {} delta), {} bytes ({} raw)'.format(
+        args.output, len(images), keys, deltas, len(data), raw))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""
+img2epb.py
+
+主機端 (CPython) 工具：把多張 1-bit 圖案編譯成 `lib/bitmap_pack.py` 使用的
+EPB1 圖庫（MONO_VLSB 位元組做 run-length 壓縮，可選擇以 XOR 差異對參考圖儲存）。
+
+說明：
+ - 輸入可以是圖檔（PNG 等，需要 Pillow），或是像 `oled_dajiahao.py` 那樣
+   以 '0'/'1' 字串陣列畫的像素圖 .py 檔：檔內每個「字串 list」變數都是一張圖。
+ - 每張圖會和前面同尺寸的圖比較，若 XOR 差異壓縮後比較小，就只存差異，
+   板上解碼時先還原參考圖再套用差異（--no-delta 可關閉）。
+   參考圖本身不再參考其他圖，解碼最多兩層。
+ - 輸出 .epb 檔上傳到板子；或用 --py 輸出成 .py 模組（DATA 常數與每張圖的
+   索引），可以直接 import 或凍結進韌體。
+
+使用方式：
+    python tools/img2epb.py oled_dajiahao.py -o dajiahao.epb
+    python tools/img2epb.py btn_up.png btn_down.png --py -o lib/icons.py
+    # 板上：BitmapPack('dajiahao.epb').draw(oled, 0, 8, 16)
+"""
+
+import argparse
+import ast
+import os
+import re
+import struct
+
+HEADER_SIZE = 6
+ENTRY_SIZE = 8
+NO_REF = 0xffff
+
+
+def load_pixel_maps(path):
+    """讀取 .py 檔中的 '0'/'1' 字串陣列，回傳 [(名稱, 寬, 高, rows)]。"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    maps = []
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1 \
+                or not isinstance(node.targets[0], ast.Name) \
+                or not isinstance(node.value, ast.List):
+            continue
+        rows = []
+        for item in node.value.elts:
+            if not isinstance(item, ast.Constant) \
+                    or not isinstance(item.value, str) \
+                    or item.value.strip('01'):
+                rows = None
+                break
+            rows.append(item.value)
+        if rows:
+            width = max(len(r) for r in rows)
+            maps.append((node.targets[0].id, width, len(rows),
+                         [[c == '1' for c in r] for r in rows]))
+    return maps
+
+
+def load_image(path, threshold=128, invert=False):
+    """讀取圖檔，回傳 (名稱, 寬, 高, rows)，亮點為 True。"""
+    from PIL import Image
+    img = Image.open(path).convert('L')
+    px = img.load()
+    rows = [[(px[x, y] >= threshold) != invert for x in range(img.width)]
+            for y in range(img.height)]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return name, img.width, img.height, rows
+
+
+def to_vlsb(width, height, rows):
+    """rows（每列為 bool list）轉成 MONO_VLSB bytes。"""
+    out = bytearray(((height + 7) // 8) * width)
+    for y, row in enumerate(rows):
+        for x, on in enumerate(row):
+            if on:
+                out[(y >> 3) * width + x] |= 1 << (y & 7)
+    return bytes(out)
+
+
+def encode(data):
+    """run-length 編碼（控制碼格式見 lib/bitmap_pack.py）。"""
+    out = bytearray()
+    lit = bytearray()
+
+    def flush_literal():
+        for k in range(0, len(lit), 128):
+            chunk = lit[k:k + 128]
+            out.append(len(chunk) - 1)
+            out.extend(chunk)
+        del lit[:]
+
+    i = 0
+    n = len(data)
+    while i < n:
+        v = data[i]
+        j = i
+        while j < n and data[j] == v:
+            j += 1
+        run = j - i
+        # 夾在資料中間的單一 0 留在 literal 裡比較省（不必再開新的 literal）
+        if v == 0 and not (run == 1 and lit and j < n):
+            flush_literal()
+            while run:
+                k = min(run, 64)
+                out.append(0xc0 | (k - 1))
+                run -= k
+        elif v != 0 and run >= 3:
+            flush_literal()
+            while run:
+                k = min(run, 65)
+                if k == 1:
+                    lit.append(v)
+                else:
+                    out += bytes((0x80 | (k - 2), v))
+                run -= k
+        else:
+            lit.extend(data[i:j])
+        i = j
+    flush_literal()
+    return bytes(out)
+
+
+def decode(code, size, base=None):
+    """主機端解碼（驗證用），base 為參考圖時套用 XOR 差異。"""
+    out = bytearray(size) if base is None else bytearray(base)
+    i = 0
+    o = 0
+    while i < len(code):
+        c = code[i]
+        i += 1
+        if c < 0x80:
+            vals = code[i:i + c + 1]
+            i += c + 1
+        elif c < 0xc0:
+            vals = bytes((code[i],)) * ((c & 0x3f) + 2)
+            i += 1
+        else:
+            vals = bytes((c & 0x3f) + 1)
+        for v in vals:
+            if base is None:
+                out[o] = v
+            else:
+                out[o] ^= v
+            o += 1
+    if o != size:
+        raise ValueError('decoded {} bytes, expected {}'.format(o, size))
+    return bytes(out)
+
+
+def build(bitmaps, delta=True):
+    """bitmaps 為 [(名稱, 寬, 高, MONO_VLSB bytes)]。
+
+    回傳 (檔案內容, [(名稱, 參考索引或 None, 壓縮後大小)])。
+    """
+    if len(bitmaps) >= NO_REF:
+        raise ValueError('too many bitmaps')
+    entries = []
+    for i, (name, w, h, data) in enumerate(bitmaps):
+        if w > 255 or h > 255:
+            raise ValueError('{}: {}x{} is too large'.format(name, w, h))
+        best = encode(data)
+        ref = None
+        if delta:
+            for j in range(i):
+                _, rw, rh, rdata = bitmaps[j]
+                if (rw, rh) != (w, h) or entries[j][0] is not None:
+                    continue
+                code = encode(bytes(a ^ b for a, b in zip(data, rdata)))
+                if len(code) < len(best):
+                    best = code
+                    ref = j
+        entries.append((ref, best))
+    out = bytearray(b'EPB1')
+    out += struct.pack('<H', len(bitmaps))
+    offset = HEADER_SIZE + ENTRY_SIZE * len(bitmaps)
+    data = bytearray()
+    for (name, w, h, _), (ref, code) in zip(bitmaps, entries):
+        if offset + len(data) + len(code) > 0xffff:
+            raise ValueError('pack is larger than 64 KB')
+        out += struct.pack('<BBHHH', w, h, NO_REF if ref is None else ref,
+                           offset + len(data), len(code))
+        data += code
+    # 確認解碼結果與原圖相同
+    for (name, w, h, raw), (ref, code) in zip(bitmaps, entries):
+        base = None if ref is None else bitmaps[ref][3]
+        if decode(code, len(raw), base) != raw:
+            raise AssertionError('{}: round trip failed'.format(name))
+    info = [(b[0], ref, len(code)) for b, (ref, code) in zip(bitmaps, entries)]
+    return bytes(out + data), info
+
+
+def to_module(data, info, sources):
+    """輸出成 Python 模組的原始碼。"""
+    lines = ['# Bitmap pack generated by tools/img2epb.py from',
+             '# {}'.format(', '.join(sources)),
+             '# from bitmap_pack import BitmapPack',
+             '# pack = BitmapPack(DATA)',
+             '']
+    for i, (name, _, _) in enumerate(info):
+        ident = re.sub(r'\W', '_', name.upper())
+        if ident[0].isdigit():
+            ident = '_' + ident
+        lines.append('{} = {}'.format(ident, i))
+    lines.append('')
+    lines.append('DATA = (')
+    for k in range(0, len(data), 16):
+        lines.append('    {!r}'.format(data[k:k + 16]))
+    lines.append(')')
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    ap.add_argument('inputs', nargs='+',
+                    help='圖檔，或含 \'0\'/\'1\' 像素陣列的 .py 檔')
+    ap.add_argument('-o', '--output', required=True,
+                    help='輸出的 .epb 檔（或 --py 時的 .py 檔）')
+    ap.add_argument('--py', action='store_true', help='輸出成 Python 模組')
+    ap.add_argument('--no-delta', action='store_true',
+                    help='不使用 XOR 差異，每張圖各自壓縮')
+    ap.add_argument('--threshold', type=int, default=128,
+                    help='圖檔二值化門檻 0..255（預設 128）')
+    ap.add_argument('--invert', action='store_true', help='圖檔黑白反相')
+    args = ap.parse_args(argv)
+
+    bitmaps = []
+    for path in args.inputs:
+        if path.endswith('.py'):
+            maps = load_pixel_maps(path)
+        else:
+            maps = [load_image(path, args.threshold, args.invert)]
+        for name, w, h, rows in maps:
+            bitmaps.append((name, w, h, to_vlsb(w, h, rows)))
+    if not bitmaps:
+        ap.error('no bitmaps found')
+
+    data, info = build(bitmaps, not args.no_delta)
+    if args.py:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(to_module(data, info,
+                              [os.path.basename(p) for p in args.inputs]))
+    else:
+        with open(args.output, 'wb') as f:
+            f.write(data)
+    raw = 0
+    for i, ((name, w, h, vlsb), (_, ref, size)) in enumerate(
+            zip(bitmaps, info)):
+        raw += len(vlsb)
+        print('{:>3} {:<16} {:>3}x{:<3} {:>5} -> {:>5} B{}'.format(
+            i, name, w, h, len(vlsb), size,
+            '' if ref is None else '  (xor {})'.format(ref)))
+    print('{}: {} bitmaps, {} bytes ({} raw)'.format(
+        args.output, len(bitmaps), len(data), raw))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,407 @@
+"""
+ssd1306_emu.py
+
+主機端 (CPython) 的 I2C 匯流排與 SSD1306 控制器模擬器。
+
+用途：
+ - 取代 `machine.I2C` 物件交給 `SSD1306_I2C` 使用，不需燒錄開發板即可
+   量測每一個畫面實際送上匯流排的交易數、位元組數與估計傳輸時間。
+ - 依 SSD1306 規格解碼 command / data 串流（定址模式、column/page 視窗、
+   捲動、反相、區段重映射、COM 掃描方向），維護一份模擬的 GDDRAM，
+   可匯出成 0/1 陣列、PBM 或 PNG 圖檔（PNG 需安裝 Pillow）。
+ - 另附簡單的 HTU21D 感測器模擬，讓溫濕度畫面也能在 Linux CI 上執行。
+
+使用方式：
+    import sys
+    sys.path[:0] = ['tools/host', 'tools', '.', 'lib']
+    from ssd1306_emu import I2CBus, SSD1306Emulator
+    from lib.ssd1306 import SSD1306_I2C
+
+    bus = I2CBus(baudrate=100000)
+    panel = bus.attach(SSD1306Emulator())
+    oled = SSD1306_I2C(128, 64, bus)
+    bus.reset_stats()
+    oled.text('Hi', 0, 0)
+    oled.show()
+    print(bus.transactions, bus.bytes, bus.wire_time_us())
+    print(panel.ascii())
+"""
+
+import time
+
+# 各多位元組命令需要的參數個數（未列出者為單一位元組命令）
+_CMD_ARGS = {
+    0x20: 1,  # 記憶體定址模式
+    0x21: 2,  # column 視窗
+    0x22: 2,  # page 視窗
+    0x26: 6,  # 水平捲動（右）
+    0x27: 6,  # 水平捲動（左）
+    0x29: 5,  # 垂直+水平捲動（右）
+    0x2a: 5,  # 垂直+水平捲動（左）
+    0x81: 1,  # 對比
+    0x8d: 1,  # charge pump
+    0xa3: 2,  # 垂直捲動區域
+    0xa8: 1,  # multiplex ratio
+    0xd3: 1,  # display offset
+    0xd5: 1,  # 時脈
+    0xd9: 1,  # pre-charge
+    0xda: 1,  # COM pin 設定
+    0xdb: 1,  # VCOMH
+}
+
+
+class SSD1306Emulator:
+    """以位元組為單位模擬 SSD1306 的命令解碼器與 GDDRAM（最大 128x64）。"""
+
+    def __init__(self, addr=0x3c, width=128, height=64):
+        self.addr = addr
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.gddram = bytearray(128 * 8)
+        self.display_on = False
+        self.inverted = False
+        self.entire_on = False
+        self.contrast = 0x7f
+        self.addressing = 2  # 上電預設為 page 定址
+        self.col_start = 0
+        self.col_end = 127
+        self.page_start = 0
+        self.page_end = 7
+        self.col = 0
+        self.page = 0
+        self.seg_remap = 0
+        self.com_reverse = 0
+        self.start_line = 0
+        self.disp_offset = 0
+        self.scroll_active = False
+        self.scroll_setup = None
+        self.vscroll_area = (0, 64)
+        # 捲動啟動中仍寫入 GDDRAM 的位元組數（規格書禁止）
+        self.writes_while_scrolling = 0
+        self.commands = []
+        self._pending = None
+        self._args = []
+
+    # ---- 匯流排介面 ----
+    def write(self, buf):
+        """處理一筆 I2C 寫入交易（不含位址位元組）。"""
+        i = 0
+        n = len(buf)
+        while i < n:
+            ctrl = buf[i]
+            i += 1
+            is_data = ctrl & 0x40
+            if ctrl & 0x80:
+                # Co=1：只跟一個位元組，之後又是控制位元組
+                if i < n:
+                    if is_data:
+                        self._data(buf[i])
+                    else:
+                        self._cmd(buf[i])
+                    i += 1
+            else:
+                # Co=0：其後全部為同一種串流
+                while i < n:
+                    if is_data:
+                        self._data(buf[i])
+                    else:
+                        self._cmd(buf[i])
+                    i += 1
+
+    # ---- 命令解碼 ----
+    def _cmd(self, b):
+        if self._pending is not None:
+            self._args.append(b)
+            if len(self._args) == _CMD_ARGS[self._pending]:
+                self._exec(self._pending, self._args)
+                self._pending = None
+                self._args = []
+            return
+        if b in _CMD_ARGS:
+            self._pending = b
+            self._args = []
+            return
+        self._exec(b, ())
+
+    def _exec(self, cmd, args):
+        self.commands.append((cmd, tuple(args)))
+        if cmd == 0x20:
+            self.addressing = args[0] & 0x03
+        elif cmd == 0x21:
+            self.col_start = args[0] & 0x7f
+            self.col_end = args[1] & 0x7f
+            self.col = self.col_start
+        elif cmd == 0x22:
+            self.page_start = args[0] & 0x07
+            self.page_end = args[1] & 0x07
+            self.page = self.page_start
+        elif cmd in (0x26, 0x27, 0x29, 0x2a):
+            self.scroll_setup = (cmd, tuple(args))
+        elif cmd == 0x2e:
+            self.scroll_active = False
+        elif cmd == 0x2f:
+            self.scroll_active = True
+        elif cmd == 0x81:
+            self.contrast = args[0]
+        elif cmd == 0xa3:
+            self.vscroll_area = (args[0], args[1])
+        elif cmd == 0xd3:
+            self.disp_offset = args[0] & 0x3f
+        elif cmd in (0xa0, 0xa1):
+            self.seg_remap = cmd & 1
+        elif cmd in (0xa4, 0xa5):
+            self.entire_on = bool(cmd & 1)
+        elif cmd in (0xa6, 0xa7):
+            self.inverted = bool(cmd & 1)
+        elif cmd in (0xae, 0xaf):
+            self.display_on = bool(cmd & 1)
+        elif cmd in (0xc0, 0xc8):
+            self.com_reverse = 1 if cmd & 0x08 else 0
+        elif 0x40 <= cmd <= 0x7f:
+            self.start_line = cmd & 0x3f
+        elif cmd <= 0x0f:
+            self.col = (self.col & 0xf0) | cmd
+        elif cmd <= 0x1f:
+            self.col = (self.col & 0x0f) | ((cmd & 0x0f) << 4)
+        elif 0xb0 <= cmd <= 0xb7:
+            self.page = cmd & 0x07
+
+    # ---- 資料寫入與位址遞增 ----
+    def _data(self, b):
+        if self.scroll_active:
+            self.writes_while_scrolling += 1
+        self.gddram[self.page * 128 + self.col] = b
+        if self.addressing == 0:
+            self.col += 1
+            if self.col > self.col_end:
+                self.col = self.col_start
+                self.page += 1
+                if self.page > self.page_end:
+                    self.page = self.page_start
+        elif self.addressing == 1:
+            self.page += 1
+            if self.page > self.page_end:
+                self.page = self.page_start
+                self.col += 1
+                if self.col > self.col_end:
+                    self.col = self.col_start
+        else:
+            self.col = (self.col + 1) & 0x7f
+
+    # ---- 匯出 ----
+    def ram_pixel(self, col, row):
+        """讀取 GDDRAM 中 (col, row) 的位元（不考慮顯示方向）。"""
+        return (self.gddram[(row >> 3) * 128 + col] >> (row & 7)) & 1
+
+    def frame(self):
+        """
+        回傳面板實際看到的畫面，格式為 height 列、每列 width 個 0/1。
+        方向以驅動程式預設設定（區段重映射 + COM 反向掃描）為正立畫面。
+        """
+        rows = []
+        off = 32 if self.width == 64 else 0
+        for y in range(self.height):
+            row = []
+            if self.com_reverse:
+                ram_row = (y + self.start_line + self.disp_offset) % 64
+            else:
+                ram_row = (self.height - 1 - y + self.start_line
+                           + self.disp_offset) % 64
+            for x in range(self.width):
+                if not self.display_on:
+                    bit = 0
+                elif self.entire_on:
+                    bit = 1
+                else:
+                    col = x + off if self.seg_remap else 127 - off - x
+                    bit = self.ram_pixel(col, ram_row)
+                    if self.inverted:
+                        bit ^= 1
+                row.append(bit)
+            rows.append(row)
+        return rows
+
+    def to_array(self):
+        """轉成 numpy 陣列（需安裝 numpy）。"""
+        import numpy
+        return numpy.array(self.frame(), dtype=numpy.uint8)
+
+    def ascii(self, on='#', off='.'):
+        return '\n'.join(''.join(on if b else off for b in row)
+                         for row in self.frame())
+
+    def to_pbm(self, path):
+        """以純文字 PBM (P1) 格式輸出畫面，任何看圖軟體皆可開啟。"""
+        with open(path, 'w') as f:
+            f.write('P1\n{} {}\n'.format(self.width, self.height))
+            for row in self.frame():
+                f.write(' '.join(str(b) for b in row))
+                f.write('\n')
+
+    def to_png(self, path, scale=4):
+        """輸出 PNG（需安裝 Pillow），scale 為放大倍率。"""
+        from PIL import Image
+        img = Image.new('1', (self.width, self.height))
+        img.putdata([b for row in self.frame() for b in row])
+        if scale > 1:
+            img = img.resize((self.width * scale, self.height * scale))
+        img.save(path)
+
+
+def _crc8(b0, b1):
+    # HTU21D 使用的 CRC-8（多項式 0x31，初值 0）
+    crc = 0
+    for b in (b0, b1):
+        crc ^= b
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x31) & 0xff
+            else:
+                crc = (crc << 1) & 0xff
+    return crc
+
+
+class HTU21DEmulator:
+    """
+    簡單的 HTU21D 模擬：回傳固定的溫濕度（可隨時修改 temp_c / rh）。
+    no-hold 命令 (0xF3 / 0xF5) 之後，轉換時間（依 user register 的解析度，
+    取規格書的典型值）還沒到就讀取會 NACK（OSError），與實際感測器相同。
+    """
+
+    # 解析度設定 (bit 7, bit 0) -> (溫度, 濕度) 典型轉換時間 ms
+    CONV_MS = {0x00: (44, 14), 0x01: (11, 2), 0x80: (22, 4), 0x81: (6, 7)}
+    # 同上 -> (溫度, 濕度) 原始值的有效位元（解析度較低時低位元為 0）
+    RES_MASK = {0x00: (0xfffc, 0xfff0), 0x01: (0xfff0, 0xff00),
+                0x80: (0xfff8, 0xffc0), 0x81: (0xffe0, 0xffe0)}
+
+    def __init__(self, addr=0x40, temp_c=25.0, rh=50.0):
+        self.addr = addr
+        self.temp_c = temp_c
+        self.rh = rh
+        self.user_reg = 0x02
+        self._result = None
+        self._ready = 0.0
+        self.nacks = 0
+
+    def _raw(self, cmd):
+        t_mask, rh_mask = self.RES_MASK[self.user_reg & 0x81]
+        if cmd in (0xe3, 0xf3):
+            raw = int((self.temp_c + 46.85) * 65536 / 175.72) & t_mask
+        else:
+            raw = (int((self.rh + 6.0) * 65536 / 125.0) & rh_mask) | 0x02
+        hi = raw >> 8
+        lo = raw & 0xff
+        return bytes((hi, lo, _crc8(hi, lo)))
+
+    def write(self, buf):
+        cmd = buf[0]
+        if cmd == 0xe6 and len(buf) > 1:
+            self.user_reg = buf[1]
+        elif cmd in (0xf3, 0xf5):
+            self._result = self._raw(cmd)
+            t_ms, rh_ms = self.CONV_MS[self.user_reg & 0x81]
+            self._ready = time.monotonic() + \
+                (t_ms if cmd == 0xf3 else rh_ms) / 1000.0
+        elif cmd == 0xfe:
+            self.user_reg = 0x02
+
+    def read(self, n):
+        if self._result is not None and time.monotonic() < self._ready:
+            self.nacks += 1
+            raise OSError(5)  # 轉換中：位址 NACK
+        data = self._result if self._result is not None else bytes(3)
+        self._result = None
+        return data[:n]
+
+    def mem_read(self, memaddr, n):
+        if memaddr == 0xe7:
+            return bytes((self.user_reg,))[:n]
+        return self._raw(memaddr)[:n]
+
+
+class I2CBus:
+    """
+    模擬 ePy 的 `machine.I2C` 物件（send / recv / mem_read / mem_write），
+    並統計交易數、位元組數與估計的線上傳輸時間。
+    """
+
+    MASTER = 0
+    SLAVE = 1
+
+    def __init__(self, port=0, mode=0, baudrate=100000):
+        self.port = port
+        self.baudrate = baudrate
+        self.devices = {}
+        self.reset_stats()
+
+    def attach(self, device):
+        self.devices[device.addr] = device
+        return device
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.bits = 0
+        self.log = []
+
+    def _count(self, addr, n):
+        # START + 位址位元組 + n 個資料位元組（各含 ACK 共 9 bit）+ STOP
+        self.transactions += 1
+        self.bytes += n
+        self.bits += 2 + 9 * (n + 1)
+        self.log.append((addr, n))
+
+    def _device(self, addr):
+        if addr not in self.devices:
+            raise OSError(5)  # EIO：沒有裝置回應 ACK
+        return self.devices[addr]
+
+    def wire_time_us(self, baudrate=None):
+        """依目前統計的 bit 數估算匯流排佔用時間（微秒）。"""
+        return self.bits * 1000000 // (baudrate or self.baudrate)
+
+    # ---- machine.I2C 介面 ----
+    def send(self, buf, addr=0x3c):
+        if isinstance(buf, int):
+            buf = bytes((buf,))
+        elif isinstance(buf, str):
+            buf = bytes(ord(c) for c in buf)
+        data = bytes(buf)
+        self._count(addr, len(data))
+        self._device(addr).write(data)
+
+    def recv(self, data, addr=0x40):
+        dev = self._device(addr)
+        if isinstance(data, int):
+            self._count(addr, data)
+            return dev.read(data)
+        result = dev.read(len(data))
+        data[:len(result)] = result
+        self._count(addr, len(data))
+        return data
+
+    def mem_read(self, data, addr, memaddr):
+        # 寫入 memaddr 後 repeated start 讀取：視為兩筆交易
+        dev = self._device(addr)
+        n = data if isinstance(data, int) else len(data)
+        self._count(addr, 1)
+        self._count(addr, n)
+        result = dev.mem_read(memaddr, n)
+        if isinstance(data, int):
+            return result
+        data[:len(result)] = result
+        return data
+
+    def mem_write(self, data, addr, memaddr):
+        if isinstance(data, int):
+            data = bytes((data,))
+        payload = bytes((memaddr,)) + bytes(data)
+        self._count(addr, len(payload))
+        self._device(addr).write(payload)
+
+    def scan(self):
+        return sorted(self.devices)
+
+    def is_ready(self, addr):
+        return addr in self.devices
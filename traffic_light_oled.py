@@ -10,59 +10,26 @@ traffic_light_oled.py
   - 當某顏色啟用時，該圓變為實心，其他兩個為空心
 
 注意：使用 MicroPython/ePy 範例 API（不使用 class、f-string 等），
-使用簡單的繪圖演算法（畫圓與填滿）來支援 SSD1306。
+畫圓使用驅動內建的 circle() / fill_circle()（整數中點演算法，
+以整段 hline/vline 直接寫入 framebuffer），並透過 SpriteCache 只畫一次，
+之後每次更新都只是 blit。實心圓剛好填到空心圓的外框為止，
+比舊版逐列搜尋 x*x + y*y <= r*r 的實心圓略小（r=10 時 297 點，舊版 317 點）。
 """
 
 from machine import LED, I2C, Pin
 from lib.ssd1306 import SSD1306_I2C
+from lib.sprite_cache import SpriteCache
 import utime
 
+# 實心/空心圓只畫一次，之後以 blit 貼上（兩個 r=10 的圓約 126 bytes）
+sprites = SpriteCache(256)
 
-def draw_hollow_circle(oled, x0, y0, r, col=1):
-    """用 Midpoint 演算法在 oled 上畫一個空心圓（像素級）。"""
-    x = r
-    y = 0
-    err = 0
-
-    while x >= y:
-        oled.pixel(x0 + x, y0 + y, col)
-        oled.pixel(x0 + y, y0 + x, col)
-        oled.pixel(x0 - y, y0 + x, col)
-        oled.pixel(x0 - x, y0 + y, col)
-        oled.pixel(x0 - x, y0 - y, col)
-        oled.pixel(x0 - y, y0 - x, col)
-        oled.pixel(x0 + y, y0 - x, col)
-        oled.pixel(x0 + x, y0 - y, col)
-
-        y += 1
-        if err <= 0:
-            err += 2 * y + 1
-        if err > 0:
-            x -= 1
-            err -= 2 * x + 1
-
-
-def draw_filled_circle(oled, x0, y0, r, col=1):
-    """填滿圓：對每一個 y 繪製水平線段。"""
-    y = -r
-    while y <= r:
-        # 計算該 y 的水平半寬
-        xspan = 0
-        yy = y
-        # 找到最大的 xspan 使 (xspan)^2 + (y)^2 <= r^2
-        # 線性搜尋因 r 小（10~20）效能可接受
-        while (xspan + 1) * (xspan + 1) + yy * yy <= r * r:
-            xspan += 1
-
-        x1 = x0 - xspan
-        x2 = x0 + xspan
-        # 畫水平線
-        oled.fill_rect(x1, y0 + y, x2 - x1 + 1, 1, col)
-        y += 1
-
-
-def update_oled(oled, state):
-    """根據 state ('green','yellow','red') 更新 OLED：對應圓為實心，其餘空心。"""
+
+def update_oled(oled, state, priority=False):
+    """根據 state ('green','yellow','red') 重畫 OLED：對應圓為實心，其餘空心。
+
+    priority=True 時不受 set_max_fps() 的更新率上限限制（按鍵切換模式時使用）。
+    """
     oled.fill(0)
 
     # 參數：圓心位置與半徑
@@ -73,24 +40,25 @@ def update_oled(oled, state):
     x_right = 104
 
     if state == 'green':
-        draw_filled_circle(oled, x_left, y0, r, 1)
-        draw_hollow_circle(oled, x_mid, y0, r, 1)
-        draw_hollow_circle(oled, x_right, y0, r, 1)
+        sprites.fill_circle(oled, x_left, y0, r, 1)
+        sprites.circle(oled, x_mid, y0, r, 1)
+        sprites.circle(oled, x_right, y0, r, 1)
     elif state == 'yellow':
-        draw_hollow_circle(oled, x_left, y0, r, 1)
-        draw_filled_circle(oled, x_mid, y0, r, 1)
-        draw_hollow_circle(oled, x_right, y0, r, 1)
+        sprites.circle(oled, x_left, y0, r, 1)
+        sprites.fill_circle(oled, x_mid, y0, r, 1)
+        sprites.circle(oled, x_right, y0, r, 1)
     elif state == 'red':
-        draw_hollow_circle(oled, x_left, y0, r, 1)
-        draw_hollow_circle(oled, x_mid, y0, r, 1)
-        draw_filled_circle(oled, x_right, y0, r, 1)
+        sprites.circle(oled, x_left, y0, r, 1)
+        sprites.circle(oled, x_mid, y0, r, 1)
+        sprites.fill_circle(oled, x_right, y0, r, 1)
     else:
         # 預設皆空心
-        draw_hollow_circle(oled, x_left, y0, r, 1)
-        draw_hollow_circle(oled, x_mid, y0, r, 1)
-        draw_hollow_circle(oled, x_right, y0, r, 1)
+        sprites.circle(oled, x_left, y0, r, 1)
+        sprites.circle(oled, x_mid, y0, r, 1)
+        sprites.circle(oled, x_right, y0, r, 1)
 
-    oled.show()
+    # 只排入待送佇列，由主迴圈呼叫 flush_step() 分批送出
+    oled.begin_show(priority=priority)
 
 
 def main():
@@ -124,7 +92,11 @@ def main():
     # 初始化 I2C 與 OLED
     try:
         i2c0 = I2C(0, I2C.MASTER, baudrate=100000)
-        oled = SSD1306_I2C(128, 64, i2c0)
+        # shadow=True：與上一張畫面相同的部分不再送上 I2C，
+        # 同一燈號期間反覆重畫也不會佔用匯流排
+        oled = SSD1306_I2C(128, 64, i2c0, shadow=True)
+        # 燈號再怎麼切換，OLED 最多每秒 10 張畫面，過密的更新會合併
+        oled.set_max_fps(10)
     except Exception:
         print('無法初始化 I2C 或 OLED，請確認接線與驅動')
         return
@@ -158,6 +130,10 @@ def main():
 
     # 初始顯示
     update_oled(oled, None)
+    # 目前畫面上的燈號狀態，只有狀態改變時才重畫
+    shown = None
+    # 按鍵切換模式後的第一張畫面立即送出
+    pressed = False
 
     while True:
         now = utime.ticks_ms()
@@ -173,6 +149,7 @@ def main():
                 utime.sleep_ms(50)
                 if btn_up.value() == 0:
                     mode = 'blink_yellow'
+                    pressed = True
                     # 重新計時，讓閃爍從 on 開始
                     start = utime.ticks_ms()
             last_up = up_state
@@ -183,6 +160,7 @@ def main():
                 utime.sleep_ms(50)
                 if btn_down.value() == 0:
                     mode = 'normal_long'
+                    pressed = True
                     start = utime.ticks_ms()
             last_down = down_state
 
@@ -198,26 +176,26 @@ def main():
                 led_g.off()
                 led_y.on()
                 led_r.off()
-                update_oled(oled, 'yellow')
+                state = 'yellow'
             else:
                 # all off (OLED 顯示空心)
                 led_g.off()
                 led_y.off()
                 led_r.off()
-                update_oled(oled, None)
+                state = None
 
         elif mode == 'normal_short':
             cycle_ms = short_green_ms + short_yellow_ms + short_red_ms
             phase = elapsed % cycle_ms
             if phase < short_green_ms:
                 led_g.on(); led_y.off(); led_r.off()
-                update_oled(oled, 'green')
+                state = 'green'
             elif phase < (short_green_ms + short_yellow_ms):
                 led_g.off(); led_y.on(); led_r.off()
-                update_oled(oled, 'yellow')
+                state = 'yellow'
             else:
                 led_g.off(); led_y.off(); led_r.on()
-                update_oled(oled, 'red')
+                state = 'red'
 
         else:
             # fallback to long mode
@@ -225,16 +203,25 @@ def main():
             phase = elapsed % cycle_ms
             if phase < long_green_ms:
                 led_g.on(); led_y.off(); led_r.off()
-                update_oled(oled, 'green')
+                state = 'green'
             elif phase < (long_green_ms + long_yellow_ms):
                 led_g.off(); led_y.on(); led_r.off()
-                update_oled(oled, 'yellow')
+                state = 'yellow'
             else:
                 led_g.off(); led_y.off(); led_r.on()
-                update_oled(oled, 'red')
+                state = 'red'
+
+        # 燈號改變才重畫 OLED
+        if state != shown:
+            update_oled(oled, state, pressed)
+            shown = state
+        pressed = False
+
+        # 每圈最多送出一個 page (128 bytes)，一個畫面分散到數圈完成
+        oled.flush_step(128)
 
-        # 每 80 ms 更新一次，兼顧反應與 CPU 使用
-        utime.sleep_ms(80)
+        # 每 20 ms 一圈，兼顧按鍵反應與 CPU 使用
+        utime.sleep_ms(20)
 
 
 if __name__ == '__main__':